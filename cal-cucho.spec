@@ -5,13 +5,17 @@ import os
 # Agregar archivos .ico como datos
 ico_dir = os.path.join('img', 'iconos')
 ico_files = [(os.path.join(ico_dir, f), os.path.join(ico_dir)) for f in os.listdir(ico_dir) if f.endswith('.ico')]
+splash_png = os.path.join('img', 'splash.png')
+
+# Los módulos del menú se importan bajo demanda (importlib), PyInstaller no los detecta solo
+modulos_menu = ['modulos.' + os.path.splitext(f)[0] for f in os.listdir('modulos') if f.endswith('.py')]
 
 a = Analysis(
     ['main.py'],
     pathex=[],
     binaries=[],
-    datas=ico_files,  # <-- Aquí se añaden los íconos
-    hiddenimports=[],
+    datas=ico_files + [(splash_png, 'img')],  # <-- Aquí se añaden los íconos y la pantalla de inicio
+    hiddenimports=modulos_menu,
     hookspath=[],
     hooksconfig={},
     runtime_hooks=[],
@@ -22,9 +26,23 @@ a = Analysis(
 
 pyz = PYZ(a.pure)
 
+# El cargador muestra esta imagen mientras descomprime el ejecutable; main.py la
+# reemplaza por la pantalla de inicio de Qt en cuanto arranca Python
+splash = Splash(
+    splash_png,
+    binaries=a.binaries,
+    datas=a.datas,
+    text_pos=(12, 245),
+    text_size=9,
+    minify_script=True,
+    always_on_top=True,
+)
+
 exe = EXE(
     pyz,
     a.scripts,
+    splash,
+    splash.binaries,
     a.binaries,
     a.datas,
     [],
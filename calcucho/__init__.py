@@ -0,0 +1,6 @@
+"""Cal-cucho sin interfaz gráfica.
+
+``calcucho.core`` contiene los cálculos de cada módulo como funciones
+que no dependen de Qt ni de matplotlib; ``python -m calcucho`` los expone
+por línea de comandos.
+"""
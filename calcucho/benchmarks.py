@@ -0,0 +1,304 @@
+"""Banco de pruebas de rendimiento de los núcleos de cálculo, sin pantalla.
+
+    python -m calcucho.benchmarks                       # medir e imprimir
+    python -m calcucho.benchmarks --guardar base.json   # guardar una línea base
+    python -m calcucho.benchmarks --comparar base.json  # comparar con la base
+
+Cada caso mide un núcleo de ``calcucho.core`` con varios tamaños de entrada y
+registra el mínimo y la mediana de varias repeticiones. El modo de comparación
+marca como regresión todo caso cuya mediana empeore más que la tolerancia y
+termina con código 1, de modo que sirve también en integración continua.
+"""
+import argparse
+import json
+import platform
+import random
+import statistics
+import sys
+import time
+from datetime import datetime
+
+FORMATO = 1
+
+# nombre -> (tamaños, preparar(tamaño) -> función sin argumentos a medir)
+CASOS = {}
+
+
+def caso(nombre, tamanos):
+    def registrar(preparar):
+        CASOS[nombre] = (tamanos, preparar)
+        return preparar
+    return registrar
+
+
+# --- Casos ---
+_PARAMETROS_RNG = {
+    "Cuadrados Medios": {"x0": 5735},
+    "Productos Medios": {"x0": 5015, "x1": 5734},
+    "Congruencial Lineal": {"x0": 37, "a": 19, "c": 33, "m": 2**31 - 1},
+    "Congruencial Multiplicativo": {"x0": 17, "a": 16807, "m": 2**31 - 1},
+    "Mersenne Twister": {"semilla": 12345},
+    "Xorshift": {"semilla": 12345},
+    "Tausworthe": {"semilla": 12345},
+}
+
+for _metodo, _parametros in _PARAMETROS_RNG.items():
+    @caso(f"aleatorios.{_metodo}", (1_000, 10_000, 100_000))
+    def _rng(n, metodo=_metodo, parametros=_parametros):
+        from calcucho.core import aleatorios
+        return lambda: aleatorios.generar_uniformes(metodo, n, **parametros)
+
+
+for _metodo in ("Euler", "Heun", "Runge-Kutta 4", "Taylor orden 2"):
+    @caso(f"edo.{_metodo}", (100, 1_000, 10_000))
+    def _edo(pasos, metodo=_metodo):
+        from calcucho.core import edo
+        return lambda: edo.resolver("x*y + sin(x)", 0.0, 1.0, 1.0 / pasos, 1.0, metodo)
+
+
+@caso("montecarlo.integrar", (1_000, 10_000, 100_000))
+def _montecarlo(n):
+    from calcucho.core import montecarlo
+    return lambda: montecarlo.integrar("x**2", 0.0, 1.0, n, semilla=1)
+
+
+@caso("sir.simular", (100, 365, 1_000))
+def _sir(dias):
+    from calcucho.core import sir
+    return lambda: sir.simular(1000, 10, 0.1, dias, "Variable (senoidal)")
+
+
+for _metodo in ("RK45", "LSODA", "Radau", "BDF"):
+    @caso(f"sir.{_metodo}", (365, 3_650, 36_500))
+    def _sir_metodo(dias, metodo=_metodo):
+        from calcucho.core import sir
+        # Horizontes largos: de un año a un siglo
+        return lambda: sir.simular(10_000, 10, 0.1, dias, "Variable (senoidal)", metodo=metodo)
+
+
+@caso("compartimentos.rhs", (100, 1_000, 10_000))
+def _compartimentos_rhs(municipios):
+    import numpy as np
+    from scipy import sparse
+    from calcucho.core import compartimentos
+    # SEIRD de municipios × 5 edades; cada municipio se mezcla con sus dos vecinos
+    movilidad = sparse.diags([0.05, 0.9, 0.05], [-1, 0, 1], shape=(municipios, municipios))
+    N, C = compartimentos.estructura(np.full((municipios, 5), 1_000.0), np.ones((5, 5)) + 4 * np.eye(5),
+                                     movilidad, disperso=True)
+    modelo = compartimentos.Modelo("SEIRD", N, C, disperso=True)
+    y = np.full(modelo.k * modelo.G, 0.1)
+    return lambda: modelo.rhs(1.0, y)
+
+
+for _metodo in ("Gillespie", "Tau-leaping"):
+    @caso(f"estocastico.{_metodo}", (100, 1_000, 10_000))
+    def _estocastico(replicas, metodo=_metodo):
+        from calcucho.core import estocastico
+        # Población pequeña con un solo infectado: muchas réplicas se extinguen
+        return lambda: estocastico.simular(1_000, 1, 0.1, 160, replicas=replicas, metodo=metodo, semilla=1)
+
+
+@caso("reproduccion.analizar", (10, 100, 500))
+def _reproduccion(regiones):
+    import numpy as np
+    from calcucho.core import reproduccion
+    # Tres años de casos diarios por región y pronóstico a 30 días
+    casos = np.random.default_rng(1).poisson(20, (regiones, 3 * 365)).astype(float)
+    return lambda: reproduccion.analizar(casos, horizonte=30, semilla=1)
+
+
+@caso("sir.barrer", (10, 30, 100))
+def _sir_barrido(n):
+    import numpy as np
+    from calcucho.core import sir
+    # Malla n × n de (β, γ) con tres valores de I₀
+    return lambda: sir.barrer(10_000, np.linspace(0.05, 0.6, n), np.linspace(0.05, 0.3, n), [1, 10, 100], 160)
+
+
+@caso("calculo.hessiana_malla", (50, 200, 500))
+def _hessiana(n):
+    import numpy as np
+    from calcucho.core import calculo
+    # Hessiana compilada con cse, evaluada sobre una malla n × n
+    funcion, variables = calculo.parsear_variables("exp(-(x^2 + y^2)/4)*sin(x*y) + x^3*y", "x, y")
+    filas, _ = calculo.hessiana(funcion, variables)
+    compilada = calculo.compilar(filas, ("x", "y"))
+    X, Y = np.meshgrid(np.linspace(-3, 3, n), np.linspace(-3, 3, n))
+    return lambda: compilada(X, Y)
+
+
+def _sin_cache(funcion):
+    """sympy memoriza operaciones: sin vaciar su caché sólo se mediría la consulta.
+    Por lo mismo se desactiva la caché persistente de derivadas e integrales."""
+    from sympy.core.cache import clear_cache
+    from calcucho.core import memo
+
+    memo.configurar(None)
+
+    def medir():
+        clear_cache()
+        return funcion()
+    return medir
+
+
+def _matriz(n, rng):
+    from sympy import Matrix
+    return Matrix(n, n, lambda i, j: rng.randint(-9, 9) + (10 * n if i == j else 0))
+
+
+for _operacion in ("determinante", "inversa", "sistema"):
+    @caso(f"matrices.{_operacion}", (3, 5, 8))
+    def _matrices(n, operacion=_operacion):
+        from sympy import Matrix
+        from calcucho.core import matrices
+        rng = random.Random(n)
+        A = _matriz(n, rng)
+        b = Matrix(n, 1, lambda i, j: rng.randint(-9, 9))
+        operandos = {"A": A, "b": b} if operacion == "sistema" else {"A": A}
+        return _sin_cache(lambda: matrices.operar(operacion, **operandos))
+
+
+for _operacion in ("sumar", "multiplicar", "derivar", "integrar", "evaluar"):
+    @caso(f"polinomios.{_operacion}", (10, 50, 100))
+    def _polinomios(grado, operacion=_operacion):
+        from calcucho.core import polinomios
+        rng = random.Random(grado)
+        texto = lambda: " + ".join(f"{rng.randint(1, 9)}x^{k}" for k in range(grado, 0, -1)) + " + 1"
+        p1, p2 = polinomios.parsear(texto()), polinomios.parsear(texto())
+        return _sin_cache(lambda: polinomios.operar(operacion, p1, p2, valor=1.5))
+
+
+@caso("valores_propios.resolver", (2, 3, 4))
+def _valores_propios(n):
+    from calcucho.core import valores_propios
+    # Matriz tridiagonal simétrica: siempre diagonalizable
+    A = [[2.0 if i == j else (-1.0 if abs(i - j) == 1 else 0.0) for j in range(n)] for i in range(n)]
+    return lambda: valores_propios.resolver(A, [1.0] * n, 0.1, 100)
+
+
+@caso("graficas.evaluar_2d", (400, 4_000, 40_000))
+def _graficas_2d(puntos):
+    from calcucho.core import graficas
+    return lambda: graficas.evaluar_2d("sin(x)*exp(-x**2/10)", -10.0, 10.0, puntos)
+
+
+@caso("graficas.evaluar_3d", (50, 100, 200))
+def _graficas_3d(puntos):
+    from calcucho.core import graficas
+    return lambda: graficas.evaluar_3d("sin(x)*cos(y)", -5.0, 5.0, -5.0, 5.0, puntos)
+
+
+# --- Medición ---
+def medir(funcion, repeticiones=5, presupuesto=2.0):
+    """Ejecuta una vez de calentamiento y luego hasta ``repeticiones`` veces,
+    sin pasar de ``presupuesto`` segundos (siempre al menos una)."""
+    funcion()
+    tiempos = []
+    inicio = time.perf_counter()
+    while len(tiempos) < repeticiones:
+        t0 = time.perf_counter()
+        funcion()
+        tiempos.append(time.perf_counter() - t0)
+        if time.perf_counter() - inicio > presupuesto:
+            break
+    return {
+        "minimo": min(tiempos),
+        "mediana": statistics.median(tiempos),
+        "repeticiones": len(tiempos),
+    }
+
+
+def ejecutar(filtro=None, repeticiones=5, presupuesto=2.0, salida=sys.stderr):
+    """Mide los casos cuyo nombre contiene ``filtro`` y devuelve el informe."""
+    resultados = {}
+    for nombre, (tamanos, preparar) in CASOS.items():
+        if filtro and filtro not in nombre:
+            continue
+        for tamano in tamanos:
+            clave = f"{nombre}[{tamano}]"
+            resultados[clave] = medir(preparar(tamano), repeticiones, presupuesto)
+            if salida is not None:
+                print(f"{clave:<45} {resultados[clave]['mediana'] * 1e3:10.3f} ms", file=salida)
+    return {
+        "formato": FORMATO,
+        "fecha": datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "plataforma": platform.platform(),
+        "resultados": resultados,
+    }
+
+
+def comparar(base, actual, tolerancia=0.2, umbral_ms=0.5):
+    """Devuelve filas (caso, ms base, ms actual, cociente, estado) de los casos comunes.
+
+    El estado es "regresión" si la mediana crece más que ``tolerancia`` (fracción),
+    "mejora" si baja más que eso y "igual" en otro caso. Las diferencias menores
+    que ``umbral_ms`` se consideran ruido."""
+    filas = []
+    for clave, medida in actual["resultados"].items():
+        anterior = base["resultados"].get(clave)
+        if anterior is None:
+            continue
+        cociente = medida["mediana"] / anterior["mediana"] if anterior["mediana"] else float("inf")
+        diferencia_ms = abs(medida["mediana"] - anterior["mediana"]) * 1e3
+        if diferencia_ms < umbral_ms:
+            estado = "igual"
+        elif cociente > 1 + tolerancia:
+            estado = "regresión"
+        elif cociente < 1 - tolerancia:
+            estado = "mejora"
+        else:
+            estado = "igual"
+        filas.append((clave, anterior["mediana"] * 1e3, medida["mediana"] * 1e3, cociente, estado))
+    return filas
+
+
+def crear_parser():
+    parser = argparse.ArgumentParser(prog="calcucho.benchmarks", description="Mide el rendimiento de los núcleos de cálculo.")
+    parser.add_argument("--filtro", help="sólo los casos cuyo nombre contiene este texto (p. ej. edo)")
+    parser.add_argument("--repeticiones", type=int, default=5)
+    parser.add_argument("--presupuesto", type=float, default=2.0, help="segundos máximos por caso y tamaño")
+    parser.add_argument("--guardar", metavar="JSON", help="guarda los resultados como línea base")
+    parser.add_argument("--comparar", metavar="JSON", help="compara con una línea base guardada")
+    parser.add_argument("--tolerancia", type=float, default=0.2, help="empeoramiento admitido (0.2 = 20 %%)")
+    parser.add_argument("--umbral-ms", type=float, default=0.5, help="diferencias menores se consideran ruido")
+    parser.add_argument("--listar", action="store_true", help="lista los casos y termina")
+    return parser
+
+
+def main(argv=None):
+    args = crear_parser().parse_args(argv)
+    if args.listar:
+        for nombre, (tamanos, _) in CASOS.items():
+            print(f"{nombre}: {', '.join(str(t) for t in tamanos)}")
+        return 0
+
+    base = None
+    if args.comparar:
+        with open(args.comparar, encoding="utf-8") as archivo:
+            base = json.load(archivo)
+        if base.get("formato") != FORMATO:
+            print(f"Error: formato de línea base no compatible en {args.comparar}", file=sys.stderr)
+            return 2
+
+    informe = ejecutar(args.filtro, args.repeticiones, args.presupuesto)
+
+    if args.guardar:
+        with open(args.guardar, "w", encoding="utf-8") as archivo:
+            json.dump(informe, archivo, ensure_ascii=False, indent=2)
+        print(f"Línea base guardada en {args.guardar}", file=sys.stderr)
+
+    if base is None:
+        return 0
+
+    filas = comparar(base, informe, args.tolerancia, args.umbral_ms)
+    print(f"\n{'caso':<45} {'base ms':>10} {'actual ms':>10} {'×':>6}  estado")
+    for clave, ms_base, ms_actual, cociente, estado in filas:
+        print(f"{clave:<45} {ms_base:10.3f} {ms_actual:10.3f} {cociente:6.2f}  {estado}")
+    regresiones = [fila for fila in filas if fila[4] == "regresión"]
+    print(f"\n{len(regresiones)} regresiones de {len(filas)} casos comparados.")
+    return 1 if regresiones else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
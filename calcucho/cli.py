@@ -0,0 +1,629 @@
+"""Línea de comandos de Cal-cucho: ``python -m calcucho <comando> ...``.
+
+Cada comando imprime su resultado como JSON en la salida estándar. El comando
+``lote`` lee tareas JSON (una por línea) de un archivo o de la entrada estándar,
+por ejemplo ``{"comando": "edo", "ecuacion": "x*y", "x0": 0, "y0": 1, "h": 0.1, "xf": 1}``,
+y escribe un resultado JSON por línea, de modo que se pueden procesar lotes
+grandes sin pantalla y sin cargar Qt ni matplotlib.
+"""
+import argparse
+import json
+import sys
+
+import numpy as np
+
+
+# --- Conversión de resultados a JSON ---
+def a_json(valor):
+    """Convierte resultados de sympy y NumPy en tipos serializables."""
+    if isinstance(valor, dict):
+        return {clave: a_json(v) for clave, v in valor.items()}
+    if isinstance(valor, (list, tuple)):
+        return [a_json(v) for v in valor]
+    if isinstance(valor, (np.ndarray, np.generic)):
+        return valor.tolist()
+    if isinstance(valor, (bool, int, float, str)) or valor is None:
+        return valor
+    if hasattr(valor, "tolist"):  # Matrix de sympy
+        return a_json(valor.tolist())
+    if hasattr(valor, "free_symbols"):
+        if getattr(valor, "is_Integer", False):
+            return int(valor)
+        if not valor.free_symbols:
+            try:
+                numero = complex(valor)
+                return numero.real if numero.imag == 0 else str(valor)
+            except TypeError:
+                pass
+        return str(valor)
+    return str(valor)
+
+
+# --- Comandos ---
+def cmd_matriz(operacion, A, B=None, b=None):
+    from calcucho.core import matrices
+
+    leer = lambda texto: None if texto is None else matrices.leer_matriz(matrices.texto_a_filas(texto))
+    resultado = matrices.operar(operacion, A=leer(A), B=leer(B), b=leer(b))
+    return {"resultado": resultado}
+
+
+def cmd_polinomio(operacion, p1, p2=None, variable="x", valor=None):
+    from calcucho.core import polinomios
+
+    return {"resultado": polinomios.operar(
+        operacion, polinomios.parsear(p1), polinomios.parsear(p2) if p2 else None,
+        variable=variable, valor=valor,
+    )}
+
+
+def cmd_vector(operacion, v1, v2=None):
+    from calcucho.core import vectores
+
+    return {"resultado": vectores.operar(
+        operacion, vectores.leer_vector(v1), vectores.leer_vector(v2) if v2 else None
+    )}
+
+
+def cmd_derivar(funcion, variable="x", orden=1):
+    from calcucho.core import calculo
+
+    resultado, latex = calculo.operar("derivar", funcion, variable, orden=int(orden))
+    return {"resultado": str(resultado), "latex": latex}
+
+
+def _leer_malla(mallas, variables):
+    """Convierte ["x=-1:1:5", "y=0"] en arreglos (inicio:fin:puntos o un valor) combinados en malla."""
+    ejes = {}
+    for texto in mallas:
+        nombre, _, rango = texto.partition("=")
+        partes = rango.split(":")
+        try:
+            if len(partes) == 1:
+                ejes[nombre.strip()] = np.array([float(partes[0])])
+            elif len(partes) == 3:
+                ejes[nombre.strip()] = np.linspace(float(partes[0]), float(partes[1]), int(partes[2]))
+            else:
+                raise ValueError
+        except ValueError:
+            raise ValueError(f"Malla no válida: {texto} (usa variable=inicio:fin:puntos o variable=valor)")
+    faltan = [v for v in variables if v not in ejes]
+    if faltan:
+        raise ValueError(f"Falta la malla de: {', '.join(faltan)}")
+    return ejes, np.meshgrid(*[ejes[v] for v in variables], indexing="ij")
+
+
+def _diferencial(operacion, funcion, variables, malla):
+    from calcucho.core import calculo
+
+    componentes, latex = calculo.operar(operacion, funcion, variables)
+    respuesta = {"resultado": a_json(componentes), "latex": latex}
+    if malla:
+        nombres = [v.strip() for v in variables.split(",")]
+        nombres = list(dict.fromkeys(nombres))
+        ejes, puntos = _leer_malla(malla, nombres)
+        respuesta["malla"] = ejes
+        respuesta["valores"] = calculo.compilar(componentes, nombres)(*puntos)
+    return respuesta
+
+
+def cmd_gradiente(funcion, variables="x, y", malla=None):
+    return _diferencial("gradiente", funcion, variables, malla)
+
+
+def cmd_hessiana(funcion, variables="x, y", malla=None):
+    return _diferencial("hessiana", funcion, variables, malla)
+
+
+def cmd_integrar(funcion, variable="x", a=None, b=None):
+    from calcucho.core import calculo
+
+    if a is not None or b is not None:
+        resultado = calculo.operar("integrar", funcion, variable, a=a, b=b)
+        resultado["exacto"] = None if resultado["exacto"] is None else str(resultado["exacto"])
+        return resultado
+    resultado, latex = calculo.operar("integrar", funcion, variable)
+    return {"resultado": str(resultado), "latex": latex}
+
+
+def cmd_edo(ecuacion, x0, y0, h, xf, metodo="Euler"):
+    from calcucho.core import edo
+
+    xs, ys, fs = edo.resolver(ecuacion, float(x0), float(y0), float(h), float(xf), metodo)
+    return {"x": xs, "y": ys, "f": fs}
+
+
+def cmd_propios(A, y0, dt, iteraciones=10):
+    from calcucho.core import matrices, valores_propios
+
+    A_list = [[float(v) for v in fila] for fila in matrices.texto_a_filas(A)]
+    Y0_list = [float(v) for v in y0.replace(";", ",").split(",")]
+    return valores_propios.resolver(A_list, Y0_list, float(dt), int(iteraciones))
+
+
+def cmd_graficar(funcion, xmin, xmax, ymin=None, ymax=None, puntos=None):
+    from calcucho.core import graficas
+
+    if ymin is None or ymax is None:
+        x_vals, y_vals = graficas.evaluar_2d(funcion, float(xmin), float(xmax), int(puntos or 400))
+        return {"x": x_vals, "y": y_vals}
+    X, Y, Z = graficas.evaluar_3d(funcion, float(xmin), float(xmax), float(ymin), float(ymax),
+                                  int(puntos or 100))
+    return {"x": X[0], "y": Y[:, 0], "z": Z}
+
+
+def cmd_aleatorios(metodo, n=10, distribucion=None, parametros=None, parametros_dist=None):
+    from calcucho.core import aleatorios
+
+    return {"valores": aleatorios.generar(metodo, int(n), parametros, distribucion, parametros_dist)}
+
+
+def cmd_montecarlo(f, a, b, n, g=None, semilla=None, puntos=False, error_objetivo=None, historial=False,
+                   procesos=None, densidad=False):
+    from calcucho.core import montecarlo
+
+    resultado = montecarlo.integrar(f, float(a), float(b), int(n), g, semilla,
+                                    error_objetivo=None if error_objetivo is None else float(error_objetivo),
+                                    procesos=procesos, densidad=densidad)
+    claves = ["area_mc", "error_estandar", "ic95", "area_exacta", "error", "dentro", "n", "objetivo_alcanzado",
+              "procesos", "area_envolvente", "area_rectangulo", "reinicios"]
+    if historial:
+        claves += ["historial"]
+    if puntos:
+        claves += ["puntos_x", "puntos_y", "puntos_dentro"]
+    if densidad:
+        claves += ["rectangulo", "densidad_dentro", "densidad_fuera"]
+    return {clave: resultado[clave] for clave in claves}
+
+
+def cmd_estimadores(f, a, b, n, g=None, densidad=None, estimador=None, semilla=None,
+                    error_objetivo=None, historial=False):
+    from calcucho.core import estimadores
+
+    resultado = estimadores.comparar(f, float(a), float(b), int(n), g, densidad, estimador, semilla,
+                                     None if error_objetivo is None else float(error_objetivo))
+    if not historial:
+        for fila in resultado["filas"]:
+            del fila["historial"]
+    return resultado
+
+
+def _leer_limites(limites):
+    """Convierte ["x=0:1", "y=-1:1"] en (variables, [(a, b), ...]) en ese orden."""
+    variables, pares = [], []
+    for texto in limites:
+        nombre, _, rango = texto.partition("=")
+        partes = rango.split(":")
+        try:
+            if len(partes) != 2:
+                raise ValueError
+            pares.append((float(partes[0]), float(partes[1])))
+        except ValueError:
+            raise ValueError(f"Límites no válidos: {texto} (usa variable=inicio:fin)")
+        variables.append(nombre.strip())
+    return variables, pares
+
+
+def cmd_multiple(f, limite, n, region=None, semilla=None, error_objetivo=None, procesos=None,
+                 historial=False, puntos=False):
+    from calcucho.core import integrales_multiples
+
+    variables, limites = _leer_limites(limite)
+    resultado = integrales_multiples.integrar(
+        f, limites, int(n), region, variables, semilla,
+        None if error_objetivo is None else float(error_objetivo), procesos=procesos,
+    )
+    claves = ["valor", "error_estandar", "ic95", "exacta", "error", "n", "objetivo_alcanzado", "dentro",
+              "volumen_caja", "volumen_region", "error_volumen", "procesos"]
+    if historial:
+        claves += ["historial"]
+    if puntos:
+        claves += ["puntos", "puntos_dentro"]
+    return {clave: resultado[clave] for clave in claves}
+
+
+def cmd_sir(poblacion, infectados, gamma, dias, beta="Constante", puntos=300, metodo="RK45", rtol=None, atol=None):
+    from calcucho.core import sir
+
+    return sir.simular(int(poblacion), int(infectados), float(gamma), int(dias), beta, int(puntos),
+                       metodo=metodo, rtol=sir.RTOL if rtol is None else float(rtol),
+                       atol=sir.ATOL if atol is None else float(atol))
+
+
+def cmd_modelo(modelo, poblacion=10000, poblaciones=None, contactos_edad=None, movilidad=None, infectados=10,
+               foco=None, gamma=0.1, sigma=None, mu=None, dias=160, beta="Constante", puntos=300, metodo="RK45",
+               rtol=None, atol=None, disperso=False, grupos=False):
+    from calcucho.core import compartimentos, sir
+
+    if poblaciones is None:
+        tabla = np.array([[float(poblacion)]])
+    else:
+        tabla = compartimentos.cargar_csv(poblaciones)
+    edades = None if contactos_edad is None else compartimentos.cargar_csv(contactos_edad)
+    regiones = None if movilidad is None else compartimentos.cargar_csv(movilidad)
+    N, C = compartimentos.estructura(tabla, edades, regiones, disperso)
+    iniciales = compartimentos.infectados_iniciales(tabla, float(infectados), foco)
+    m = compartimentos.Modelo(
+        modelo, N, C, float(gamma),
+        compartimentos.SIGMA if sigma is None else float(sigma),
+        compartimentos.MU if mu is None else float(mu),
+        beta, disperso=disperso,
+    )
+    resultado = compartimentos.simular(m, iniciales, int(dias), int(puntos), metodo,
+                                       sir.RTOL if rtol is None else float(rtol),
+                                       sir.ATOL if atol is None else float(atol))
+    if not grupos:
+        del resultado["infectados_grupo"]
+    return resultado
+
+
+def cmd_estocastico(poblacion, infectados, gamma, dias, beta="Constante", replicas=1000, metodo="Gillespie",
+                    tau=None, puntos=200, semilla=None, procesos=None, trayectorias=False):
+    from calcucho.core import estocastico
+
+    resultado = estocastico.simular(
+        int(poblacion), int(infectados), float(gamma), int(dias), beta, int(replicas), metodo,
+        estocastico.TAU if tau is None else float(tau), int(puntos), semilla, procesos,
+    )
+    if not trayectorias:
+        del resultado["tamano_final"]
+    return resultado
+
+
+def cmd_rt(archivo, ventana=None, serial_media=None, serial_desviacion=None, horizonte=14, trayectorias=None,
+           tendencia=False, semilla=None, region=None):
+    from calcucho.core import reproduccion
+
+    incidencia = reproduccion.leer_incidencia(archivo)
+    casos, regiones = incidencia["casos"], incidencia["regiones"]
+    if region is not None:
+        if region not in regiones:
+            raise ValueError(f"Región desconocida: {region}")
+        indice = regiones.index(region)
+        casos, regiones = casos[indice:indice + 1], [region]
+    analisis = reproduccion.analizar(
+        casos,
+        reproduccion.VENTANA if ventana is None else int(ventana),
+        reproduccion.SERIAL_MEDIA if serial_media is None else float(serial_media),
+        reproduccion.SERIAL_DESVIACION if serial_desviacion is None else float(serial_desviacion),
+        int(horizonte),
+        reproduccion.TRAYECTORIAS if trayectorias is None else int(trayectorias),
+        tendencia, semilla,
+    )
+    estimacion = analisis["estimacion"]
+    resultado = {
+        "fechas": incidencia["fechas"],
+        "regiones": regiones,
+        "niveles": estimacion["niveles"],
+        "rt_media": estimacion["media"],
+        "rt_cuantiles": estimacion["cuantiles"],
+    }
+    if analisis["pronostico"] is not None:
+        resultado["pronostico"] = analisis["pronostico"]
+    return resultado
+
+
+def _leer_rango(texto, nombre):
+    """Convierte "a:b:n" en n valores equiespaciados entre a y b."""
+    partes = texto.split(":")
+    try:
+        if len(partes) != 3:
+            raise ValueError
+        return np.linspace(float(partes[0]), float(partes[1]), int(partes[2]))
+    except ValueError:
+        raise ValueError(f"Rango no válido para {nombre}: {texto} (usa inicio:fin:valores)")
+
+
+def cmd_sir_barrido(poblacion, beta, gamma, infectados, dias, beta_tipo="Constante"):
+    from calcucho.core import sir
+
+    try:
+        iniciales = [int(t) for t in str(infectados).split(",") if t.strip()]
+    except ValueError:
+        raise ValueError(f"Infectados iniciales no válidos: {infectados} (usa valores separados por comas)")
+    return sir.barrer(int(poblacion), _leer_rango(beta, "β"), _leer_rango(gamma, "γ"), iniciales,
+                      int(dias), beta_tipo)
+
+
+def cmd_memo(accion, archivo=None, variable="x", operaciones=None):
+    from calcucho.core import memo
+
+    if accion == "estadisticas":
+        return memo.estadisticas()
+    if accion == "limpiar":
+        memo.limpiar()
+        return memo.estadisticas()
+    if accion == "precalentar":
+        if archivo is None:
+            raise ValueError("Indica el archivo de funciones (una por línea) para precalentar la caché.")
+        with open(archivo, encoding="utf-8") as entrada:
+            textos = entrada.readlines()
+        return memo.precalentar(textos, variable, operaciones or memo.OPERACIONES)
+    raise ValueError(f"Acción desconocida: {accion}")
+
+
+COMANDOS = {
+    "matriz": cmd_matriz,
+    "polinomio": cmd_polinomio,
+    "vector": cmd_vector,
+    "derivar": cmd_derivar,
+    "integrar": cmd_integrar,
+    "gradiente": cmd_gradiente,
+    "hessiana": cmd_hessiana,
+    "edo": cmd_edo,
+    "propios": cmd_propios,
+    "graficar": cmd_graficar,
+    "aleatorios": cmd_aleatorios,
+    "montecarlo": cmd_montecarlo,
+    "estimadores": cmd_estimadores,
+    "multiple": cmd_multiple,
+    "sir": cmd_sir,
+    "sir-barrido": cmd_sir_barrido,
+    "modelo": cmd_modelo,
+    "estocastico": cmd_estocastico,
+    "rt": cmd_rt,
+    "memo": cmd_memo,
+}
+
+
+def ejecutar_tarea(tarea):
+    """Ejecuta una tarea {"comando": ..., argumentos...} y devuelve el resultado serializable."""
+    tarea = dict(tarea)
+    comando = tarea.pop("comando", None)
+    if comando not in COMANDOS:
+        raise ValueError(f"Comando desconocido: {comando}")
+    return a_json(COMANDOS[comando](**tarea))
+
+
+def ejecutar_lote(entrada, salida):
+    """Procesa tareas JSON línea a línea; los errores se informan sin detener el lote."""
+    errores = 0
+    for numero, linea in enumerate(entrada, start=1):
+        linea = linea.strip()
+        if not linea or linea.startswith("#"):
+            continue
+        try:
+            respuesta = {"ok": True, "resultado": ejecutar_tarea(json.loads(linea))}
+        except Exception as e:
+            errores += 1
+            respuesta = {"ok": False, "linea": numero, "error": str(e)}
+        salida.write(json.dumps(respuesta, ensure_ascii=False) + "\n")
+        salida.flush()
+    return 1 if errores else 0
+
+
+def _pares(valores):
+    """Convierte ["x0=7", "a=5"] en {"x0": 7.0, "a": 5.0}."""
+    resultado = {}
+    for par in valores or []:
+        clave, _, valor = par.partition("=")
+        if not valor:
+            raise argparse.ArgumentTypeError(f"Se esperaba clave=valor: {par}")
+        resultado[clave] = float(valor)
+    return resultado
+
+
+def crear_parser():
+    parser = argparse.ArgumentParser(prog="calcucho", description="Cálculos de Cal-cucho sin interfaz gráfica.")
+    parser.add_argument("--indent", type=int, default=None, help="sangría del JSON de salida")
+    parser.add_argument("--tiempo", type=float, default=None,
+                        help="segundos máximos por cálculo simbólico (por omisión 20)")
+    parser.add_argument("--sin-memo", action="store_true",
+                        help="no usar la caché persistente de derivadas e integrales")
+    sub = parser.add_subparsers(dest="comando", required=True)
+
+    p = sub.add_parser("matriz", help="operaciones con matrices (filas con ';', columnas con ',')")
+    p.add_argument("operacion", choices=["suma", "resta", "multiplicacion", "determinante", "inversa", "sistema"])
+    p.add_argument("A")
+    p.add_argument("--B")
+    p.add_argument("--b")
+
+    p = sub.add_parser("polinomio", help="operaciones con polinomios")
+    p.add_argument("operacion", choices=["sumar", "restar", "multiplicar", "derivar", "integrar", "evaluar"])
+    p.add_argument("p1")
+    p.add_argument("p2", nargs="?")
+    p.add_argument("--variable", default="x")
+    p.add_argument("--valor", type=float)
+
+    p = sub.add_parser("vector", help="operaciones con vectores (componentes separadas por ',')")
+    p.add_argument("operacion", choices=["suma", "resta", "magnitud", "punto", "cruzado"])
+    p.add_argument("v1")
+    p.add_argument("v2", nargs="?")
+
+    for nombre in ("derivar", "integrar"):
+        p = sub.add_parser(nombre, help=f"{nombre} una función simbólicamente")
+        p.add_argument("funcion")
+        p.add_argument("--variable", default="x")
+        if nombre == "derivar":
+            p.add_argument("--orden", type=int, default=1)
+        if nombre == "integrar":
+            p.add_argument("--a", help="límite inferior (integral definida; admite pi, oo, -oo)")
+            p.add_argument("--b", help="límite superior")
+
+    for nombre in ("gradiente", "hessiana"):
+        p = sub.add_parser(nombre, help=f"{nombre} de una función de varias variables")
+        p.add_argument("funcion")
+        p.add_argument("--variables", default="x, y", help="separadas por comas (por omisión 'x, y')")
+        p.add_argument("--malla", action="append", metavar="VAR=INICIO:FIN:PUNTOS",
+                       help="evaluar sobre una malla (una opción por variable; VAR=valor fija un punto)")
+
+    p = sub.add_parser("edo", help="resolver dy/dx = f(x, y) con un método de un paso")
+    p.add_argument("ecuacion")
+    p.add_argument("--x0", type=float, required=True)
+    p.add_argument("--y0", type=float, required=True)
+    p.add_argument("--h", type=float, required=True)
+    p.add_argument("--xf", type=float, required=True)
+    p.add_argument("--metodo", default="Euler")
+
+    p = sub.add_parser("propios", help="resolver Y' = A·Y por valores y vectores propios")
+    p.add_argument("A")
+    p.add_argument("--y0", required=True)
+    p.add_argument("--dt", type=float, required=True)
+    p.add_argument("--iteraciones", type=int, default=10)
+
+    p = sub.add_parser("graficar", help="evaluar f(x) o f(x, y) sobre una malla")
+    p.add_argument("funcion")
+    p.add_argument("--xmin", type=float, required=True)
+    p.add_argument("--xmax", type=float, required=True)
+    p.add_argument("--ymin", type=float)
+    p.add_argument("--ymax", type=float)
+    p.add_argument("--puntos", type=int)
+
+    p = sub.add_parser("aleatorios", help="generar números pseudoaleatorios")
+    p.add_argument("metodo")
+    p.add_argument("-n", type=int, default=10)
+    p.add_argument("--distribucion")
+    p.add_argument("--param", dest="parametros", action="append", metavar="CLAVE=VALOR",
+                   help="parámetro del método (x0, x1, a, c, m, semilla)")
+    p.add_argument("--param-dist", dest="parametros_dist", action="append", metavar="CLAVE=VALOR",
+                   help="parámetro de la distribución (a, b, lamb, mu, sigma, n, p)")
+
+    p = sub.add_parser("montecarlo", help="integración Monte Carlo por acierto y rechazo")
+    p.add_argument("f")
+    p.add_argument("--a", type=float, required=True)
+    p.add_argument("--b", type=float, required=True)
+    p.add_argument("-n", type=int, required=True)
+    p.add_argument("--g")
+    p.add_argument("--semilla", type=int)
+    p.add_argument("--puntos", action="store_true", help="incluir una muestra de los puntos sorteados para graficar")
+    p.add_argument("--error-objetivo", type=float, metavar="RELATIVO",
+                   help="detenerse al alcanzar este error estándar relativo (p. ej. 0.001); -n es el máximo")
+    p.add_argument("--historial", action="store_true", help="incluir la estimación tras cada lote")
+    p.add_argument("--procesos", type=int, help="procesos entre los que repartir los lotes (por omisión, todos los núcleos)")
+    p.add_argument("--densidad", action="store_true",
+                   help="incluir los aciertos y fallos de todos los puntos por celda de una malla fija")
+
+    p = sub.add_parser("estimadores", help="comparar estimadores Monte Carlo y cuasi Monte Carlo de ∫ f")
+    p.add_argument("f")
+    p.add_argument("--a", type=float, required=True)
+    p.add_argument("--b", type=float, required=True)
+    p.add_argument("-n", type=int, required=True, help="evaluaciones máximas por estimador")
+    p.add_argument("--g")
+    p.add_argument("--densidad", help="densidad q(x) (sin normalizar) para el muestreo por importancia")
+    p.add_argument("--estimador", action="append", help="repetible; por omisión, todos")
+    p.add_argument("--semilla", type=int)
+    p.add_argument("--error-objetivo", type=float, metavar="RELATIVO",
+                   help="detener cada estimador al alcanzar este error estándar relativo")
+    p.add_argument("--historial", action="store_true", help="incluir la estimación tras cada lote")
+
+    p = sub.add_parser("multiple", help="integral múltiple por Monte Carlo sobre una caja o una región")
+    p.add_argument("f")
+    p.add_argument("--limite", action="append", required=True, metavar="VAR=a:b",
+                   help="repetible, uno por variable y en el orden de las variables")
+    p.add_argument("-n", type=int, required=True)
+    p.add_argument("--region", help="desigualdades separadas por ';', p. ej. 'x**2 + y**2 < 1'")
+    p.add_argument("--semilla", type=int)
+    p.add_argument("--error-objetivo", type=float, metavar="RELATIVO")
+    p.add_argument("--procesos", type=int)
+    p.add_argument("--historial", action="store_true")
+    p.add_argument("--puntos", action="store_true", help="incluir una muestra de los puntos sorteados")
+
+    p = sub.add_parser("sir", help="simular el modelo SIR con Rₜ(t)")
+    p.add_argument("--poblacion", type=int, default=10000)
+    p.add_argument("--infectados", type=int, default=10)
+    p.add_argument("--gamma", type=float, default=0.1)
+    p.add_argument("--dias", type=int, default=160)
+    p.add_argument("--beta", default="Constante")
+    p.add_argument("--puntos", type=int, default=300)
+    p.add_argument("--metodo", default="RK45", choices=["RK45", "LSODA", "Radau", "BDF"])
+    p.add_argument("--rtol", type=float, help="tolerancia relativa (por omisión 1e-3)")
+    p.add_argument("--atol", type=float, help="tolerancia absoluta (por omisión 1e-6)")
+
+    p = sub.add_parser("sir-barrido", help="barrer el modelo SIR sobre una malla de β, γ e I₀")
+    p.add_argument("--poblacion", type=int, default=10000)
+    p.add_argument("--beta", default="0.1:0.6:60", metavar="a:b:n")
+    p.add_argument("--gamma", default="0.05:0.3:60", metavar="a:b:n")
+    p.add_argument("--infectados", default="1,10,100", help="valores de I₀ separados por comas")
+    p.add_argument("--dias", type=int, default=160)
+    p.add_argument("--beta-tipo", default="Constante", choices=["Constante", "Variable (senoidal)"])
+
+    p = sub.add_parser("modelo", help="modelo compartimental SIR, SEIR o SEIRD, con grupos de edad y regiones")
+    p.add_argument("modelo", choices=["SIR", "SEIR", "SEIRD"])
+    p.add_argument("--poblacion", type=int, default=10000, help="población sin estructura por grupos")
+    p.add_argument("--poblaciones", metavar="CSV", help="tabla de regiones × edades (una fila por región)")
+    p.add_argument("--contactos-edad", metavar="CSV", help="contactos diarios entre edades (edades × edades)")
+    p.add_argument("--movilidad", metavar="CSV", help="fracción de contactos entre regiones (regiones × regiones)")
+    p.add_argument("--infectados", type=float, default=10, help="total, repartido según la población")
+    p.add_argument("--foco", type=int, metavar="REGION", help="poner todos los infectados en esta región (desde 0)")
+    p.add_argument("--gamma", type=float, default=0.1)
+    p.add_argument("--sigma", type=float, help="tasa de incubación (por omisión 0.2)")
+    p.add_argument("--mu", type=float, help="tasa de mortalidad, sólo SEIRD (por omisión 0.001)")
+    p.add_argument("--dias", type=int, default=160)
+    p.add_argument("--beta", default="Constante", choices=["Constante", "Variable (senoidal)"])
+    p.add_argument("--puntos", type=int, default=300)
+    p.add_argument("--metodo", default="RK45", choices=["RK45", "LSODA", "Radau", "BDF"])
+    p.add_argument("--rtol", type=float)
+    p.add_argument("--atol", type=float)
+    p.add_argument("--disperso", action="store_true", help="matrices dispersas (muchos grupos)")
+    p.add_argument("--grupos", action="store_true", help="incluir la fracción de infectados de cada grupo")
+
+    p = sub.add_parser("estocastico", help="réplicas del SIR estocástico (Gillespie o tau-leaping)")
+    p.add_argument("--poblacion", type=int, default=1000)
+    p.add_argument("--infectados", type=int, default=1)
+    p.add_argument("--gamma", type=float, default=0.1)
+    p.add_argument("--dias", type=int, default=160)
+    p.add_argument("--beta", default="Constante", choices=["Constante", "Variable (senoidal)"])
+    p.add_argument("--replicas", type=int, default=1000)
+    p.add_argument("--metodo", default="Gillespie", choices=["Gillespie", "Tau-leaping"])
+    p.add_argument("--tau", type=float, help="paso máximo de tau-leaping en días (por omisión 0.25)")
+    p.add_argument("--puntos", type=int, default=200)
+    p.add_argument("--semilla", type=int)
+    p.add_argument("--procesos", type=int)
+    p.add_argument("--trayectorias", action="store_true", help="incluir el tamaño final de cada réplica")
+
+    p = sub.add_parser("rt", help="estimar Rₜ (Cori et al.) desde casos diarios en CSV y pronosticar")
+    p.add_argument("archivo", help="encabezado; la primera columna es la fecha y cada otra, una región")
+    p.add_argument("--ventana", type=int, help="días de la ventana de estimación (por omisión 7)")
+    p.add_argument("--serial-media", type=float, help="media del intervalo serial (por omisión 4.7)")
+    p.add_argument("--serial-desviacion", type=float, help="desviación del intervalo serial (por omisión 2.9)")
+    p.add_argument("--horizonte", type=int, default=14, help="días del pronóstico (0: sin pronóstico)")
+    p.add_argument("--trayectorias", type=int, help="trayectorias del pronóstico (por omisión 1000)")
+    p.add_argument("--tendencia", action="store_true", help="prolongar la tendencia reciente de Rₜ")
+    p.add_argument("--semilla", type=int)
+    p.add_argument("--region", help="sólo esta región (nombre de la columna)")
+
+    p = sub.add_parser("memo", help="caché persistente de derivadas e integrales")
+    p.add_argument("accion", choices=["estadisticas", "limpiar", "precalentar"])
+    p.add_argument("archivo", nargs="?", help="para precalentar: una función por línea")
+    p.add_argument("--variable", default="x")
+    p.add_argument("--operacion", dest="operaciones", action="append", choices=["derivar", "integrar"],
+                   help="sólo esta operación (por omisión, ambas)")
+
+    p = sub.add_parser("lote", help="ejecutar tareas JSON (una por línea)")
+    p.add_argument("archivo", nargs="?", default="-", help="archivo de tareas; '-' para la entrada estándar")
+
+    return parser
+
+
+def main(argv=None):
+    parser = crear_parser()
+    args = parser.parse_args(argv)
+    argumentos = vars(args)
+    comando = argumentos.pop("comando")
+    indent = argumentos.pop("indent")
+    tiempo = argumentos.pop("tiempo")
+    if tiempo is not None:
+        from calcucho.core import simbolico
+        simbolico.TIEMPO_LIMITE = tiempo
+    if argumentos.pop("sin_memo"):
+        from calcucho.core import memo
+        memo.configurar(None)
+
+    if comando == "lote":
+        archivo = argumentos["archivo"]
+        if archivo == "-":
+            return ejecutar_lote(sys.stdin, sys.stdout)
+        with open(archivo, encoding="utf-8") as entrada:
+            return ejecutar_lote(entrada, sys.stdout)
+
+    if comando == "aleatorios":
+        argumentos["parametros"] = _pares(argumentos["parametros"])
+        argumentos["parametros_dist"] = _pares(argumentos["parametros_dist"])
+
+    try:
+        resultado = ejecutar_tarea({"comando": comando, **argumentos})
+    except ValueError as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return 1
+    print(json.dumps(resultado, ensure_ascii=False, indent=indent))
+    return 0
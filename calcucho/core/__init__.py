@@ -0,0 +1,31 @@
+"""Núcleo de cálculo de Cal-cucho, independiente de Qt.
+
+Cada submódulo corresponde a un módulo de la interfaz:
+
+- ``matrices``, ``polinomios``, ``vectores``: álgebra.
+- ``calculo``: derivadas e integrales simbólicas; integrales definidas.
+- ``edo``: métodos numéricos para dy/dx = f(x, y).
+- ``valores_propios``: solución analítica de Y' = A·Y.
+- ``graficas``: evaluación de funciones sobre mallas.
+- ``aleatorios``: generadores de números pseudoaleatorios y distribuciones.
+- ``montecarlo``: integración Monte Carlo.
+- ``integrales_multiples``: integrales dobles, triples (o más) por Monte Carlo sobre cajas y regiones.
+- ``estimadores``: estimadores con reducción de varianza y cuasi Monte Carlo.
+- ``sir``: modelo epidémico SIR con Rₜ(t).
+- ``estocastico``: réplicas del SIR estocástico (Gillespie y tau-leaping).
+- ``reproduccion``: Rₜ desde casos diarios (Cori et al.) y pronóstico.
+- ``compartimentos``: modelos SIR, SEIR y SEIRD por grupos de edad y regiones.
+
+Utilidades compartidas:
+
+- ``progreso``: informe de avance y cancelación de los cálculos largos.
+- ``simbolico``: procesos aislados con tiempo límite para las llamadas de sympy.
+- ``expresiones``: caché LRU de expresiones interpretadas y compiladas.
+- ``paralelo``: reparto de tareas entre procesos con flujos aleatorios independientes.
+- ``cuadratura``: cuadratura adaptativa de Gauss–Kronrod vectorizada.
+- ``memo``: caché persistente (sqlite) de derivadas e integrales simbólicas.
+- ``traza``: tiempos por operación (interpretar, cálculo, tabla, dibujo).
+
+Las dependencias pesadas (sympy, scipy) se importan dentro de las funciones
+que las usan, de modo que importar un submódulo es barato.
+"""
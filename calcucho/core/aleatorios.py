@@ -0,0 +1,161 @@
+"""Generadores de números pseudoaleatorios en [0, 1) y transformaciones a distribuciones."""
+import math
+
+import numpy as np
+
+# método -> parámetros que necesita (además de la cantidad n)
+METODOS = {
+    "Cuadrados Medios": ("x0",),
+    "Productos Medios": ("x0", "x1"),
+    "Congruencial Lineal": ("x0", "a", "c", "m"),
+    "Congruencial Multiplicativo": ("x0", "a", "m"),
+    "Mersenne Twister": ("semilla",),
+    "Xorshift": ("semilla",),
+    "Tausworthe": ("semilla",),
+}
+
+DISTRIBUCIONES = {
+    "Uniforme": ("a", "b"),
+    "Exponencial": ("lamb",),
+    "Normal": ("mu", "sigma"),
+    "Binomial": ("n", "p"),
+    "Poisson": ("lamb",),
+}
+
+
+# --- Métodos de generación ---
+def cuadrados_medios(x0, n):
+    r = []
+    for _ in range(n):
+        x0 = str(int(x0)**2).zfill(8)
+        medio = int(x0[2:6])
+        r.append(medio / 10000)
+        x0 = medio
+    return r
+
+
+def productos_medios(x0, x1, n):
+    r = []
+    for _ in range(n):
+        prod = str(x0 * x1).zfill(8)
+        medio = int(prod[2:6])
+        r.append(medio / 10000)
+        x0, x1 = x1, medio
+    return r
+
+
+def congruencial_lineal(x0, a, c, m, n):
+    return [(x0 := (a * x0 + c) % m) / m for _ in range(n)]
+
+
+def congruencial_multiplicativo(x0, a, m, n):
+    return [(x0 := (a * x0) % m) / m for _ in range(n)]
+
+
+def mersenne_twister(semilla, n):
+    if semilla is not None:
+        np.random.seed(semilla)
+    return list(np.random.random(n))
+
+
+def xorshift(x, n):
+    r = []
+    for _ in range(n):
+        x ^= (x << 13) & 0xFFFFFFFF
+        x ^= (x >> 17)
+        x ^= (x << 5) & 0xFFFFFFFF
+        r.append((x % 10000) / 10000)
+    return r
+
+
+def tausworthe(s, n):
+    r = []
+    for _ in range(n):
+        s = ((s << 1) ^ ((s >> 31) * 0x8ebfd028)) & 0xFFFFFFFF
+        r.append((s % 10000) / 10000)
+    return r
+
+
+# --- Distribuciones ---
+def dist_uniforme(u, a, b): return [round(a + (b - a) * x, 4) for x in u]
+
+
+def dist_exponencial(u, lamb): return [round(-math.log(x) / lamb, 4) for x in u if x > 0]
+
+
+def dist_normal(u, mu, sigma):
+    z = []
+    for i in range(0, len(u) - 1, 2):
+        z1 = math.sqrt(-2 * math.log(u[i])) * math.cos(2 * math.pi * u[i + 1])
+        z.append(round(mu + sigma * z1, 4))
+    return z
+
+
+def dist_poisson(u, lamb):
+    r = []
+    for ui in u:
+        L, k, p = math.exp(-lamb), 0, 1
+        while p >= L:
+            k += 1
+            p *= ui
+        r.append(k - 1)
+    return r
+
+
+def dist_binomial(u, n, p):
+    return [sum(1 for _ in range(int(n)) if x <= p) for x in u]
+
+
+def generar_uniformes(metodo, n, x0=None, x1=None, a=None, c=None, m=None, semilla=None):
+    """Genera n valores en [0, 1) con el método indicado."""
+    if metodo not in METODOS:
+        raise ValueError(f"Método desconocido: {metodo}")
+    valores = {"x0": x0, "x1": x1, "a": a, "c": c, "m": m, "semilla": semilla}
+    # La semilla solo es opcional en Mersenne Twister
+    faltantes = [p for p in METODOS[metodo]
+                 if valores[p] is None and not (p == "semilla" and metodo == "Mersenne Twister")]
+    if faltantes:
+        raise ValueError(f"⚠ Faltan parámetros para {metodo}: {', '.join(faltantes)}.")
+
+    if metodo == "Cuadrados Medios":
+        return cuadrados_medios(int(x0), n)
+    if metodo == "Productos Medios":
+        return productos_medios(int(x0), int(x1), n)
+    if metodo == "Congruencial Lineal":
+        return congruencial_lineal(int(x0), int(a), int(c), int(m), n)
+    if metodo == "Congruencial Multiplicativo":
+        return congruencial_multiplicativo(int(x0), int(a), int(m), n)
+    if metodo == "Mersenne Twister":
+        return mersenne_twister(None if semilla is None else int(semilla), n)
+    if metodo == "Xorshift":
+        return xorshift(int(semilla), n)
+    return tausworthe(int(semilla), n)
+
+
+def generar(metodo, n, parametros=None, distribucion=None, parametros_dist=None, progreso=None):
+    """Genera n uniformes con ``metodo`` y los transforma a ``distribucion``."""
+    u = generar_uniformes(metodo, n, **(parametros or {}))
+    if progreso is not None:
+        progreso(0.5)
+    return aplicar_distribucion(distribucion, u, **(parametros_dist or {}))
+
+
+def aplicar_distribucion(distribucion, u, **parametros):
+    """Transforma los uniformes u a la distribución indicada (None o "" los deja igual)."""
+    if not distribucion:
+        return u
+    if distribucion not in DISTRIBUCIONES:
+        raise ValueError(f"Distribución desconocida: {distribucion}")
+    faltantes = [p for p in DISTRIBUCIONES[distribucion] if parametros.get(p) is None]
+    if faltantes:
+        raise ValueError(f"⚠ Faltan parámetros para {distribucion}: {', '.join(faltantes)}.")
+
+    if distribucion == "Uniforme":
+        return dist_uniforme(u, parametros["a"], parametros["b"])
+    if distribucion == "Exponencial":
+        return dist_exponencial(u, parametros["lamb"])
+    if distribucion == "Normal":
+        return dist_normal(u, parametros["mu"], parametros["sigma"])
+    if distribucion == "Poisson":
+        return dist_poisson(u, parametros["lamb"])
+    return dist_binomial(u, parametros["n"], parametros["p"])
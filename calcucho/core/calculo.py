@@ -0,0 +1,253 @@
+import re
+
+from calcucho.core import cuadratura, expresiones, memo, simbolico
+from calcucho.core.progreso import Cancelado
+
+# Segundos que se dedican a buscar la integral definida exacta antes de pasar a la numérica
+TIEMPO_DEFINIDA = 5.0
+
+
+def normalizar(texto):
+    """Convierte ^ en ** e inserta la multiplicación implícita (2x, 3(x+1), (x)(y))."""
+    texto = texto.strip().replace("^", "**")
+    texto = re.sub(r'(?<=\d)(?=[a-zA-Z(])', '*', texto)
+    texto = re.sub(r'(?<=\))(?=[a-zA-Z(])', '*', texto)
+    return texto
+
+
+def parsear(funcion_texto, variable_texto):
+    """Devuelve (expresión, símbolo) de sympy a partir de los textos del usuario."""
+    from sympy import symbols
+
+    try:
+        return expresiones.compilar(normalizar(funcion_texto), (variable_texto,)).expr, symbols(variable_texto)
+    except Exception as e:
+        raise ValueError(f"Error al interpretar la función o variable:\n{e}")
+
+
+def parsear_variables(funcion_texto, variables_texto):
+    """Como ``parsear``, pero con una o varias variables separadas por comas.
+
+    Devuelve (expresión, tupla de símbolos en el orden escrito); las variables
+    pueden repetirse para derivadas parciales de orden mayor ("x, y, y")."""
+    from sympy import Symbol
+
+    nombres = [v.strip() for v in variables_texto.split(",")]
+    if not all(re.fullmatch(r"[a-zA-Z]\w*", v) for v in nombres):
+        raise ValueError(f"Variables no válidas: {variables_texto}\nSepáralas con comas, por ejemplo: x, y")
+    distintas = tuple(dict.fromkeys(nombres))
+    try:
+        funcion = expresiones.compilar(normalizar(funcion_texto), distintas).expr
+    except Exception as e:
+        raise ValueError(f"Error al interpretar la función o variable:\n{e}")
+    return funcion, tuple(Symbol(v) for v in nombres)
+
+
+def parsear_limite(texto):
+    """Interpreta un límite de integración: números, constantes (pi, E) e infinito (oo, inf, ∞)."""
+    from sympy import oo, sympify
+
+    texto = normalizar(texto).replace("∞", "oo")
+    if texto.lstrip("+-") in ("inf", "infinito"):
+        texto = texto.replace("infinito", "oo").replace("inf", "oo")
+    try:
+        limite = sympify(texto)
+    except Exception:
+        limite = None
+    if limite is None or not (limite.is_number and (limite.is_real or limite in (oo, -oo))):
+        raise ValueError(f"Límite de integración no válido: {texto}")
+    return limite
+
+
+def _derivar(funcion, variable):
+    from sympy import diff, latex
+
+    resultado = diff(funcion, variable)
+    return resultado, latex(resultado)
+
+
+def _derivar_n(funcion, variables):
+    from sympy import diff, latex
+
+    resultado = diff(funcion, *variables)
+    return resultado, latex(resultado)
+
+
+def _gradiente(funcion, variables):
+    from sympy import diff, latex
+
+    componentes = [diff(funcion, v) for v in variables]
+    return componentes, r"\nabla f = \left(" + r",\ ".join(latex(c) for c in componentes) + r"\right)"
+
+
+def _hessiana(funcion, variables):
+    from sympy import diff, latex
+
+    gradiente = [diff(funcion, v) for v in variables]
+    n = len(variables)
+    filas = [[None] * n for _ in range(n)]
+    for i in range(n):
+        # Simétrica: sólo se deriva el triángulo superior
+        for j in range(i, n):
+            filas[i][j] = filas[j][i] = diff(gradiente[i], variables[j])
+    # mathtext no tiene matrices: una línea por fila
+    codigo = "\n".join(
+        (r"\nabla^2 f = " if i == 0 else r"\quad\quad\ ") + r"\left(" + r",\ ".join(latex(h) for h in fila) + r"\right)"
+        for i, fila in enumerate(filas)
+    )
+    return filas, codigo
+
+
+def _integrar(funcion, variable):
+    from sympy import integrate, latex
+
+    resultado = integrate(funcion, variable)
+    return resultado, latex(resultado)
+
+
+def derivar(funcion, variable, tiempo=None, progreso=None, orden=1):
+    """Devuelve (derivada de orden ``orden``, código LaTeX), calculada en el motor
+    simbólico con tiempo límite o tomada de la caché persistente."""
+    if orden < 1:
+        raise ValueError("El orden de la derivada debe ser al menos 1.")
+    if orden > 1:
+        return derivada_parcial(funcion, (variable,) * orden, tiempo=tiempo, progreso=progreso)
+    return memo.memorizar("derivar", funcion, variable, lambda: simbolico.ejecutar(
+        _derivar, funcion, variable, tiempo=tiempo, progreso=progreso, descripcion="La derivada"))
+
+
+def derivada_parcial(funcion, variables, tiempo=None, progreso=None):
+    """Deriva respecto a cada variable de ``variables`` en orden: (x, y, y) da ∂³f/∂x∂y².
+
+    Devuelve (derivada, código LaTeX); se guarda en la caché persistente."""
+    from sympy import Tuple
+
+    return memo.memorizar("derivar_n", funcion, Tuple(*variables), lambda: simbolico.ejecutar(
+        _derivar_n, funcion, tuple(variables), tiempo=tiempo, progreso=progreso,
+        descripcion="La derivada"))
+
+
+def gradiente(funcion, variables, tiempo=None, progreso=None):
+    """Devuelve (lista de derivadas parciales, código LaTeX de ∇f)."""
+    return simbolico.ejecutar(_gradiente, funcion, tuple(dict.fromkeys(variables)), tiempo=tiempo, progreso=progreso,
+                              descripcion="El gradiente")
+
+
+def hessiana(funcion, variables, tiempo=None, progreso=None):
+    """Devuelve (matriz hessiana como lista de filas, código LaTeX con una línea por fila)."""
+    return simbolico.ejecutar(_hessiana, funcion, tuple(dict.fromkeys(variables)), tiempo=tiempo, progreso=progreso,
+                              descripcion="La hessiana")
+
+
+def compilar(componentes, variables):
+    """Compila derivadas (una lista o una lista de filas) en una sola función de NumPy
+    con eliminación de subexpresiones comunes; ver ``expresiones.ConjuntoCompilado``."""
+    return expresiones.ConjuntoCompilado(componentes, variables)
+
+
+def integrar(funcion, variable, tiempo=None, progreso=None):
+    """Devuelve (integral indefinida, código LaTeX con la constante de integración).
+
+    Se toma de la caché persistente o se calcula en el motor simbólico: si
+    supera el tiempo límite se lanza ``TiempoAgotado``."""
+    resultado, codigo = memo.memorizar("integrar", funcion, variable, lambda: simbolico.ejecutar(
+        _integrar, funcion, variable, tiempo=tiempo, progreso=progreso, descripcion="La integral"))
+    return resultado, codigo + r" + C"
+
+
+def _integrar_definida(funcion, variable, a, b):
+    from sympy import Integral, integrate, latex
+
+    resultado = integrate(funcion, (variable, a, b))
+    # Sin forma cerrada sympy devuelve la integral sin evaluar
+    if resultado.has(Integral) or not resultado.is_number:
+        return None
+    return resultado, latex(resultado)
+
+
+def integrar_definida(funcion, variable, a, b, tiempo=None, progreso=None):
+    """Calcula ∫_a^b funcion d(variable); ``a`` y ``b`` son números de sympy (admiten ±oo).
+
+    Primero busca el valor exacto en el motor simbólico durante ``tiempo``
+    segundos (por omisión ``TIEMPO_DEFINIDA``); si no hay forma cerrada o se
+    agota el tiempo, integra numéricamente con Gauss–Kronrod adaptativa.
+
+    Devuelve un diccionario con ``valor`` (float), ``exacto`` (expresión de sympy
+    o None), ``latex``, ``numerico``, ``error`` (estimación del error absoluto,
+    None si es exacto) y ``evaluaciones``. Si ``funcion`` tiene otros símbolos
+    además de ``variable`` lanza ValueError: no habría un valor numérico."""
+    from sympy import latex, nan, oo, zoo
+
+    otros = funcion.free_symbols - {variable}
+    if otros:
+        nombres = ", ".join(sorted(str(simbolo) for simbolo in otros))
+        raise ValueError(f"La integral definida sólo puede depender de {variable}; da un valor numérico a: {nombres}.")
+    if tiempo is None:
+        tiempo = min(TIEMPO_DEFINIDA, simbolico.TIEMPO_LIMITE)
+    integral = rf"\int_{{{latex(a)}}}^{{{latex(b)}}} {latex(funcion)} \, d{latex(variable)}"
+
+    try:
+        exacto = simbolico.ejecutar(_integrar_definida, funcion, variable, a, b, tiempo=tiempo,
+                                    progreso=progreso, descripcion="La integral definida")
+    except Cancelado:
+        raise
+    except Exception:
+        exacto = None  # Tiempo agotado o sympy no pudo: se integra numéricamente
+
+    if exacto is not None:
+        resultado, codigo = exacto
+        if resultado.has(oo, -oo, zoo, nan):
+            raise ValueError("La integral diverge o no está definida en el intervalo.")
+        valor = complex(resultado.evalf())
+        if abs(valor.imag) > 1e-12:
+            raise ValueError("La integral no es un número real.")
+        return {"valor": valor.real, "exacto": resultado, "latex": f"{integral} = {codigo}",
+                "numerico": False, "error": None, "evaluaciones": 0}
+
+    f = expresiones.ExpresionCompilada(funcion, (str(variable),)).funcion
+    numerica = cuadratura.integrar(f, float(a), float(b), progreso=progreso)
+    if not numerica["convergio"]:
+        raise ValueError(
+            "La integración numérica no alcanzó la precisión pedida "
+            f"(valor ≈ {numerica['valor']:.10g}, error ≈ {numerica['error']:.2g}); "
+            "puede que la integral diverja."
+        )
+    return {
+        "valor": numerica["valor"],
+        "exacto": None,
+        "latex": rf"{integral} \approx {numerica['valor']:.10g} \pm {numerica['error']:.1e}",
+        "numerico": True,
+        "error": numerica["error"],
+        "evaluaciones": numerica["evaluaciones"],
+    }
+
+
+OPERACIONES = {"derivar": derivar, "integrar": integrar}
+
+# Operaciones con varias variables: reciben la tupla de símbolos
+DIFERENCIALES = {"parcial": derivada_parcial, "gradiente": gradiente, "hessiana": hessiana}
+
+
+def operar(operacion, funcion_texto, variable_texto, tiempo=None, a=None, b=None, orden=1):
+    """Deriva o integra el texto; con límites ``a`` y ``b`` (textos) la integral es definida.
+
+    Con varias variables ("x, y"), "derivar" da la derivada parcial respecto a
+    ellas en orden; "gradiente" y "hessiana" admiten también una sola."""
+    if operacion not in OPERACIONES and operacion not in DIFERENCIALES:
+        raise ValueError("Selecciona una operación.")
+    funcion, variables = parsear_variables(funcion_texto, variable_texto)
+    if operacion == "derivar" and len(variables) > 1:
+        operacion = "parcial"
+    if operacion in DIFERENCIALES:
+        return DIFERENCIALES[operacion](funcion, variables, tiempo=tiempo)
+    if len(variables) > 1:
+        raise ValueError("La integral admite una sola variable.")
+    variable = variables[0]
+    if operacion == "derivar":
+        return derivar(funcion, variable, tiempo=tiempo, orden=orden)
+    if operacion == "integrar" and (a is not None or b is not None):
+        if a is None or b is None:
+            raise ValueError("Para la integral definida indica ambos límites.")
+        return integrar_definida(funcion, variable, parsear_limite(str(a)), parsear_limite(str(b)),
+                                 tiempo=tiempo)
+    return OPERACIONES[operacion](funcion, variable, tiempo=tiempo)
@@ -0,0 +1,314 @@
+"""Motor de modelos compartimentales (SIR, SEIR, SEIRD) estructurados por grupos.
+
+La población se divide en G grupos (bandas de edad, municipios o ambos) que se
+mezclan según una matriz de contactos C (G × G). El estado es una matriz
+Y (k × G), con una fila por compartimento y en fracciones de la población de
+cada grupo, y el lado derecho se escribe en forma matricial:
+
+    λ = β(t) · C · I                  fuerza de infección de cada grupo
+    Y' = A · Y + (e_destino − e_S) ⊗ (S ∘ λ)
+
+A (k × k) reúne las transiciones lineales (E → I con σ, I → R con γ, I → D
+con μ). Con C dispersa (``scipy.sparse``) cada evaluación cuesta
+O(k·G + nnz(C)), lineal en el número de compartimentos cuando cada grupo sólo
+tiene contacto con unos pocos; la jacobiana se arma también dispersa para
+Radau y BDF.
+
+``estructura`` arma C para municipios × edades como el producto de Kronecker
+de una matriz de movilidad entre regiones y una de contactos entre edades.
+"""
+import time
+
+import numpy as np
+
+from calcucho.core import sir
+
+# Compartimentos, compartimento al que pasan los contagiados y transiciones
+# lineales (origen, destino, parámetro de la tasa)
+MODELOS = {
+    "SIR": (("S", "I", "R"), "I", (("I", "R", "gamma"),)),
+    "SEIR": (("S", "E", "I", "R"), "E", (("E", "I", "sigma"), ("I", "R", "gamma"))),
+    "SEIRD": (("S", "E", "I", "R", "D"), "E", (("E", "I", "sigma"), ("I", "R", "gamma"), ("I", "D", "mu"))),
+}
+# Tasas por omisión: incubación de 5 días y mortalidad de 1 de cada 100 infectados
+SIGMA = 0.2
+MU = 0.001
+
+# Radio espectral: hasta este número de grupos se calculan todos los autovalores; si no,
+# ARPACK con este máximo de reinicios y, si no converge, con desplazamiento e inversión
+MAX_DENSO_RADIO = 50
+REINICIOS_RADIO = 3
+TOLERANCIA_RADIO = 1e-8
+
+
+def radio_espectral(matriz, inicial=None):
+    """Radio espectral ρ de una matriz no negativa G × G, densa o dispersa.
+
+    Con pocos grupos se calculan todos los autovalores. Si no, ARPACK (``eigs``)
+    busca el de mayor módulo partiendo de ``inicial`` (p. ej., el vector del
+    instante anterior); si los autovalores mayores están tan juntos que no
+    converge en ``REINICIOS_RADIO`` reinicios, se repite con desplazamiento e
+    inversión en σ = mayor suma por filas: como σ ≥ ρ, ρ es el autovalor más
+    cercano a σ y queda bien separado de los demás. Devuelve ρ y su vector
+    (None con pocos grupos); lanza ValueError si ARPACK no converge."""
+    from scipy import sparse
+    from scipy.sparse import linalg
+
+    G = matriz.shape[0]
+    if G <= MAX_DENSO_RADIO:
+        densa = matriz.toarray() if sparse.issparse(matriz) else matriz
+        return float(np.abs(np.linalg.eigvals(densa)).max()), None
+    sigma = float(np.abs(matriz @ np.ones(G)).max())
+    if sigma == 0.0:
+        return 0.0, None
+    inicial = np.ones(G) if inicial is None else inicial
+    try:
+        valores, vectores = linalg.eigs(matriz, k=1, which="LM", v0=inicial, tol=TOLERANCIA_RADIO,
+                                        maxiter=REINICIOS_RADIO)
+    except linalg.ArpackNoConvergence:
+        if sparse.issparse(matriz):
+            matriz = sparse.csc_matrix(matriz)
+        try:
+            # σ apenas mayor que la cota, para que M − σI no sea singular si ρ = σ
+            valores, vectores = linalg.eigs(matriz, k=1, sigma=sigma * (1 + TOLERANCIA_RADIO), which="LM",
+                                            v0=inicial, tol=TOLERANCIA_RADIO)
+        except linalg.ArpackNoConvergence:
+            raise ValueError("ARPACK no convergió al calcular el radio espectral.")
+    return float(np.abs(valores[0])), np.abs(vectores[:, 0])
+
+
+def cargar_csv(ruta):
+    """Lee una matriz numérica de un archivo CSV (separado por comas, sin encabezado)."""
+    try:
+        return np.loadtxt(ruta, delimiter=",", ndmin=2)
+    except OSError as e:
+        raise ValueError(f"No se pudo leer {ruta}: {e}")
+    except ValueError:
+        raise ValueError(f"El archivo {ruta} debe contener sólo números separados por comas.")
+
+
+def estructura(poblaciones, contactos_edad=None, movilidad=None, disperso=False):
+    """Poblaciones y matriz de contactos de un modelo de regiones × edades.
+
+    ``poblaciones`` es una tabla (regiones × edades) o un vector de grupos;
+    ``contactos_edad`` (edades × edades) son los contactos diarios entre bandas
+    de edad (por omisión, mezcla homogénea) y ``movilidad`` (regiones × regiones)
+    cómo se reparten los contactos de los habitantes de cada región entre las
+    regiones (por omisión, todos en la propia). Los grupos quedan ordenados región por región y
+    C = movilidad ⊗ contactos_edad; con ``disperso``, en formato CSR."""
+    from scipy import sparse
+
+    poblaciones = np.asarray(poblaciones, dtype=float)
+    if poblaciones.ndim == 1:
+        poblaciones = poblaciones[np.newaxis, :]
+    if poblaciones.ndim != 2 or poblaciones.size == 0:
+        raise ValueError("Las poblaciones deben ser un vector o una tabla de regiones × edades.")
+    regiones, edades = poblaciones.shape
+    if contactos_edad is None:
+        contactos_edad = np.ones((edades, edades))
+    if movilidad is None:
+        movilidad = sparse.identity(regiones, format="csr")
+    if contactos_edad.shape != (edades, edades):
+        raise ValueError(f"La matriz de contactos debe ser de {edades} × {edades} (una fila por edad).")
+    if movilidad.shape != (regiones, regiones):
+        raise ValueError(f"La matriz de movilidad debe ser de {regiones} × {regiones} (una fila por región).")
+    if disperso:
+        contactos = sparse.kron(sparse.csr_matrix(movilidad), sparse.csr_matrix(contactos_edad), format="csr")
+    else:
+        movilidad = movilidad.toarray() if sparse.issparse(movilidad) else movilidad
+        contactos = np.kron(movilidad, contactos_edad)
+    return poblaciones.ravel(), contactos
+
+
+def infectados_iniciales(poblaciones, total, foco=None):
+    """Reparte ``total`` infectados según la población de la tabla (regiones × edades):
+    en todos los grupos o, con ``foco``, sólo en esa región. Devuelve un vector de grupos."""
+    poblaciones = np.asarray(poblaciones, dtype=float)
+    if poblaciones.ndim == 1:
+        poblaciones = poblaciones[np.newaxis, :]
+    if foco is None:
+        return total * poblaciones.ravel() / poblaciones.sum()
+    if not 0 <= foco < poblaciones.shape[0]:
+        raise ValueError(f"La región del foco debe estar entre 0 y {poblaciones.shape[0] - 1}.")
+    reparto = np.zeros_like(poblaciones)
+    reparto[foco] = poblaciones[foco] / poblaciones[foco].sum()
+    return total * reparto.ravel()
+
+
+class Modelo:
+    """Lado derecho y jacobiana de un modelo compartimental con G grupos.
+
+    C se escala para que su radio espectral sea 1, de modo que β conserva su
+    sentido del modelo sin estructura: R₀ = β / (γ + μ) con toda la población
+    susceptible."""
+
+    def __init__(self, nombre, poblaciones, contactos=None, gamma=0.1, sigma=SIGMA, mu=MU,
+                 tipo_beta="Constante", beta=None, disperso=False):
+        from scipy import sparse
+
+        if nombre not in MODELOS:
+            raise ValueError(f"Modelo desconocido: {nombre}")
+        self.nombre = nombre
+        self.compartimentos, destino, transiciones = MODELOS[nombre]
+        tasas = {"gamma": gamma, "sigma": sigma, "mu": mu if nombre == "SEIRD" else 0.0}
+        for clave, texto in (("gamma", "recuperación γ"), ("sigma", "incubación σ")):
+            if tasas[clave] <= 0:
+                raise ValueError(f"La tasa de {texto} debe ser positiva.")
+        if tasas["mu"] < 0:
+            raise ValueError("La tasa de mortalidad μ no puede ser negativa.")
+        self.gamma, self.sigma, self.mu = tasas["gamma"], tasas["sigma"], tasas["mu"]
+
+        self.poblaciones = np.atleast_1d(np.asarray(poblaciones, dtype=float))
+        G = self.G = len(self.poblaciones)
+        if self.poblaciones.ndim != 1 or G == 0 or np.any(self.poblaciones <= 0):
+            raise ValueError("Las poblaciones de los grupos deben ser positivas.")
+        if contactos is None:
+            contactos = np.ones((1, 1)) if G == 1 else sparse.identity(G, format="csr")
+        if contactos.shape != (G, G):
+            raise ValueError(f"La matriz de contactos debe ser de {G} × {G}.")
+        self.disperso = disperso
+        if disperso:
+            contactos = sparse.csr_matrix(contactos, dtype=float)
+            negativos = contactos.data.size and contactos.data.min() < 0
+        else:
+            contactos = contactos.toarray() if sparse.issparse(contactos) else np.asarray(contactos, dtype=float)
+            negativos = contactos.min() < 0
+        if negativos:
+            raise ValueError("La matriz de contactos no puede tener valores negativos.")
+        radio, _ = radio_espectral(contactos)
+        if radio == 0:
+            raise ValueError("La matriz de contactos no puede ser nula.")
+        self.contactos = contactos / radio
+
+        self.k = len(self.compartimentos)
+        indice = {c: i for i, c in enumerate(self.compartimentos)}
+        self.s, self.i, self.destino = indice["S"], indice["I"], indice[destino]
+        self.A = np.zeros((self.k, self.k))
+        for origen, llegada, tasa in transiciones:
+            self.A[indice[llegada], indice[origen]] += tasas[tasa]
+            self.A[indice[origen], indice[origen]] -= tasas[tasa]
+        self.beta_t = sir.funcion_beta(tipo_beta, beta)
+        self.tipo_beta, self.beta = tipo_beta, beta
+
+    def rhs(self, t, y):
+        Y = y.reshape(self.k, self.G)
+        S, I = Y[self.s], Y[self.i]
+        contagios = S * (self.beta_t(t) * (self.contactos @ I))
+        dY = self.A @ Y
+        dY[self.s] -= contagios
+        dY[self.destino] += contagios
+        return dY.ravel()
+
+    def jacobiana(self, t, y):
+        """Jacobiana (k·G × k·G): densa, o CSC si el modelo usa matrices dispersas."""
+        from scipy import sparse
+
+        Y = y.reshape(self.k, self.G)
+        S, I = Y[self.s], Y[self.i]
+        b = self.beta_t(t)
+        fuerza = b * (self.contactos @ I)
+        # ∂contagios/∂S = diag(λ), ∂contagios/∂I = β·diag(S)·C
+        if self.disperso:
+            por_s = sparse.diags(fuerza)
+            por_i = sparse.diags(b * S) @ self.contactos
+        else:
+            por_s = np.diag(fuerza)
+            por_i = (b * S)[:, np.newaxis] * self.contactos
+        bloques = [[None] * self.k for _ in range(self.k)]
+        for fila in range(self.k):
+            for columna in range(self.k):
+                if self.A[fila, columna]:
+                    bloques[fila][columna] = self.A[fila, columna] * (
+                        sparse.identity(self.G) if self.disperso else np.eye(self.G))
+        for fila, signo in ((self.s, -1.0), (self.destino, 1.0)):
+            for columna, derivada in ((self.s, por_s), (self.i, por_i)):
+                bloque = signo * derivada
+                bloques[fila][columna] = bloque if bloques[fila][columna] is None else bloques[fila][columna] + bloque
+        if self.disperso:
+            # Bloques diagonales explícitos: R y D no influyen en nada y bmat no sabría su tamaño
+            for fila in range(self.k):
+                if bloques[fila][fila] is None:
+                    bloques[fila][fila] = sparse.csr_matrix((self.G, self.G))
+            return sparse.bmat(bloques, format="csc")
+        ceros = np.zeros((self.G, self.G))
+        return np.block([[ceros if b is None else b for b in fila] for fila in bloques])
+
+    def numero_reproductivo(self, t, S, inicial=None):
+        """Rₜ = β(t) / (γ + μ) · ρ(diag(S)·C) y el vector de ``radio_espectral``."""
+        from scipy import sparse
+
+        matriz = sparse.diags(S) @ self.contactos if self.disperso else S[:, np.newaxis] * self.contactos
+        radio, v = radio_espectral(matriz, inicial)
+        return self.beta_t(t) / (self.gamma + self.mu) * radio, v
+
+
+def simular(modelo, infectados, dias, puntos=300, metodo="RK45", rtol=sir.RTOL, atol=sir.ATOL, progreso=None):
+    """Integra ``modelo`` desde ``infectados`` (total repartido según la población
+    de cada grupo, o un arreglo con los infectados de cada grupo).
+
+    Devuelve ``t``, el nombre del ``modelo``, sus ``compartimentos`` y, para
+    cada uno, su curva como fracción de la población total; ``Rt`` (NaN en los
+    instantes en que no se pudo calcular ρ);
+    ``infectados_grupo`` (G × puntos, fracción de infectados de cada grupo) y,
+    como ``sir.simular``, el ``metodo``, las ``evaluaciones``, las
+    ``jacobianas`` y los ``segundos``."""
+    from scipy.integrate import solve_ivp
+
+    if metodo not in sir.METODOS:
+        raise ValueError(f"Método de integración desconocido: {metodo}")
+    if metodo == "LSODA" and modelo.disperso:
+        raise ValueError("LSODA sólo admite jacobianas densas; con matrices dispersas usa Radau o BDF.")
+    if dias <= 0:
+        raise ValueError("Los días de simulación deben ser positivos.")
+    if not (rtol > 0 and atol > 0):
+        raise ValueError("Las tolerancias deben ser positivas.")
+    N = modelo.poblaciones
+    infectados = np.asarray(infectados, dtype=float)
+    if infectados.ndim == 0:
+        infectados = infectados * N / N.sum()
+    infectados = infectados.ravel()
+    if infectados.shape != N.shape or np.any(infectados < 0) or np.any(infectados > N):
+        raise ValueError("Los infectados iniciales deben estar entre 0 y la población de cada grupo.")
+
+    Y0 = np.zeros((modelo.k, modelo.G))
+    Y0[modelo.i] = infectados / N
+    Y0[modelo.s] = 1 - Y0[modelo.i]
+    t_eval = np.linspace(0, dias, puntos)
+
+    rhs = modelo.rhs
+    if progreso is not None:
+        # El avance se informa según el tiempo que alcanza el integrador
+        def rhs(t, y):
+            progreso(min(t / dias, 1.0))
+            return modelo.rhs(t, y)
+
+    opciones = {} if metodo == "RK45" else {"jac": modelo.jacobiana}
+    inicio = time.perf_counter()
+    sol = solve_ivp(rhs, (0, dias), Y0.ravel(), method=metodo, t_eval=t_eval, rtol=rtol, atol=atol, **opciones)
+    segundos = time.perf_counter() - inicio
+    if not sol.success:
+        raise ValueError(f"La integración no convergió: {sol.message}")
+
+    Y = sol.y.reshape(modelo.k, modelo.G, -1)
+    pesos = N / N.sum()
+    Rt = np.empty(len(sol.t))
+    vector = None
+    for j, t in enumerate(sol.t):
+        try:
+            Rt[j], vector = modelo.numero_reproductivo(t, Y[modelo.s, :, j], vector)
+        except ValueError:
+            # Un instante sin Rₜ no invalida la integración
+            Rt[j], vector = np.nan, None
+
+    resultado = {"t": sol.t, "modelo": modelo.nombre, "compartimentos": modelo.compartimentos}
+    for fila, nombre in enumerate(modelo.compartimentos):
+        resultado[nombre] = pesos @ Y[fila]
+    resultado.update({
+        "Rt": Rt,
+        "infectados_grupo": Y[modelo.i],
+        "metodo": metodo,
+        "evaluaciones": int(sol.nfev),
+        "jacobianas": int(sol.njev),
+        "segundos": segundos,
+    })
+    return resultado
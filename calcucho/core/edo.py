@@ -0,0 +1,107 @@
+"""Métodos numéricos de un paso para dy/dx = f(x, y)."""
+import re
+
+import numpy as np
+
+from calcucho.core import expresiones
+from calcucho.core.progreso import Avance
+
+METODOS = ("Euler", "Heun", "Runge-Kutta 4", "Taylor orden 2")
+
+FUNCIONES_PERMITIDAS = {
+    "sin", "cos", "tan", "exp", "log", "sqrt", "abs",
+    "asin", "acos", "atan", "sinh", "cosh", "tanh"
+}
+
+
+def validar_ecuacion(expr_str):
+    """Valida el texto de f(x, y) y lo devuelve con ^ convertido en **."""
+    expr_str = expr_str.replace("^", "**").strip()
+
+    if re.search(r"[;:!¿?@#\$&_=~`%ºª|\\]", expr_str):
+        raise ValueError("La ecuación contiene símbolos inválidos como %, ;, !, etc.")
+    if '//' in expr_str:
+        raise ValueError("La operación '//' no está permitida. Usa '/' para dividir.")
+    if not expr_str or expr_str[-1] in "+-*/^." or expr_str in "+-*/^.":
+        raise ValueError("La expresión está vacía o incompleta.")
+    if any(c in expr_str for c in ";:!¿?@#\\$&_=~`ºª[]{}"):
+        raise ValueError("La expresión contiene caracteres no válidos.")
+
+    for token in re.findall(r"[a-zA-Z_]+", expr_str):
+        if token not in FUNCIONES_PERMITIDAS and token not in ['x', 'y']:
+            raise ValueError(f"La función '{token}' no está permitida.")
+    return expr_str
+
+
+def validar_parametros(x0, h, xf):
+    if h <= 0:
+        raise ValueError("El paso h debe ser un número positivo y mayor que cero.")
+    if xf <= x0:
+        raise ValueError("El valor de x final debe ser mayor que x₀.")
+
+
+def resolver(ecuacion, x0, y0, h, xf, metodo="Euler", progreso=None):
+    """Integra la ecuación desde x0 hasta xf; devuelve las listas (xs, ys, fs)."""
+    from sympy.core.sympify import SympifyError
+
+    if metodo not in METODOS:
+        raise ValueError("Método no soportado.")
+    expr_str = validar_ecuacion(ecuacion)
+    validar_parametros(x0, h, xf)
+
+    try:
+        compilada = expresiones.compilar(expr_str, ("x", "y"))
+    except (SympifyError, SyntaxError):
+        raise ValueError("La ecuación ingresada no es válida. Revisa que esté bien escrita.")
+
+    def f(xv, yv):
+        try:
+            with np.errstate(all="ignore"):
+                valor = float(compilada(xv, yv))
+        except ArithmeticError:
+            valor = np.nan
+        if not np.isfinite(valor):
+            raise ValueError(f"La ecuación no está definida en x = {xv:g}, y = {yv:g}.")
+        return valor
+
+    if metodo == "Taylor orden 2":
+        fx = compilada.derivada("x").funcion
+        fy = compilada.derivada("y").funcion
+
+    pasos = int(np.ceil((xf - x0) / h))
+    avance = Avance(progreso, pasos)
+
+    xs = [x0]
+    ys = [y0]
+    fs = [round(f(x0, y0), 5)]
+
+    for i in range(pasos):
+        avance(i)
+        xi = xs[-1]
+        yi = ys[-1]
+
+        if metodo == "Euler":
+            yi1 = yi + h * f(xi, yi)
+        elif metodo == "Heun":
+            k1 = f(xi, yi)
+            k2 = f(xi + h, yi + h * k1)
+            yi1 = yi + (h / 2) * (k1 + k2)
+        elif metodo == "Runge-Kutta 4":
+            k1 = f(xi, yi)
+            k2 = f(xi + h / 2, yi + h * k1 / 2)
+            k3 = f(xi + h / 2, yi + h * k2 / 2)
+            k4 = f(xi + h, yi + h * k3)
+            yi1 = yi + (h / 6) * (k1 + 2 * k2 + 2 * k3 + k4)
+        else:  # Taylor orden 2
+            f1 = f(xi, yi)
+            dfx = float(fx(xi, yi))
+            dfy = float(fy(xi, yi))
+            yi1 = yi + h * f1 + (h**2 / 2) * (dfx + dfy * f1)
+
+        xi1 = xi + h
+        xs.append(round(xi1, 5))
+        ys.append(round(yi1, 5))
+        fs.append(round(f(xi1, yi1), 5))
+
+    avance.terminar()
+    return xs, ys, fs
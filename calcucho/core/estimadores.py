@@ -0,0 +1,408 @@
+"""Estimadores Monte Carlo de ∫_a^b h(x) dx con reducción de varianza y cuasi Monte Carlo.
+
+Cada estimador consume evaluaciones de h por lotes y mantiene su estimación
+y su error estándar sin guardar las muestras (momentos combinados lote a lote).
+``comparar`` ejecuta varios con el mismo presupuesto de evaluaciones y resume
+para cada uno la varianza por evaluación y el tiempo necesario para alcanzar un
+error relativo objetivo.
+
+- Acierto y rechazo: proporción de puntos bajo la curva (con signo).
+- Valor medio: (b − a)·promedio de h(U).
+- Estratificado: el intervalo se divide en ``ESTRATOS`` partes iguales con
+  el mismo número de puntos en cada una.
+- Antitético: promedia h(x) y h(a + b − x).
+- Variable de control: un polinomio de Chebyshev ajustado a h en unos nodos
+  piloto, cuya integral se conoce exactamente, con coeficiente óptimo estimado.
+- Importancia: puntos con densidad proporcional a q(x), indicada por el
+  usuario, mezclada con un 5 % de uniforme para que los pesos estén acotados.
+- Sobol y Halton (cuasi Monte Carlo): ``REPLICAS`` secuencias aleatorizadas
+  independientes; el error estándar sale de la dispersión entre réplicas.
+"""
+import math
+import time
+import warnings
+from abc import ABC, abstractmethod
+
+import numpy as np
+
+from calcucho.core import expresiones, montecarlo
+
+ESTRATOS = 64
+# Nodos piloto y grado del polinomio de la variable de control
+NODOS_CONTROL = 33
+GRADO_CONTROL = 8
+# Celdas con que se tabula la densidad de importancia y peso de la mezcla uniforme
+CELDAS_IMPORTANCIA = 4096
+MEZCLA_UNIFORME = 0.05
+REPLICAS = 16
+# Evaluaciones mínimas antes de dar por alcanzado el error objetivo
+MIN_EVALUACIONES_OBJETIVO = 10_000
+
+
+class _Momentos:
+    """Media y co-momentos de d variables, combinados lote a lote (Chan et al.)."""
+
+    def __init__(self, d=1):
+        self.n = 0
+        self.media = np.zeros(d)
+        self.m2 = np.zeros((d, d))
+
+    def agregar(self, datos):
+        datos = np.asarray(datos, dtype=float).reshape(len(datos), -1)
+        nb = len(datos)
+        media_b = datos.mean(axis=0)
+        centrados = datos - media_b
+        m2_b = centrados.T @ centrados
+        delta = media_b - self.media
+        n = self.n + nb
+        self.m2 += m2_b + np.outer(delta, delta) * self.n * nb / n
+        self.media += delta * nb / n
+        self.n = n
+
+    def varianza(self, i=0):
+        return self.m2[i, i] / (self.n - 1) if self.n > 1 else math.inf
+
+
+class _Estimador(ABC):
+    def __init__(self, h, a, b, rng):
+        self.h = h
+        self.a, self.b = a, b
+        self.longitud = b - a
+        self.rng = rng
+        # Evaluaciones gastadas que ya no cuentan en la estimación
+        self.descartadas = 0
+
+    @abstractmethod
+    def paso(self, m):
+        """Gasta unas ``m`` evaluaciones de h; devuelve cuántas usó."""
+
+    @abstractmethod
+    def estimacion(self):
+        """Devuelve (valor, error estándar)."""
+
+
+class _Muestral(_Estimador):
+    """Promedio de muestras independientes ``muestras(k)`` con media igual a la integral."""
+    evaluaciones_por_muestra = 1
+
+    def __init__(self, *args):
+        super().__init__(*args)
+        self.momentos = _Momentos()
+
+    @abstractmethod
+    def muestras(self, k):
+        """Devuelve ``k`` muestras; puede llamar a ``descartar``."""
+
+    def descartar(self):
+        """Olvida las muestras promediadas hasta ahora (p. ej., porque estaban sesgadas)."""
+        self.descartadas += self.momentos.n * self.evaluaciones_por_muestra
+        self.momentos = _Momentos()
+
+    def paso(self, m):
+        k = max(m // self.evaluaciones_por_muestra, 2)
+        # Primero las muestras: si descartan, se acumulan en los momentos nuevos
+        muestras = self.muestras(k)
+        self.momentos.agregar(muestras)
+        return k * self.evaluaciones_por_muestra
+
+    def estimacion(self):
+        return float(self.momentos.media[0]), math.sqrt(self.momentos.varianza() / self.momentos.n)
+
+
+class AciertoRechazo(_Muestral):
+    nombre = "Acierto y rechazo"
+
+    def __init__(self, *args):
+        super().__init__(*args)
+        # La caja cubre la envolvente de montecarlo entre h y 0, que no recorta picos angostos
+        _, _, inferior, superior = montecarlo.envolvente(
+            [self.h, lambda x: np.zeros(np.shape(x))], [None, None], self.a, self.b, entre_curvas=True)
+        self.abajo, self.arriba = min(0.0, float(inferior.min())), max(0.0, float(superior.max()))
+        self.reinicios = 0
+
+    def muestras(self, k):
+        x = self.rng.uniform(self.a, self.b, k)
+        hx = self.h(x)
+        if hx.min() < self.abajo or hx.max() > self.arriba:
+            # h se sale de la caja: se amplía como en montecarlo y se descartan las muestras ya promediadas
+            if self.reinicios == montecarlo.MAX_REINICIOS:
+                raise ValueError("No se pudo acotar la región: la función cambia demasiado rápido en [a, b].")
+            self.reinicios += 1
+            holgura = montecarlo.AMPLIACION * (self.arriba - self.abajo)
+            if hx.min() < self.abajo:
+                self.abajo = hx.min() - max(self.abajo - hx.min(), holgura)
+            if hx.max() > self.arriba:
+                self.arriba = hx.max() + max(hx.max() - self.arriba, holgura)
+            self.descartar()
+        y = self.rng.uniform(self.abajo, self.arriba, k)
+        # Con signo: los puntos entre 0 y h cuentan +1 si h > 0 y −1 si h < 0
+        signo = ((0 <= y) & (y <= hx)).astype(float) - ((hx <= y) & (y < 0))
+        return self.longitud * (self.arriba - self.abajo) * signo
+
+
+class ValorMedio(_Muestral):
+    nombre = "Valor medio"
+
+    def muestras(self, k):
+        return self.longitud * self.h(self.rng.uniform(self.a, self.b, k))
+
+
+class Antitetico(_Muestral):
+    nombre = "Antitético"
+    evaluaciones_por_muestra = 2
+
+    def muestras(self, k):
+        x = self.rng.uniform(self.a, self.b, k)
+        return self.longitud * (self.h(x) + self.h(self.a + self.b - x)) / 2
+
+
+class Importancia(_Muestral):
+    nombre = "Importancia"
+
+    def __init__(self, h, a, b, rng, densidad):
+        super().__init__(h, a, b, rng)
+        self.ancho = self.longitud / CELDAS_IMPORTANCIA
+        centros = a + (np.arange(CELDAS_IMPORTANCIA) + 0.5) * self.ancho
+        with np.errstate(all="ignore"):
+            masa = np.broadcast_to(np.asarray(densidad(centros), dtype=float), centros.shape) * self.ancho
+        if not np.all(np.isfinite(masa)) or np.any(masa < 0) or masa.sum() <= 0:
+            raise ValueError("La densidad q(x) debe ser finita, no negativa y no nula en [a, b].")
+        # La densidad efectiva es constante en cada celda: los pesos h/p son exactos
+        self.masa = (1 - MEZCLA_UNIFORME) * masa / masa.sum() + MEZCLA_UNIFORME / CELDAS_IMPORTANCIA
+        self.acumulada = np.cumsum(self.masa)
+
+    def muestras(self, k):
+        celda = np.minimum(np.searchsorted(self.acumulada, self.rng.random(k) * self.acumulada[-1], side="right"),
+                           CELDAS_IMPORTANCIA - 1)
+        x = self.a + (celda + self.rng.random(k)) * self.ancho
+        return self.h(x) / (self.masa[celda] / self.ancho)
+
+
+class Estratificado(_Estimador):
+    nombre = "Estratificado"
+
+    def __init__(self, *args):
+        super().__init__(*args)
+        self.n = np.zeros(ESTRATOS)
+        self.media = np.zeros(ESTRATOS)
+        self.m2 = np.zeros(ESTRATOS)
+
+    def paso(self, m):
+        k = max(m // ESTRATOS, 2)
+        u = self.rng.random((ESTRATOS, k))
+        x = self.a + (np.arange(ESTRATOS)[:, None] + u) * (self.longitud / ESTRATOS)
+        y = self.longitud * self.h(x)
+        media_b = y.mean(axis=1)
+        m2_b = ((y - media_b[:, None]) ** 2).sum(axis=1)
+        delta = media_b - self.media
+        n = self.n + k
+        self.m2 += m2_b + delta ** 2 * self.n * k / n
+        self.media += delta * k / n
+        self.n = n
+        return ESTRATOS * k
+
+    def estimacion(self):
+        varianzas = self.m2 / (self.n - 1)
+        return float(self.media.mean()), math.sqrt((varianzas / self.n).sum()) / ESTRATOS
+
+
+class VariableControl(_Estimador):
+    nombre = "Variable de control"
+
+    def __init__(self, *args):
+        super().__init__(*args)
+        nodos = np.polynomial.chebyshev.chebpts2(NODOS_CONTROL)
+        x = self.a + (nodos + 1) * self.longitud / 2
+        self.control = np.polynomial.Chebyshev.fit(x, self.h(x), GRADO_CONTROL, domain=[self.a, self.b])
+        primitiva = self.control.integ()
+        # E[L·c(U)] con U uniforme en [a, b] es ∫ c
+        self.media_control = float(primitiva(self.b) - primitiva(self.a))
+        self.momentos = _Momentos(2)
+        self.piloto = NODOS_CONTROL
+
+    def paso(self, m):
+        k = max(m, 3)
+        x = self.rng.uniform(self.a, self.b, k)
+        self.momentos.agregar(np.column_stack([self.longitud * self.h(x), self.longitud * self.control(x)]))
+        usadas, self.piloto = k + self.piloto, 0
+        return usadas
+
+    def estimacion(self):
+        n = self.momentos.n
+        (my, mc), m2 = self.momentos.media, self.momentos.m2
+        beta = m2[0, 1] / m2[1, 1] if m2[1, 1] > 0 else 0.0
+        residual = max(m2[0, 0] - beta * m2[0, 1], 0.0) / (n - 2)
+        return float(my - beta * (mc - self.media_control)), math.sqrt(residual / n)
+
+
+class _Cuasi(_Estimador):
+    """Réplicas independientes de una secuencia de baja discrepancia aleatorizada."""
+
+    def __init__(self, *args):
+        super().__init__(*args)
+        semillas = self.rng.integers(0, 2**32, REPLICAS)
+        self.secuencias = [self.crear(int(s)) for s in semillas]
+        self.sumas = np.zeros(REPLICAS)
+        self.n = 0
+
+    @abstractmethod
+    def crear(self, semilla):
+        """Secuencia de ``scipy.stats.qmc`` de dimensión 1 con la ``semilla`` dada."""
+
+    def paso(self, m):
+        k = self.puntos_por_replica(max(m // REPLICAS, 1))
+        with warnings.catch_warnings():
+            warnings.simplefilter("ignore")  # Sobol avisa si k no es potencia de 2
+            u = np.stack([s.random(k)[:, 0] for s in self.secuencias])
+        self.sumas += (self.longitud * self.h(self.a + self.longitud * u)).sum(axis=1)
+        self.n += k
+        return REPLICAS * k
+
+    def puntos_por_replica(self, k):
+        return k
+
+    def estimacion(self):
+        medias = self.sumas / self.n
+        return float(medias.mean()), float(medias.std(ddof=1) / math.sqrt(REPLICAS))
+
+
+class Sobol(_Cuasi):
+    nombre = "Sobol (cuasi)"
+
+    def crear(self, semilla):
+        from scipy.stats import qmc
+        return qmc.Sobol(1, scramble=True, seed=semilla)
+
+    def puntos_por_replica(self, k):
+        # Las propiedades de equilibrio de Sobol piden potencias de 2
+        return 2 ** int(math.log2(k))
+
+
+class Halton(_Cuasi):
+    nombre = "Halton (cuasi)"
+
+    def crear(self, semilla):
+        from scipy.stats import qmc
+        return qmc.Halton(1, scramble=True, seed=semilla)
+
+
+ESTIMADORES = {clase.nombre: clase for clase in (
+    AciertoRechazo, ValorMedio, Estratificado, Antitetico, VariableControl, Importancia, Sobol, Halton,
+)}
+
+
+def _integrando(fx_texto, gx_texto):
+    """h(x) = f(x) o g(x) − f(x), vectorizada; falla si no es finita."""
+    fx = expresiones.compilar(fx_texto, ("x",)).funcion
+    gx = expresiones.compilar(gx_texto, ("x",)).funcion if gx_texto is not None else None
+
+    def h(x):
+        with np.errstate(all="ignore"):
+            y = np.broadcast_to(np.asarray(fx(x), dtype=float), np.shape(x))
+            if gx is not None:
+                y = np.broadcast_to(np.asarray(gx(x), dtype=float), np.shape(x)) - y
+        if not np.all(np.isfinite(y)):
+            raise ValueError("La función no es finita (o no es real) en algún punto de [a, b].")
+        return y
+    return h
+
+
+def ejecutar(estimador, n, lote, error_objetivo=None, progreso=None):
+    """Hace avanzar ``estimador`` hasta ``n`` evaluaciones (o hasta el error objetivo)
+    y devuelve su fila de resultados con el historial de convergencia.
+
+    ``evaluaciones`` y ``varianza`` se refieren sólo a las evaluaciones en que se
+    basa la estimación; las que el estimador descartó van en ``descartadas``."""
+    inicio = time.perf_counter()
+    usadas = 0
+    historial = {"evaluaciones": [], "valor": [], "error_estandar": []}
+    alcanzado = False
+    while usadas < n:
+        usadas += estimador.paso(min(lote, n - usadas))
+        valor, error_estandar = estimador.estimacion()
+        historial["evaluaciones"].append(usadas)
+        historial["valor"].append(valor)
+        historial["error_estandar"].append(error_estandar)
+        if progreso is not None:
+            progreso(min(usadas / n, 1.0))
+        if (error_objetivo is not None and usadas - estimador.descartadas >= MIN_EVALUACIONES_OBJETIVO
+                and error_estandar <= error_objetivo * abs(valor)):
+            alcanzado = True
+            break
+    segundos = time.perf_counter() - inicio
+
+    # Varianza por evaluación: la que tendría el estimador con una sola evaluación
+    vigentes = usadas - estimador.descartadas
+    varianza = error_estandar ** 2 * vigentes
+    fila = {
+        "estimador": estimador.nombre,
+        "valor": valor,
+        "error_estandar": error_estandar,
+        "ic95": (valor - montecarlo.Z_95 * error_estandar, valor + montecarlo.Z_95 * error_estandar),
+        "varianza": varianza,
+        "evaluaciones": vigentes,
+        "descartadas": estimador.descartadas,
+        "segundos": segundos,
+        "objetivo_alcanzado": alcanzado,
+        "evaluaciones_objetivo": None,
+        "segundos_objetivo": None,
+        "historial": {clave: np.array(valores) for clave, valores in historial.items()},
+    }
+    if error_objetivo is not None and valor != 0:
+        # Si no se alcanzó, se extrapola con error ∝ 1/√N (pesimista para cuasi Monte Carlo)
+        necesarias = usadas if alcanzado else math.ceil(varianza / (error_objetivo * valor) ** 2)
+        fila["evaluaciones_objetivo"] = necesarias
+        fila["segundos_objetivo"] = segundos if alcanzado else necesarias * segundos / usadas
+    return fila
+
+
+def comparar(fx_texto, a, b, n, gx_texto=None, densidad_texto=None, estimadores=None,
+             semilla=None, error_objetivo=None, progreso=None, parcial=None):
+    """Estima ∫_a^b f (o ∫_a^b (g − f)) con cada estimador y ``n`` evaluaciones como máximo.
+
+    ``estimadores`` son nombres de ``ESTIMADORES`` (por omisión, todos; el de
+    importancia sólo si se da ``densidad_texto``). Tras cada estimador se
+    llama a ``parcial(fila)``. Devuelve un diccionario con la integral exacta
+    (``exacta``, ``exacta_numerica``) y las ``filas`` de resultados, que
+    incluyen el error real porcentual respecto a la exacta."""
+    if n < 100:
+        raise ValueError("Para comparar estimadores usa al menos 100 evaluaciones.")
+    if a >= b:
+        raise ValueError("El límite inferior a debe ser menor que b.")
+    if estimadores is None:
+        estimadores = [nombre for nombre in ESTIMADORES if nombre != Importancia.nombre or densidad_texto]
+    desconocidos = [nombre for nombre in estimadores if nombre not in ESTIMADORES]
+    if desconocidos:
+        raise ValueError(f"Estimador desconocido: {', '.join(desconocidos)}")
+    if Importancia.nombre in estimadores and not densidad_texto:
+        raise ValueError("El muestreo por importancia necesita una densidad q(x).")
+
+    h = _integrando(fx_texto, gx_texto)
+    rng = np.random.default_rng(semilla)
+    lote = min(montecarlo.LOTE, max(n // montecarlo.MIN_LOTES, 1_000))
+
+    filas = []
+    for i, nombre in enumerate(estimadores):
+        clase = ESTIMADORES[nombre]
+        if clase is Importancia:
+            densidad = expresiones.compilar(densidad_texto, ("x",)).funcion
+            estimador = clase(h, a, b, rng, densidad)
+        else:
+            estimador = clase(h, a, b, rng)
+        avance = None if progreso is None else (lambda f, i=i: progreso((i + f) / (len(estimadores) + 1)))
+        fila = ejecutar(estimador, n, lote, error_objetivo, avance)
+        filas.append(fila)
+        if parcial is not None:
+            parcial(fila)
+
+    fx_expr = expresiones.compilar(fx_texto, ("x",)).expr
+    if gx_texto is not None:
+        expr = expresiones.compilar(gx_texto, ("x",)).expr - fx_expr
+    else:
+        expr = fx_expr
+    exacta, numerica = montecarlo.area_exacta(expr, a, b, h, progreso)
+    for fila in filas:
+        fila["error_real"] = abs((fila["valor"] - exacta) / exacta) * 100 if exacta else float("nan")
+    if progreso is not None:
+        progreso(1.0)
+    return {"exacta": exacta, "exacta_numerica": numerica, "filas": filas}
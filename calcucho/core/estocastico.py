@@ -0,0 +1,219 @@
+"""Modelo SIR estocástico: réplicas con Gillespie exacto y con tau-leaping.
+
+Las poblaciones son enteras y cada réplica es una trayectoria al azar; con
+pocos infectados iniciales una parte de las réplicas se extingue antes de que
+haya brote, algo que la EDO de ``sir`` no puede mostrar.
+
+- ``Gillespie``: algoritmo directo, evento por evento. Con β(t) variable se
+  usa aclarado (thinning): se proponen contagios con la cota superior de β y
+  se aceptan con probabilidad β(t)/β_max, lo que sigue siendo exacto.
+- ``Tau-leaping``: pasos fijos de a lo sumo τ días; los contagios y las
+  recuperaciones de cada paso son binomiales, así que las poblaciones nunca
+  son negativas.
+
+Todas las réplicas de un lote avanzan juntas como arreglos (en Gillespie sólo
+las que siguen activas). Como en ``montecarlo``, cada lote usa su propio flujo
+aleatorio derivado de la semilla y los lotes se pueden repartir entre procesos
+sin cambiar el resultado. El resultado incluye la curva de la EDO con los
+mismos parámetros como referencia.
+"""
+import time
+from contextlib import closing
+
+import numpy as np
+
+from calcucho.core import paralelo, sir
+from calcucho.core.progreso import Avance
+
+METODOS = ("Gillespie", "Tau-leaping")
+# Paso máximo por omisión de tau-leaping, en días
+TAU = 0.25
+# Percentiles de las bandas
+PERCENTILES = (5, 25, 50, 75, 95)
+# Una réplica se extinguió sin brote si se infectó menos de esta fracción de la población
+UMBRAL_BROTE = 0.05
+
+# Réplicas por lote y trabajo (réplicas × eventos o pasos) desde el que compensa usar otros procesos
+LOTE_REPLICAS = 500
+MIN_TRABAJO_PARALELO = 20_000_000
+
+
+def _gillespie(N, I0, gamma, tipo_beta, beta, m, semilla, malla, tau):
+    """``m`` réplicas exactas; devuelve I y R en los puntos de ``malla`` (m × puntos) y los eventos."""
+    rng = np.random.default_rng(semilla)
+    base = sir.BETA_BASE[tipo_beta] if beta is None else beta
+    beta_max = base if tipo_beta == "Constante" else base + 0.05
+    dias = malla[-1]
+    puntos = len(malla)
+    I_malla = np.empty((m, puntos), dtype=np.int32)
+    R_malla = np.empty((m, puntos), dtype=np.int32)
+    S_final = np.full(m, N - I0, dtype=np.int64)
+    I_final = np.full(m, I0, dtype=np.int64)
+    # Primer punto de la malla que falta llenar en cada réplica
+    llenos = np.zeros(m, dtype=np.int64)
+
+    # Estado de las réplicas activas; ``fila`` es su renglón en las mallas
+    fila = np.arange(m) if I0 > 0 else np.arange(0)
+    S = np.full(len(fila), N - I0, dtype=np.int64)
+    I = np.full(len(fila), I0, dtype=np.int64)
+    t = np.zeros(len(fila))
+    siguiente = np.zeros(len(fila), dtype=np.int64)
+    eventos = 0
+
+    while len(fila):
+        contagio_max = beta_max * S * I / N
+        recuperacion = gamma * I
+        total = contagio_max + recuperacion
+        t = t + rng.exponential(1.0, len(fila)) / total
+        # Los puntos de la malla anteriores al evento conservan el estado actual
+        hasta = np.searchsorted(malla, t, side="left")
+        avanza = hasta > siguiente
+        while avanza.any():
+            k = np.flatnonzero(avanza)
+            I_malla[fila[k], siguiente[k]] = I[k]
+            R_malla[fila[k], siguiente[k]] = N - S[k] - I[k]
+            siguiente[k] += 1
+            avanza = hasta > siguiente
+
+        dentro = t <= dias
+        u = rng.random(len(fila)) * total
+        recupera = dentro & (u < recuperacion)
+        contagia = dentro & ~recupera & (u - recuperacion < contagio_max * sir.beta_func(t, tipo_beta, beta) / beta_max)
+        I += contagia.astype(np.int64) - recupera
+        S -= contagia
+        eventos += int(np.count_nonzero(contagia) + np.count_nonzero(recupera))
+
+        terminadas = ~dentro | (I == 0)
+        if terminadas.any():
+            k = np.flatnonzero(terminadas)
+            S_final[fila[k]] = S[k]
+            I_final[fila[k]] = I[k]
+            llenos[fila[k]] = siguiente[k]
+            vivas = ~terminadas
+            fila, S, I, t, siguiente = fila[vivas], S[vivas], I[vivas], t[vivas], siguiente[vivas]
+
+    # Tras el último evento el estado ya no cambia
+    resto = np.arange(puntos) >= llenos[:, np.newaxis]
+    I_malla[resto] = np.broadcast_to(I_final[:, np.newaxis], resto.shape)[resto]
+    R_malla[resto] = np.broadcast_to((N - S_final - I_final)[:, np.newaxis], resto.shape)[resto]
+    return I_malla, R_malla, eventos
+
+
+def _tau_leaping(N, I0, gamma, tipo_beta, beta, m, semilla, malla, tau):
+    """``m`` réplicas con pasos binomiales; devuelve I y R en ``malla`` (m × puntos) y los pasos."""
+    rng = np.random.default_rng(semilla)
+    puntos = len(malla)
+    intervalo = malla[1] - malla[0]
+    # Pasos de a lo sumo τ que caen justo sobre los puntos de la malla
+    subpasos = max(int(np.ceil(intervalo / tau)), 1)
+    h = intervalo / subpasos
+    recuperar = 1 - np.exp(-gamma * h)
+    I_malla = np.empty((m, puntos), dtype=np.int32)
+    R_malla = np.empty((m, puntos), dtype=np.int32)
+    S = np.full(m, N - I0, dtype=np.int64)
+    I = np.full(m, I0, dtype=np.int64)
+    I_malla[:, 0], R_malla[:, 0] = I, 0
+    for j in range(1, puntos):
+        for paso in range(subpasos):
+            t = malla[j - 1] + paso * h
+            contagiar = -np.expm1(-sir.beta_func(t, tipo_beta, beta) * h * I / N)
+            contagios = rng.binomial(S, contagiar)
+            recuperaciones = rng.binomial(I, recuperar)
+            S -= contagios
+            I += contagios - recuperaciones
+        I_malla[:, j] = I
+        R_malla[:, j] = N - S - I
+    return I_malla, R_malla, (puntos - 1) * subpasos
+
+
+def _determinista(N, I0, gamma, tipo_beta, beta, malla):
+    """S, I y R de la EDO de ``sir`` en los puntos de ``malla``, en personas."""
+    from scipy.integrate import solve_ivp
+
+    rhs, _ = sir.sistema(gamma, tipo_beta, beta)
+    sol = solve_ivp(rhs, (0, malla[-1]), [(N - I0) / N, I0 / N, 0.0], t_eval=malla, rtol=sir.RTOL, atol=sir.ATOL)
+    if not sol.success:
+        raise ValueError(f"La integración no convergió: {sol.message}")
+    return {nombre: N * X for nombre, X in zip("SIR", sol.y)}
+
+
+def simular(N, I0, gamma, dias, tipo_beta="Constante", replicas=1000, metodo="Gillespie", tau=TAU, puntos=200,
+            semilla=None, procesos=None, beta=None, progreso=None):
+    """Simula ``replicas`` trayectorias del SIR estocástico con ``metodo`` (Gillespie o Tau-leaping).
+
+    Devuelve ``t`` y, en personas, las ``bandas`` de S, I y R (un renglón por
+    percentil de ``PERCENTILES``) y su ``media``; ``extincion``, la fracción
+    de réplicas sin infectados en cada instante; ``prob_extincion``, la de las
+    que se extinguieron sin brote (menos de ``UMBRAL_BROTE`` de la población
+    infectada), con su ``extincion_teorica`` (1/R₀)^I₀ del proceso de
+    ramificación; el ``tamano_final`` de cada réplica; la curva
+    ``determinista`` (S, I y R de la EDO, en personas); los ``eventos``
+    (Gillespie) o ``pasos`` (tau-leaping) por réplica, los ``procesos`` y los
+    ``segundos``. ``procesos`` funciona como en ``montecarlo.integrar``."""
+    if metodo not in METODOS:
+        raise ValueError(f"Método estocástico desconocido: {metodo}")
+    if tipo_beta not in sir.TIPOS_BETA:
+        raise ValueError(f"Tipo de β(t) desconocido: {tipo_beta}")
+    if N <= 0 or not 0 <= I0 <= N:
+        raise ValueError("Los infectados iniciales deben estar entre 0 y la población total.")
+    if gamma <= 0:
+        raise ValueError("La tasa de recuperación γ debe ser positiva.")
+    if dias <= 0:
+        raise ValueError("Los días de simulación deben ser positivos.")
+    if replicas < 1:
+        raise ValueError("Debe haber al menos una réplica.")
+    if puntos < 2:
+        raise ValueError("Se necesitan al menos 2 puntos de salida.")
+    if tau <= 0:
+        raise ValueError("El paso τ debe ser positivo.")
+    N, I0, replicas = int(N), int(I0), int(replicas)
+
+    malla = np.linspace(0, dias, puntos)
+    lotes = -(-replicas // LOTE_REPLICAS)
+    trabajo = replicas * (2 * N if metodo == "Gillespie" else dias / tau)
+    if trabajo < MIN_TRABAJO_PARALELO:
+        procesos = 1
+    procesos = min(paralelo.PROCESOS if procesos is None else max(int(procesos), 1), lotes)
+    funcion = _gillespie if metodo == "Gillespie" else _tau_leaping
+    tareas = [(N, I0, gamma, tipo_beta, beta, min(LOTE_REPLICAS, replicas - i * LOTE_REPLICAS), flujo, malla, tau)
+              for i, flujo in enumerate(paralelo.flujos(semilla, lotes))]
+
+    avance = Avance(progreso, lotes)
+    I, R = [], []
+    contador = 0
+    inicio = time.perf_counter()
+    with closing(paralelo.mapear(funcion, tareas, procesos, progreso)) as resultados:
+        for i, (I_lote, R_lote, cuenta) in enumerate(resultados):
+            avance(i)
+            I.append(I_lote)
+            R.append(R_lote)
+            contador += cuenta
+    avance.terminar()
+    segundos = time.perf_counter() - inicio
+
+    I = np.concatenate(I)
+    R = np.concatenate(R)
+    S = N - I - R
+    tamano_final = N - S[:, -1]
+    base = sir.BETA_BASE[tipo_beta] if beta is None else beta
+    R0 = base / gamma
+    resultado = {
+        "t": malla,
+        "metodo": metodo,
+        "replicas": replicas,
+        "percentiles": PERCENTILES,
+        "bandas": {nombre: np.percentile(X, PERCENTILES, axis=0) for nombre, X in (("S", S), ("I", I), ("R", R))},
+        "media": {nombre: X.mean(axis=0) for nombre, X in (("S", S), ("I", I), ("R", R))},
+        "extincion": (I == 0).mean(axis=0),
+        "prob_extincion": float(np.mean((I[:, -1] == 0) & (tamano_final < UMBRAL_BROTE * N))),
+        "extincion_teorica": 1.0 if R0 <= 1 else float(R0 ** -I0),
+        "tamano_final": tamano_final,
+        "determinista": _determinista(N, I0, gamma, tipo_beta, beta, malla),
+        "procesos": procesos,
+        "segundos": segundos,
+    }
+    if metodo == "Gillespie":
+        resultado["eventos"] = contador / replicas
+    else:
+        resultado["pasos"] = contador // lotes
+    return resultado
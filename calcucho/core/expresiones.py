@@ -0,0 +1,147 @@
+"""Caché compartida de expresiones compiladas.
+
+``compilar(texto, variables)`` devuelve una ``ExpresionCompilada`` con la
+expresión de sympy ya interpretada, la función de NumPy generada con
+``lambdify`` y, bajo demanda, sus derivadas. ``ConjuntoCompilado`` reúne
+varias expresiones (un gradiente, una hessiana) en una sola función. Las entradas se guardan en una
+caché LRU común a todos los módulos, indexada por el texto normalizado y la
+tupla de variables, de modo que volver a graficar o simular la misma función
+no repite ``sympify`` ni ``lambdify``.
+"""
+import re
+import threading
+from collections import OrderedDict
+
+# Número máximo de expresiones que se conservan
+CAPACIDAD = 128
+
+
+def normalizar(texto):
+    """Quita los espacios de los extremos, reduce los de adentro a uno y convierte ^ en **.
+
+    No se borran todos los espacios: "2 3*x" o "x 2" deben seguir siendo errores."""
+    return re.sub(r"\s+", " ", texto.strip()).replace("^", "**")
+
+
+class ExpresionCompilada:
+    def __init__(self, expr, variables):
+        from sympy import Symbol
+
+        self.expr = expr
+        self.variables = tuple(variables)
+        self.simbolos = tuple(Symbol(v) for v in self.variables)
+        self._funcion = None
+        self._derivadas = {}
+
+    @property
+    def funcion(self):
+        """Función de NumPy de las variables, en el orden de ``variables``."""
+        if self._funcion is None:
+            from sympy import lambdify
+            self._funcion = lambdify(self.simbolos, self.expr, "numpy")
+        return self._funcion
+
+    def __call__(self, *valores):
+        return self.funcion(*valores)
+
+    def derivada(self, variable, orden=1):
+        """Devuelve la derivada respecto a ``variable`` como otra ``ExpresionCompilada``."""
+        clave = (variable, orden)
+        derivada = self._derivadas.get(clave)
+        if derivada is None:
+            from sympy import Symbol, diff
+            derivada = ExpresionCompilada(diff(self.expr, Symbol(variable), orden), self.variables)
+            self._derivadas[clave] = derivada
+        return derivada
+
+
+class ConjuntoCompilado:
+    """Varias expresiones de las mismas variables en una sola función de NumPy.
+
+    ``lambdify(..., cse=True)`` extrae las subexpresiones comunes, de modo que
+    un gradiente o una hessiana se evalúan sobre toda la malla de una vez y sin
+    repetir las partes que comparten sus componentes. ``componentes`` puede ser
+    una lista o una lista de listas; el resultado tiene esa forma seguida de la
+    forma de los valores."""
+
+    def __init__(self, componentes, variables):
+        import numpy as np
+        from sympy import Symbol, lambdify
+
+        arreglo = np.array(componentes, dtype=object)
+        self.forma = arreglo.shape
+        self.componentes = list(arreglo.ravel())
+        self.variables = tuple(str(v) for v in variables)
+        simbolos = tuple(Symbol(v) for v in self.variables)
+        self.funcion = lambdify(simbolos, self.componentes, "numpy", cse=True)
+
+    def __call__(self, *valores):
+        import numpy as np
+
+        with np.errstate(all="ignore"):
+            resultados = self.funcion(*valores)
+        # Las componentes constantes vuelven como escalares
+        resultados = np.broadcast_arrays(*[np.asarray(r, dtype=float) for r in resultados])
+        return np.stack(resultados).reshape(self.forma + resultados[0].shape)
+
+
+class CacheExpresiones:
+    def __init__(self, capacidad=CAPACIDAD):
+        self.capacidad = capacidad
+        self.entradas = OrderedDict()
+        self.aciertos = 0
+        self.fallos = 0
+        self._cerrojo = threading.Lock()
+
+    def obtener(self, texto, variables=("x",)):
+        from sympy import sympify
+
+        clave = (normalizar(texto), tuple(variables))
+        with self._cerrojo:
+            compilada = self.entradas.get(clave)
+            if compilada is not None:
+                self.entradas.move_to_end(clave)
+                self.aciertos += 1
+                return compilada
+            self.fallos += 1
+
+        # Los errores de sympify se propagan y la entrada no se guarda
+        compilada = ExpresionCompilada(sympify(clave[0]), clave[1])
+        with self._cerrojo:
+            self.entradas[clave] = compilada
+            self.entradas.move_to_end(clave)
+            while len(self.entradas) > self.capacidad:
+                self.entradas.popitem(last=False)
+        return compilada
+
+    def estadisticas(self):
+        with self._cerrojo:
+            return {
+                "aciertos": self.aciertos,
+                "fallos": self.fallos,
+                "entradas": len(self.entradas),
+                "capacidad": self.capacidad,
+            }
+
+    def limpiar(self):
+        with self._cerrojo:
+            self.entradas.clear()
+            self.aciertos = 0
+            self.fallos = 0
+
+
+_cache = CacheExpresiones()
+
+
+def compilar(texto, variables=("x",)):
+    """Devuelve la ``ExpresionCompilada`` de ``texto`` desde la caché compartida."""
+    return _cache.obtener(texto, variables)
+
+
+def estadisticas():
+    """Aciertos, fallos y tamaño de la caché compartida."""
+    return _cache.estadisticas()
+
+
+def limpiar():
+    _cache.limpiar()
@@ -0,0 +1,24 @@
+"""Evaluación de funciones de una y dos variables sobre mallas regulares."""
+import numpy as np
+
+from calcucho.core import expresiones
+
+
+def evaluar_2d(expr_str, xmin, xmax, puntos=400):
+    """Devuelve (x_vals, y_vals) para f(x) en [xmin, xmax]."""
+    if xmin >= xmax:
+        raise ValueError("x mínimo debe ser menor que x máximo.")
+    f = expresiones.compilar(expr_str, ("x",))
+    x_vals = np.linspace(xmin, xmax, puntos)
+    return x_vals, np.broadcast_to(f(x_vals), x_vals.shape)
+
+
+def evaluar_3d(expr_str, xmin, xmax, ymin, ymax, puntos=100):
+    """Devuelve (X, Y, Z) para f(x, y) sobre la malla [xmin, xmax] × [ymin, ymax]."""
+    if xmin >= xmax:
+        raise ValueError("x mínimo debe ser menor que x máximo.")
+    if ymin >= ymax:
+        raise ValueError("y mínimo debe ser menor que y máximo.")
+    f = expresiones.compilar(expr_str, ("x", "y"))
+    X, Y = np.meshgrid(np.linspace(xmin, xmax, puntos), np.linspace(ymin, ymax, puntos))
+    return X, Y, np.broadcast_to(f(X, Y), X.shape)
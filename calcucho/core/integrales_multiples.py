@@ -0,0 +1,204 @@
+"""Integrales múltiples por Monte Carlo sobre cajas y regiones implícitas.
+
+Estima ∫ f dV sobre una caja [a₁, b₁] × … × [a_d, b_d] o sobre la parte de la
+caja que cumple una o varias desigualdades (``x**2 + y**2 < 1``). Los puntos
+se sortean uniformemente en la caja por lotes y la función se evalúa con una
+sola llamada por lote; fuera de la región vale 0. El error estándar no depende
+de la dimensión, que es donde Monte Carlo supera a la cuadratura.
+
+Como en ``montecarlo``, cada lote usa su propio flujo aleatorio derivado de la
+semilla y los lotes se pueden repartir entre procesos sin cambiar el resultado.
+"""
+from contextlib import closing
+
+import numpy as np
+
+from calcucho.core import expresiones, paralelo, simbolico
+from calcucho.core.montecarlo import LOTE, MIN_LOTES, MIN_PUNTOS_OBJETIVO, MIN_PUNTOS_PARALELO, Z_95
+from calcucho.core.progreso import Avance
+
+VARIABLES = ("x", "y", "z")
+# Puntos que se devuelven para graficar
+MAX_PUNTOS_GRAFICA = 5_000
+
+
+def _condiciones(region_texto, variables):
+    """Separa la región en desigualdades (separadas por ';') y comprueba que lo sean."""
+    from sympy.logic.boolalg import Boolean
+
+    if not region_texto or not region_texto.strip():
+        return ()
+    textos = tuple(t.strip() for t in region_texto.split(";") if t.strip())
+    for texto in textos:
+        try:
+            expr = expresiones.compilar(texto, variables).expr
+        except Exception:
+            raise ValueError(f"No se pudo interpretar la condición «{texto}».")
+        if not isinstance(expr, Boolean):
+            raise ValueError(f"La condición «{texto}» debe ser una desigualdad, p. ej. x**2 + y**2 < 1.")
+        libres = {str(s) for s in expr.free_symbols} - set(variables)
+        if libres:
+            raise ValueError(f"La condición «{texto}» usa variables desconocidas: {', '.join(sorted(libres))}.")
+    return textos
+
+
+def _lote(f_texto, condiciones, variables, inferiores, superiores, m, semilla, k):
+    """Evalúa f·1_región en ``m`` puntos de la caja.
+
+    Devuelve (m, media, suma de cuadrados de las desviaciones, puntos en la
+    región) y los primeros ``k`` puntos con su máscara, para graficar."""
+    rng = np.random.default_rng(semilla)
+    puntos = rng.uniform(inferiores, superiores, (m, len(variables)))
+    columnas = tuple(puntos.T)
+    with np.errstate(all="ignore"):
+        dentro = np.ones(m, dtype=bool)
+        for texto in condiciones:
+            dentro &= np.broadcast_to(expresiones.compilar(texto, variables).funcion(*columnas), (m,))
+        valores = np.broadcast_to(np.asarray(expresiones.compilar(f_texto, variables).funcion(*columnas),
+                                             dtype=float), (m,))
+        valores = np.where(dentro, valores, 0.0)
+    if not np.all(np.isfinite(valores)):
+        raise ValueError("La función no es finita (o no es real) en algún punto de la región.")
+    media = valores.mean()
+    return m, media, float(((valores - media) ** 2).sum()), int(np.count_nonzero(dentro)), puntos[:k], dentro[:k]
+
+
+def _integral_caja(expr, simbolos, limites):
+    from sympy import integrate
+
+    return float(integrate(expr, *[(s, a, b) for s, (a, b) in zip(simbolos, limites)]))
+
+
+def estimacion(n, media, m2, volumen):
+    """Integral estimada, error estándar e intervalo del 95 % a partir de los momentos de f·1_región."""
+    varianza = m2 / (n - 1) if n > 1 else 0.0
+    valor = volumen * media
+    error_estandar = volumen * np.sqrt(varianza / n)
+    return {
+        "n": n,
+        "valor": float(valor),
+        "error_estandar": float(error_estandar),
+        "ic95": (float(valor - Z_95 * error_estandar), float(valor + Z_95 * error_estandar)),
+    }
+
+
+def integrar(f_texto, limites, n, region_texto=None, variables=None, semilla=None, error_objetivo=None,
+             progreso=None, parcial=None, procesos=None, max_puntos=MAX_PUNTOS_GRAFICA):
+    """Estima la integral de f sobre la caja ``limites`` = [(a₁, b₁), …] (restringida a
+    ``region_texto``, con las desigualdades separadas por ';').
+
+    ``variables`` son los nombres de las coordenadas (por omisión x, y, z, según
+    la dimensión). ``n``, ``error_objetivo``, ``parcial`` y ``procesos`` funcionan
+    como en ``montecarlo.integrar``.
+
+    Devuelve ``valor``, ``error_estandar``, ``ic95``, ``n``, ``objetivo_alcanzado``,
+    el volumen de la caja y el de la región (``volumen_region`` y su
+    ``error_volumen``), ``exacta`` (sólo sobre cajas, si sympy la calcula a
+    tiempo; si no, None) con ``error`` porcentual, el ``historial`` y una
+    muestra de ``puntos`` (filas de coordenadas) con la máscara ``puntos_dentro``."""
+    limites = [(float(a), float(b)) for a, b in limites]
+    d = len(limites)
+    if variables is None:
+        if d > len(VARIABLES):
+            raise ValueError("Indica los nombres de las variables para más de tres dimensiones.")
+        variables = VARIABLES[:d]
+    variables = tuple(variables)
+    if d < 1 or len(variables) != d:
+        raise ValueError("Debe haber un par de límites por cada variable.")
+    if len(set(variables)) != d:
+        raise ValueError("Las variables no pueden repetirse.")
+    if n < 2:
+        raise ValueError("El número de puntos debe ser al menos 2.")
+    for variable, (a, b) in zip(variables, limites):
+        if not (np.isfinite(a) and np.isfinite(b)):
+            raise ValueError(f"Los límites de {variable} deben ser finitos.")
+        if a >= b:
+            raise ValueError(f"El límite inferior de {variable} debe ser menor que el superior.")
+    if error_objetivo is not None and error_objetivo <= 0:
+        raise ValueError("El error relativo objetivo debe ser positivo.")
+
+    try:
+        compilada = expresiones.compilar(f_texto, variables)
+    except Exception:
+        raise ValueError(f"No se pudo interpretar la función «{f_texto}».")
+    libres = {str(s) for s in compilada.expr.free_symbols} - set(variables)
+    if libres:
+        raise ValueError(f"La función usa variables desconocidas: {', '.join(sorted(libres))}.")
+    condiciones = _condiciones(region_texto, variables)
+
+    inferiores = np.array([a for a, _ in limites])
+    superiores = np.array([b for _, b in limites])
+    volumen = float(np.prod(superiores - inferiores))
+
+    lote = min(LOTE, max(n // MIN_LOTES, 1_000))
+    lotes = -(-n // lote)
+    if n < MIN_PUNTOS_PARALELO:
+        procesos = 1
+    procesos = min(paralelo.PROCESOS if procesos is None else max(int(procesos), 1), lotes)
+    tareas = []
+    for i, flujo in enumerate(paralelo.flujos(semilla, lotes)):
+        m = min(lote, n - i * lote)
+        k = min(m, max(max_puntos - i * lote, 0))
+        tareas.append((f_texto, condiciones, variables, inferiores, superiores, m, flujo, k))
+
+    avance = Avance(progreso, lotes)
+    usados, media, m2, en_region = 0, 0.0, 0.0, 0
+    historial = {"n": [], "valor": [], "error_estandar": []}
+    estado = None
+    objetivo_alcanzado = False
+    muestra, muestra_dentro = [], []
+    with closing(paralelo.mapear(_lote, tareas, procesos, progreso)) as resultados:
+        for i, (m, media_lote, m2_lote, dentro, puntos, puntos_dentro) in enumerate(resultados):
+            avance(i)
+            # Combinación de momentos por lotes (Chan et al.)
+            total = usados + m
+            delta = media_lote - media
+            media += delta * m / total
+            m2 += m2_lote + delta ** 2 * usados * m / total
+            usados = total
+            en_region += dentro
+            if len(puntos):
+                muestra.append(puntos)
+                muestra_dentro.append(puntos_dentro)
+
+            estado = estimacion(usados, media, m2, volumen)
+            for clave in historial:
+                historial[clave].append(estado[clave])
+            if parcial is not None:
+                parcial(estado)
+            if (error_objetivo is not None and usados >= MIN_PUNTOS_OBJETIVO and estado["valor"] != 0
+                    and estado["error_estandar"] <= error_objetivo * abs(estado["valor"])):
+                objetivo_alcanzado = True
+                break
+    avance.terminar()
+
+    exacta = None
+    if not condiciones:
+        try:
+            exacta = simbolico.ejecutar(_integral_caja, compilada.expr, compilada.simbolos, limites,
+                                        progreso=progreso, descripcion="La integral exacta")
+        except (ValueError, TypeError, AttributeError, NotImplementedError):
+            # Tiempo agotado (TiempoAgotado es un ValueError) o sympy no supo integrarla
+            exacta = None
+        if exacta is not None and not np.isfinite(exacta):
+            exacta = None
+    error = abs((estado["valor"] - exacta) / exacta) * 100 if exacta else None
+
+    fraccion = en_region / usados
+    return {
+        **estado,
+        "variables": variables,
+        "limites": limites,
+        "exacta": exacta,
+        "error": error,
+        "objetivo_alcanzado": objetivo_alcanzado,
+        "n_maximo": n,
+        "procesos": procesos,
+        "dentro": en_region,
+        "volumen_caja": volumen,
+        "volumen_region": volumen * fraccion,
+        "error_volumen": volumen * float(np.sqrt(fraccion * (1 - fraccion) / usados)),
+        "historial": {clave: np.array(valores) for clave, valores in historial.items()},
+        "puntos": np.concatenate(muestra) if muestra else np.empty((0, d)),
+        "puntos_dentro": np.concatenate(muestra_dentro) if muestra_dentro else np.empty(0, dtype=bool),
+    }
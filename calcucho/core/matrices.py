@@ -0,0 +1,120 @@
+import re
+
+
+# --- Lógica de operaciones con matrices usando sympy ---
+class MatrizMayor:
+    @staticmethod
+    def sumar(A, B): return A + B
+    @staticmethod
+    def restar(A, B): return A - B
+    @staticmethod
+    def multiplicar(A, B): return A * B
+    @staticmethod
+    def determinante(A): return A.det()
+    @staticmethod
+    def inversa(A): return A.inv()
+    @staticmethod
+    def resolver_sistema(A, b): return A.LUsolve(b)
+
+
+def normalizar_celda(texto):
+    """Completa decimales (".9" -> "0.9", "6." -> "6.0") e inserta el * implícito (2a -> 2*a)."""
+    texto = texto.strip() or "0"
+    if re.match(r"^\.\d+$", texto):
+        texto = "0" + texto
+    elif re.match(r"^\d+\.$", texto):
+        texto = texto + "0"
+    return re.sub(r'(?<=[0-9])(?=[a-zA-Z])', '*', texto)
+
+
+def leer_matriz(filas):
+    """Convierte una lista de filas de textos en una Matrix de sympy (celdas vacías = 0)."""
+    from sympy import sympify, Matrix
+
+    matriz = []
+    for fila in filas:
+        valores = []
+        for celda in fila:
+            texto = normalizar_celda(celda or "")
+            try:
+                valor = sympify(texto)
+            except Exception as e:
+                raise ValueError(f"Error al interpretar '{texto}': {e}")
+            valores.append(valor)
+        matriz.append(valores)
+    return Matrix(matriz)
+
+
+def texto_a_filas(texto):
+    """Lee el formato de línea de comandos "1,2;3,4" (filas con ';', columnas con ',')."""
+    return [fila.split(",") for fila in texto.strip().split(";")]
+
+
+# --- Operaciones con validación de dimensiones ---
+def suma(A, B):
+    if A.shape != B.shape:
+        raise ValueError("Las matrices A y B deben tener el mismo tamaño.")
+    return MatrizMayor.sumar(A, B)
+
+
+def resta(A, B):
+    if A.shape != B.shape:
+        raise ValueError("Las matrices A y B deben tener el mismo tamaño.")
+    return MatrizMayor.restar(A, B)
+
+
+def multiplicacion(A, B):
+    if A.shape[1] != B.shape[0]:
+        raise ValueError("Las columnas de A deben coincidir con las filas de B para multiplicar.")
+    return MatrizMayor.multiplicar(A, B)
+
+
+def determinante(A):
+    if A.shape[0] != A.shape[1]:
+        raise ValueError("La matriz debe ser cuadrada para calcular el determinante.")
+    return MatrizMayor.determinante(A)
+
+
+def inversa(A):
+    if A.shape[0] != A.shape[1]:
+        raise ValueError("La matriz debe ser cuadrada para calcular la inversa.")
+    if A.det() == 0:
+        raise ValueError("La matriz no tiene inversa porque su determinante es 0 (matriz singular).")
+    return MatrizMayor.inversa(A)
+
+
+def sistema(A, b):
+    if A.shape[0] != A.shape[1]:
+        raise ValueError("La matriz A debe ser cuadrada.")
+    if A.shape[0] != b.shape[0] or b.shape[1] != 1:
+        raise ValueError("Las dimensiones de A y b no coinciden.")
+    return MatrizMayor.resolver_sistema(A, b)
+
+
+# operación -> (función, operandos que necesita)
+OPERACIONES = {
+    "suma": (suma, ("A", "B")),
+    "resta": (resta, ("A", "B")),
+    "multiplicacion": (multiplicacion, ("A", "B")),
+    "determinante": (determinante, ("A",)),
+    "inversa": (inversa, ("A",)),
+    "sistema": (sistema, ("A", "b")),
+}
+
+
+def operar(operacion, **matrices):
+    if operacion not in OPERACIONES:
+        raise ValueError("Operación no válida.")
+    funcion, operandos = OPERACIONES[operacion]
+    faltantes = [nombre for nombre in operandos if matrices.get(nombre) is None]
+    if faltantes:
+        raise ValueError(f"Faltan las matrices: {', '.join(faltantes)}.")
+    return funcion(*(matrices[nombre] for nombre in operandos))
+
+
+def valor_numerico(val):
+    """Evalúa un valor sin símbolos libres como int o float; lo deja igual si es simbólico."""
+    if hasattr(val, 'free_symbols') and len(val.free_symbols) == 0:
+        val = val.evalf()
+        val = int(val) if val == int(val) else float(val)
+    return val
@@ -0,0 +1,220 @@
+"""Caché persistente de derivadas e integrales simbólicas.
+
+Los resultados de ``diff`` e ``integrate`` se guardan en una base sqlite
+indexada por la operación, la variable y el ``srepr`` de la expresión, junto
+con su código LaTeX. Así, derivar otra vez una función ya vista (en esta sesión
+o en otra) no vuelve a llamar a sympy. Cuando el texto guardado supera
+``MAX_BYTES`` se descartan las entradas usadas hace más tiempo.
+
+La base está en la carpeta de caché del usuario; la variable de entorno
+``CALCUCHO_MEMO`` indica otra ruta y, vacía, desactiva la caché. Si la base no
+se puede abrir, los cálculos siguen funcionando sin caché.
+"""
+import hashlib
+import os
+import sqlite3
+import threading
+import time
+
+# Tamaño máximo del texto guardado (resultados y LaTeX), en bytes
+MAX_BYTES = 16 * 1024 * 1024
+
+OPERACIONES = ("derivar", "integrar")
+
+
+def ruta_predeterminada():
+    ruta = os.environ.get("CALCUCHO_MEMO")
+    if ruta is not None:
+        return ruta or None
+    base = (os.environ.get("LOCALAPPDATA") or os.environ.get("XDG_CACHE_HOME")
+            or os.path.join(os.path.expanduser("~"), ".cache"))
+    return os.path.join(base, "cal-cucho", "simbolico.sqlite")
+
+
+class MemoSimbolico:
+    def __init__(self, ruta, max_bytes=MAX_BYTES):
+        self.ruta = ruta
+        self.max_bytes = max_bytes
+        self.aciertos = 0
+        self.fallos = 0
+        self._conexion = None
+        self._cerrojo = threading.Lock()
+
+    def _conectar(self):
+        """Abre la base la primera vez; devuelve None si no hay caché."""
+        if self._conexion is None and self.ruta:
+            try:
+                carpeta = os.path.dirname(self.ruta)
+                if carpeta:
+                    os.makedirs(carpeta, exist_ok=True)
+                conexion = sqlite3.connect(self.ruta, timeout=5, check_same_thread=False)
+                conexion.execute(
+                    "CREATE TABLE IF NOT EXISTS resultados ("
+                    " clave TEXT PRIMARY KEY, operacion TEXT, resultado TEXT,"
+                    " latex TEXT, bytes INTEGER, usado REAL)"
+                )
+                conexion.execute("CREATE INDEX IF NOT EXISTS resultados_usado ON resultados (usado)")
+                conexion.commit()
+                self._conexion = conexion
+            except (OSError, sqlite3.Error):
+                self.ruta = None
+        return self._conexion
+
+    @staticmethod
+    def clave(operacion, expr, variable):
+        from sympy import srepr
+
+        texto = f"{operacion}|{srepr(variable)}|{srepr(expr)}"
+        return hashlib.sha256(texto.encode("utf-8")).hexdigest()
+
+    def obtener(self, operacion, expr, variable):
+        """Devuelve (resultado, latex) si está guardado, o None."""
+        from sympy import sympify
+
+        clave = self.clave(operacion, expr, variable)
+        with self._cerrojo:
+            conexion = self._conectar()
+            if conexion is None:
+                return None
+            try:
+                fila = conexion.execute(
+                    "SELECT resultado, latex FROM resultados WHERE clave = ?", (clave,)
+                ).fetchone()
+                if fila is not None:
+                    conexion.execute("UPDATE resultados SET usado = ? WHERE clave = ?", (time.time(), clave))
+                    conexion.commit()
+            except sqlite3.Error:
+                return None
+            if fila is None:
+                self.fallos += 1
+                return None
+            self.aciertos += 1
+        return sympify(fila[0]), fila[1]
+
+    def guardar(self, operacion, expr, variable, resultado, latex):
+        from sympy import srepr
+
+        clave = self.clave(operacion, expr, variable)
+        texto = srepr(resultado)
+        with self._cerrojo:
+            conexion = self._conectar()
+            if conexion is None:
+                return
+            try:
+                conexion.execute(
+                    "INSERT OR REPLACE INTO resultados VALUES (?, ?, ?, ?, ?, ?)",
+                    (clave, operacion, texto, latex, len(texto) + len(latex), time.time()),
+                )
+                self._recortar(conexion)
+                conexion.commit()
+            except sqlite3.Error:
+                conexion.rollback()
+
+    def _recortar(self, conexion):
+        """Borra las entradas menos usadas hasta quedar dentro de ``max_bytes``."""
+        total = conexion.execute("SELECT COALESCE(SUM(bytes), 0) FROM resultados").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        borrar = []
+        for clave, tamano in conexion.execute("SELECT clave, bytes FROM resultados ORDER BY usado"):
+            if total <= self.max_bytes:
+                break
+            borrar.append((clave,))
+            total -= tamano
+        conexion.executemany("DELETE FROM resultados WHERE clave = ?", borrar)
+
+    def memorizar(self, operacion, expr, variable, calcular):
+        """Devuelve el resultado guardado o llama a ``calcular()`` -> (resultado, latex) y lo guarda."""
+        guardado = self.obtener(operacion, expr, variable)
+        if guardado is not None:
+            return guardado
+        resultado, latex = calcular()
+        self.guardar(operacion, expr, variable, resultado, latex)
+        return resultado, latex
+
+    def estadisticas(self):
+        with self._cerrojo:
+            entradas, total = 0, 0
+            conexion = self._conectar()
+            if conexion is not None:
+                try:
+                    entradas, total = conexion.execute(
+                        "SELECT COUNT(*), COALESCE(SUM(bytes), 0) FROM resultados"
+                    ).fetchone()
+                except sqlite3.Error:
+                    pass
+            return {
+                "ruta": self.ruta,
+                "aciertos": self.aciertos,
+                "fallos": self.fallos,
+                "entradas": entradas,
+                "bytes": total,
+                "max_bytes": self.max_bytes,
+            }
+
+    def limpiar(self):
+        with self._cerrojo:
+            conexion = self._conectar()
+            if conexion is not None:
+                conexion.execute("DELETE FROM resultados")
+                conexion.commit()
+            self.aciertos = 0
+            self.fallos = 0
+
+    def cerrar(self):
+        with self._cerrojo:
+            if self._conexion is not None:
+                self._conexion.close()
+                self._conexion = None
+
+
+_memo = MemoSimbolico(ruta_predeterminada())
+
+
+def configurar(ruta, max_bytes=MAX_BYTES):
+    """Cambia la base de la caché; ``ruta=None`` la desactiva."""
+    global _memo
+    _memo.cerrar()
+    _memo = MemoSimbolico(ruta, max_bytes)
+
+
+def memorizar(operacion, expr, variable, calcular):
+    return _memo.memorizar(operacion, expr, variable, calcular)
+
+
+def estadisticas():
+    return _memo.estadisticas()
+
+
+def limpiar():
+    _memo.limpiar()
+
+
+def precalentar(textos, variable="x", operaciones=OPERACIONES, tiempo=None, progreso=None):
+    """Deriva y/o integra cada función de ``textos`` para dejarla en la caché.
+
+    Devuelve cuántas se calcularon, cuántas ya estaban y cuáles fallaron
+    (por ejemplo, por superar el tiempo límite), sin detenerse en los errores."""
+    from calcucho.core import calculo
+    from calcucho.core.progreso import Avance
+
+    textos = [t.strip() for t in textos if t.strip() and not t.strip().startswith("#")]
+    informe = {"calculadas": 0, "en_cache": 0, "fallidas": []}
+    avance = Avance(progreso, len(textos) * len(operaciones))
+    paso = 0
+    for texto in textos:
+        for operacion in operaciones:
+            avance(paso)
+            paso += 1
+            aciertos = _memo.aciertos
+            try:
+                calculo.operar(operacion, texto, variable, tiempo=tiempo)
+            except ValueError as e:
+                informe["fallidas"].append({"funcion": texto, "operacion": operacion, "error": str(e)})
+                continue
+            if _memo.aciertos > aciertos:
+                informe["en_cache"] += 1
+            else:
+                informe["calculadas"] += 1
+    avance.terminar()
+    return informe
@@ -0,0 +1,414 @@
+"""Integración Monte Carlo por acierto y rechazo (hit-or-miss).
+
+Los puntos no se sortean en un solo rectángulo sino bajo una envolvente
+escalonada: el intervalo se divide en celdas, cada una con sus propias cotas,
+y las celdas se refinan donde la función tiene picos. Así se desperdician
+menos puntos y los picos estrechos no quedan recortados.
+
+Los puntos se procesan por lotes de tamaño fijo, con memoria constante: tras
+cada lote se actualizan la estimación, su error estándar y el intervalo de
+confianza del 95 %, que se pueden publicar para mostrarlos en vivo y quedan
+en el historial de convergencia. Con un error relativo objetivo, el muestreo
+se detiene en cuanto se alcanza.
+
+Cada lote tiene su propio generador, derivado de la semilla con
+``SeedSequence.spawn``, y los lotes se pueden repartir entre varios procesos
+(``paralelo``). Los lotes se reducen en orden y sólo se suman conteos enteros,
+así que con la misma semilla el resultado es idéntico con uno o con todos los
+núcleos.
+"""
+from contextlib import closing
+
+import numpy as np
+
+from calcucho.core import expresiones, paralelo, simbolico
+from calcucho.core.progreso import Avance
+
+# Puntos que se sortean y evalúan de una vez (como mucho)
+LOTE = 250_000
+# Lotes que se buscan como mínimo, para que el historial de convergencia tenga forma
+MIN_LOTES = 100
+# Puntos mínimos antes de dar por alcanzado el error relativo objetivo
+MIN_PUNTOS_OBJETIVO = 10_000
+# Cuantil normal del intervalo de confianza del 95 %
+Z_95 = 1.959963984540054
+# Por debajo de estos puntos no compensa arrancar otros procesos
+MIN_PUNTOS_PARALELO = 2_000_000
+# Puntos que se devuelven para graficar (dibujar millones de puntos no aporta y es lento)
+MAX_PUNTOS_GRAFICA = 20_000
+# Envolvente escalonada: celdas al empezar y como máximo, y muestras por celda para acotarla
+CELDAS_INICIALES = 32
+MAX_CELDAS = 512
+MUESTRAS_CELDA = 17
+# Se deja de partir celdas cuando el área desperdiciada es menos de esta fracción de la envolvente
+DESPERDICIO_ACEPTABLE = 0.01
+# Si un punto supera la envolvente, la celda se amplía (al menos esta fracción de su altura) y se reinicia
+AMPLIACION = 0.1
+MAX_REINICIOS = 10
+# Celdas (ancho, alto) del mapa de densidad de aciertos y fallos
+MALLA_DENSIDAD = (200, 150)
+
+
+def _integral_definida(expr, a, b):
+    from sympy import symbols, integrate
+
+    return float(integrate(expr, (symbols('x'), a, b)))
+
+
+def area_exacta(expr, a, b, f, progreso=None):
+    """Integral de ``expr`` en [a, b] con sympy; si tarda demasiado o no tiene forma
+    cerrada, se calcula numéricamente con ``f``. Devuelve (área, es_numerica)."""
+    from scipy.integrate import quad
+
+    try:
+        return simbolico.ejecutar(_integral_definida, expr, a, b, progreso=progreso,
+                                  descripcion="La integral exacta"), False
+    except (ValueError, TypeError, AttributeError, NotImplementedError):
+        # Tiempo agotado (TiempoAgotado es un ValueError) o sympy no supo integrarla
+        return quad(lambda t: float(f(t)), a, b, limit=200)[0], True
+
+
+def estimacion(dentro, n, area_total):
+    """Área estimada, error estándar e intervalo de confianza del 95 % tras ``n`` puntos.
+
+    Cada punto es una Bernoulli con p = área / área del rectángulo, así que
+    el error estándar del área es área_total·√(p(1 − p)/n)."""
+    p = dentro / n
+    area = area_total * p
+    error_estandar = abs(area_total) * np.sqrt(p * (1 - p) / n)
+    return {
+        "n": n,
+        "dentro": dentro,
+        "area": float(area),
+        "error_estandar": float(error_estandar),
+        "ic95": (float(area - Z_95 * error_estandar), float(area + Z_95 * error_estandar)),
+    }
+
+
+def _derivada(compilada):
+    """f' como función de NumPy, o None si no se puede generar (p. ej. la de ``floor``)."""
+    try:
+        return compilada.derivada("x").funcion
+    except Exception:
+        return None
+
+
+def _pendiente(derivada, x):
+    # Sin derivada evaluable (DiracDelta de un escalón) no hay margen;
+    # si la envolvente se queda corta, el muestreo la corrige
+    if derivada is None:
+        return np.zeros(x.shape)
+    try:
+        return np.abs(np.broadcast_to(derivada(x), x.shape)).astype(float)
+    except Exception:
+        return np.zeros(x.shape)
+
+
+def _cotas(funciones, derivadas, izquierdas, anchos, entre_curvas):
+    """Cota inferior y superior de la región en cada celda, y la altura media que ocupa.
+
+    Cada celda se evalúa en ``MUESTRAS_CELDA`` puntos; entre dos muestras
+    separadas h, una función con |f'| ≤ L no se aleja más de L·h/2 de ellas, así
+    que las cotas se amplían con ese margen. L se estima en las mismas muestras
+    con f' y con los cocientes de diferencias (que también cubren los saltos)."""
+    t = np.linspace(0, 1, MUESTRAS_CELDA)
+    x = izquierdas[:, None] + anchos[:, None] * t
+    h = anchos / (MUESTRAS_CELDA - 1)
+    with np.errstate(all="ignore"):
+        valores = np.stack([np.broadcast_to(f(x), x.shape) for f in funciones]).astype(float)
+        pendientes = np.stack([_pendiente(d, x) for d in derivadas])
+    if not np.all(np.isfinite(valores)):
+        raise ValueError("La función no es finita (o no es real) en algún punto del intervalo.")
+    # Una pendiente infinita aislada (sqrt(x) en 0) no impide acotar la función
+    pendientes = np.where(np.isfinite(pendientes), pendientes, 0.0).max(axis=(0, 2))
+    diferencias = (np.abs(np.diff(valores, axis=2)).max(axis=(0, 2)) / h)
+    margen = np.maximum(pendientes, diferencias) * h / 2
+    if entre_curvas:
+        inferior = valores.min(axis=(0, 2)) - margen
+        superior = valores.max(axis=(0, 2)) + margen
+        ocupado = (valores.max(axis=0) - valores.min(axis=0)).mean(axis=1)
+    else:
+        inferior = np.zeros(len(anchos))
+        superior = np.maximum(valores[0].max(axis=1) + margen, 0.0)
+        ocupado = np.clip(valores[0], 0, None).mean(axis=1)
+    return inferior, superior, ocupado
+
+
+def envolvente(funciones, derivadas, a, b, entre_curvas=False):
+    """Envolvente escalonada de la región bajo f (o entre f y g) en [a, b].
+
+    Empieza con ``CELDAS_INICIALES`` celdas iguales y, en cada ronda, parte por la
+    mitad las que más área desperdician (área de la celda menos la que ocupa la
+    región), hasta ``MAX_CELDAS`` o hasta que el desperdicio es menor que
+    ``DESPERDICIO_ACEPTABLE`` del área de la envolvente. Devuelve
+    (izquierdas, anchos, inferior, superior) ordenados por x."""
+    izquierdas = np.linspace(a, b, CELDAS_INICIALES + 1)[:-1]
+    anchos = np.full(CELDAS_INICIALES, (b - a) / CELDAS_INICIALES)
+    inferior, superior, ocupado = _cotas(funciones, derivadas, izquierdas, anchos, entre_curvas)
+    desperdicio = anchos * (superior - inferior - ocupado)
+    while len(anchos) < MAX_CELDAS:
+        total = desperdicio.sum()
+        partir = desperdicio > total / len(anchos)
+        if total <= DESPERDICIO_ACEPTABLE * np.sum(anchos * (superior - inferior)) or not partir.any():
+            break
+        # Las que más desperdician primero, sin pasar de MAX_CELDAS
+        indices = np.flatnonzero(partir)
+        indices = indices[np.argsort(-desperdicio[indices])][:MAX_CELDAS - len(anchos)]
+        mitades = anchos[indices] / 2
+        nuevas_izquierdas = np.concatenate([izquierdas[indices], izquierdas[indices] + mitades])
+        nuevos_anchos = np.concatenate([mitades, mitades])
+        cotas = _cotas(funciones, derivadas, nuevas_izquierdas, nuevos_anchos, entre_curvas)
+        nuevo_desperdicio = nuevos_anchos * (cotas[1] - cotas[0] - cotas[2])
+
+        conservar = np.ones(len(anchos), dtype=bool)
+        conservar[indices] = False
+        izquierdas = np.concatenate([izquierdas[conservar], nuevas_izquierdas])
+        anchos = np.concatenate([anchos[conservar], nuevos_anchos])
+        inferior = np.concatenate([inferior[conservar], cotas[0]])
+        superior = np.concatenate([superior[conservar], cotas[1]])
+        desperdicio = np.concatenate([desperdicio[conservar], nuevo_desperdicio])
+    orden = np.argsort(izquierdas)
+    return izquierdas[orden], anchos[orden], inferior[orden], superior[orden]
+
+
+class _EnvolventeSuperada(Exception):
+    """Algún punto sorteado mostró que la región se sale de la envolvente."""
+
+    def __init__(self, inferior, superior):
+        super().__init__()
+        self.inferior = inferior
+        self.superior = superior
+
+
+def _lote(fx_texto, gx_texto, celdas, m, semilla, k, malla=None, rectangulo=None):
+    """Sortea ``m`` puntos uniformes bajo la envolvente ``celdas`` y cuenta los que caen dentro.
+
+    Cada punto elige celda con probabilidad proporcional a su área, así que los
+    puntos son uniformes en la envolvente. Devuelve el conteo, los primeros
+    ``k`` puntos (x, y, dentro) para graficar, si se da ``malla`` = (ancho, alto)
+    los aciertos y fallos por celda de ``rectangulo`` (arreglos planos, fila por
+    fila desde abajo) y, si la región se sale de alguna celda, sus cotas
+    corregidas (si no, None). Se ejecuta en los procesos de ``paralelo``: recibe
+    los textos y no la función compilada, que no se puede serializar."""
+    izquierdas, anchos, inferior, superior, acumulada = celdas
+    rng = np.random.default_rng(semilla)
+    fx = expresiones.compilar(fx_texto, ("x",)).funcion
+    celda = np.searchsorted(acumulada, rng.random(m) * acumulada[-1], side="right")
+    celda = np.minimum(celda, len(anchos) - 1)
+    rx = izquierdas[celda] + anchos[celda] * rng.random(m)
+    ry = inferior[celda] + (superior[celda] - inferior[celda]) * rng.random(m)
+    with np.errstate(all="ignore"):
+        y1 = np.broadcast_to(fx(rx), rx.shape)
+        if gx_texto is not None:
+            y2 = np.broadcast_to(expresiones.compilar(gx_texto, ("x",)).funcion(rx), rx.shape)
+            y_lower, y_upper = np.minimum(y1, y2), np.maximum(y1, y2)
+        else:
+            y_lower, y_upper = np.zeros(m), y1
+        dentro = (y_lower <= ry) & (ry <= y_upper)
+        fuera = (y_upper > superior[celda]) | (y_lower < inferior[celda])
+
+    cotas = None
+    if fuera.any():
+        nuevo_inferior, nuevo_superior = inferior.copy(), superior.copy()
+        np.minimum.at(nuevo_inferior, celda[fuera], y_lower[fuera])
+        np.maximum.at(nuevo_superior, celda[fuera], y_upper[fuera])
+        cotas = (nuevo_inferior, nuevo_superior)
+
+    conteos = None
+    if malla is not None:
+        a, b, ymin, ymax = rectangulo
+        ancho, alto = malla
+        escala_y = alto / (ymax - ymin) if ymax > ymin else 0.0
+        ix = np.minimum(((rx - a) * (ancho / (b - a))).astype(np.intp), ancho - 1)
+        iy = np.clip(((ry - ymin) * escala_y).astype(np.intp), 0, alto - 1)
+        casilla = iy * ancho + ix
+        # uint32 basta para un lote y reduce lo que se copia entre procesos
+        conteos = (np.bincount(casilla[dentro], minlength=ancho * alto).astype(np.uint32),
+                   np.bincount(casilla[~dentro], minlength=ancho * alto).astype(np.uint32))
+    return int(np.count_nonzero(dentro)), rx[:k], ry[:k], dentro[:k], conteos, cotas
+
+
+def _muestrear(tareas, procesos, area_total, error_objetivo, progreso, parcial, densidad):
+    """Recorre los lotes en orden y acumula la estimación; lanza ``_EnvolventeSuperada``
+    en cuanto un lote encuentra la región fuera de la envolvente."""
+    avance = Avance(progreso, len(tareas))
+    usados = puntos_dentro = 0
+    historial = {"n": [], "area": [], "error_estandar": []}
+    estado = None
+    objetivo_alcanzado = False
+    muestra_x, muestra_y, muestra_dentro = [], [], []
+    aciertos = fallos = None
+    if densidad:
+        celdas = MALLA_DENSIDAD[0] * MALLA_DENSIDAD[1]
+        aciertos, fallos = np.zeros(celdas, dtype=np.int64), np.zeros(celdas, dtype=np.int64)
+    # closing(): si se cancela o se alcanza el objetivo, se descartan los lotes pendientes
+    with closing(paralelo.mapear(_lote, tareas, procesos, progreso)) as resultados:
+        for i, (dentro, rx, ry, en_region, conteos, cotas) in enumerate(resultados):
+            if cotas is not None:
+                raise _EnvolventeSuperada(*cotas)
+            avance(i)
+            puntos_dentro += dentro
+            usados += tareas[i][3]
+            if len(rx):
+                muestra_x.append(rx)
+                muestra_y.append(ry)
+                muestra_dentro.append(en_region)
+            if conteos is not None:
+                aciertos += conteos[0]
+                fallos += conteos[1]
+
+            estado = estimacion(puntos_dentro, usados, area_total)
+            for clave in historial:
+                historial[clave].append(estado[clave])
+            if parcial is not None:
+                parcial(estado)
+            if (error_objetivo is not None and usados >= MIN_PUNTOS_OBJETIVO and 0 < puntos_dentro < usados
+                    and estado["error_estandar"] <= error_objetivo * abs(estado["area"])):
+                objetivo_alcanzado = True
+                break
+    avance.terminar()
+
+    vacio = np.empty(0)
+    forma = MALLA_DENSIDAD[::-1]
+    return {
+        **estado,
+        "objetivo_alcanzado": objetivo_alcanzado,
+        "historial": {clave: np.array(valores) for clave, valores in historial.items()},
+        "puntos_x": np.concatenate(muestra_x) if muestra_x else vacio,
+        "puntos_y": np.concatenate(muestra_y) if muestra_y else vacio,
+        "puntos_dentro": np.concatenate(muestra_dentro) if muestra_dentro else vacio.astype(bool),
+        "densidad_dentro": aciertos.reshape(forma) if densidad else None,
+        "densidad_fuera": fallos.reshape(forma) if densidad else None,
+    }
+
+
+def integrar(fx_texto, a, b, n, gx_texto=None, semilla=None, progreso=None, max_puntos=MAX_PUNTOS_GRAFICA,
+             error_objetivo=None, parcial=None, procesos=None, densidad=False):
+    """Estima el área bajo f(x) en [a, b] o, si se da g(x), el área entre f y g.
+
+    Los puntos se sortean por lotes con NumPy bajo una envolvente escalonada
+    (``envolvente``) y cada lote se evalúa con una sola llamada a la función
+    compilada. Si algún punto revela que la región se sale de la envolvente, se
+    amplía la celda y se vuelve a empezar, de modo que el resultado sólo usa
+    envolventes que nunca se vieron superadas. ``n`` es el máximo de puntos; con
+    ``error_objetivo`` (error relativo, p. ej. 0.001) se detiene antes si el
+    error estándar relativo lo alcanza. Tras cada lote se llama a
+    ``parcial(estado)`` con el resultado de ``estimacion``.
+
+    Devuelve un diccionario con el área estimada (``area_mc``, ``error_estandar``,
+    ``ic95``) y exacta (``exacta_numerica`` indica si hubo que calcularla
+    numéricamente), el error porcentual, los puntos dentro y usados
+    (``n``, ``objetivo_alcanzado``), los ``procesos`` usados, el ``historial``
+    de convergencia, la ``envolvente`` (``bordes``, ``inferior``, ``superior``),
+    su área frente a la del rectángulo que la contiene (``area_envolvente``,
+    ``area_rectangulo``), los ``reinicios`` y, para graficar, los primeros
+    ``max_puntos`` puntos sorteados (``puntos_x``, ``puntos_y`` y la máscara
+    ``puntos_dentro``).
+
+    ``procesos`` es el número de procesos entre los que se reparten los lotes
+    (por omisión, todos los núcleos; con menos de ``MIN_PUNTOS_PARALELO``
+    puntos, uno). No cambia el resultado, sólo el tiempo.
+
+    Con ``densidad`` se cuentan además todos los puntos en una malla
+    ``MALLA_DENSIDAD`` sobre el rectángulo de muestreo (``rectangulo``):
+    ``densidad_dentro`` y ``densidad_fuera`` tienen forma (alto, ancho) y no
+    crecen con ``n``, y no se devuelve muestra de puntos."""
+    if n < 1:
+        raise ValueError("El número de puntos debe ser al menos 1.")
+    if a >= b:
+        raise ValueError("El límite inferior a debe ser menor que b.")
+    if error_objetivo is not None and error_objetivo <= 0:
+        raise ValueError("El error relativo objetivo debe ser positivo.")
+
+    compilada = expresiones.compilar(fx_texto, ("x",))
+    fx_expr, fx = compilada.expr, compilada.funcion
+    funciones, derivadas = [fx], [_derivada(compilada)]
+    x_vals = np.linspace(a, b, 300)
+    y_fx = np.broadcast_to(fx(x_vals), x_vals.shape)
+
+    entre_curvas = gx_texto is not None
+    y_gx = None
+    if entre_curvas:
+        compilada = expresiones.compilar(gx_texto, ("x",))
+        gx_expr, gx = compilada.expr, compilada.funcion
+        funciones.append(gx)
+        derivadas.append(_derivada(compilada))
+        y_gx = np.broadcast_to(gx(x_vals), x_vals.shape)
+
+    izquierdas, anchos, inferior, superior = envolvente(funciones, derivadas, a, b, entre_curvas)
+    if not np.any(superior > inferior):
+        raise ValueError("f(x) no toma valores positivos en los puntos evaluados de [a, b]: no hay área que estimar.")
+
+    lote = min(LOTE, max(n // MIN_LOTES, 1_000))
+    lotes = -(-n // lote)
+    if n < MIN_PUNTOS_PARALELO:
+        procesos = 1
+    procesos = min(paralelo.PROCESOS if procesos is None else max(int(procesos), 1), lotes)
+    malla = MALLA_DENSIDAD if densidad else None
+    if densidad:
+        max_puntos = 0
+    # El reparto en lotes y el flujo de cada uno dependen sólo de n y de la semilla
+    flujos = paralelo.flujos(semilla, lotes)
+
+    for reinicios in range(MAX_REINICIOS + 1):
+        areas = anchos * (superior - inferior)
+        celdas = (izquierdas, anchos, inferior, superior, np.cumsum(areas))
+        area_total = float(areas.sum())
+        rectangulo = (a, b, float(inferior.min()), float(superior.max()))
+        tareas = []
+        for i, flujo in enumerate(flujos):
+            m = min(lote, n - i * lote)
+            k = min(m, max(max_puntos - i * lote, 0))
+            tareas.append((fx_texto, gx_texto, celdas, m, flujo, k, malla, rectangulo))
+        try:
+            muestreo = _muestrear(tareas, procesos, area_total, error_objetivo, progreso, parcial, densidad)
+            break
+        except _EnvolventeSuperada as e:
+            # La celda se amplía al menos tanto como se excedió, para no quedarse corta otra vez por poco
+            holgura = AMPLIACION * (e.superior - e.inferior)
+            exceso_inferior, exceso_superior = inferior - e.inferior, e.superior - superior
+            inferior = np.where(exceso_inferior > 0, e.inferior - np.maximum(exceso_inferior, holgura), inferior)
+            superior = np.where(exceso_superior > 0, e.superior + np.maximum(exceso_superior, holgura), superior)
+    else:
+        raise ValueError("No se pudo acotar la región: la función cambia demasiado rápido en [a, b].")
+
+    area_mc = muestreo["area"]
+
+    if entre_curvas:
+        exacta, numerica = area_exacta(gx_expr - fx_expr, a, b, lambda t: gx(t) - fx(t), progreso)
+    else:
+        exacta, numerica = area_exacta(fx_expr, a, b, fx, progreso)
+
+    error = abs((area_mc - exacta) / exacta) * 100 if exacta else float("nan")
+
+    return {
+        "area_mc": area_mc,
+        "area_exacta": exacta,
+        "exacta_numerica": numerica,
+        "error": error,
+        "error_estandar": muestreo["error_estandar"],
+        "ic95": muestreo["ic95"],
+        "dentro": muestreo["dentro"],
+        "n": muestreo["n"],
+        "n_maximo": n,
+        "objetivo_alcanzado": muestreo["objetivo_alcanzado"],
+        "procesos": procesos,
+        "historial": muestreo["historial"],
+        "x_vals": x_vals,
+        "y_fx": y_fx,
+        "y_gx": y_gx,
+        "puntos_x": muestreo["puntos_x"],
+        "puntos_y": muestreo["puntos_y"],
+        "puntos_dentro": muestreo["puntos_dentro"],
+        "envolvente": {
+            "bordes": np.append(izquierdas, izquierdas[-1] + anchos[-1]),
+            "inferior": inferior,
+            "superior": superior,
+        },
+        "area_envolvente": area_total,
+        "area_rectangulo": (b - a) * (rectangulo[3] - rectangulo[2]),
+        "reinicios": reinicios,
+        "rectangulo": rectangulo,
+        "densidad_dentro": muestreo["densidad_dentro"],
+        "densidad_fuera": muestreo["densidad_fuera"],
+    }
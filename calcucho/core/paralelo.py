@@ -0,0 +1,104 @@
+"""Reparto de tareas independientes entre los núcleos de la CPU.
+
+``mapear(funcion, tareas, procesos)`` ejecuta ``funcion(*tarea)`` en un grupo
+de procesos compartido y entrega los resultados en el orden de las tareas, con
+sólo unas pocas tareas en vuelo por proceso: así quien consume puede publicar
+resultados parciales, detenerse antes (cancelación o error objetivo alcanzado)
+y las tareas que no se llegaron a empezar se descartan.
+
+Como en ``simbolico``, los procesos se crean con ``spawn`` (seguro con los
+hilos de Qt) y se reutilizan entre llamadas; la función debe ser de nivel de
+módulo y sus argumentos y resultados deben poder serializarse.
+
+``flujos(semilla, k)`` deriva ``k`` generadores estadísticamente independientes
+de una sola semilla con ``SeedSequence.spawn``. Si cada tarea usa el flujo que
+corresponde a su índice, el resultado no depende de cuántos procesos haya.
+"""
+import atexit
+import multiprocessing
+import os
+import threading
+from collections import deque
+
+# Núcleos disponibles (procesos que se usan por omisión)
+PROCESOS = os.cpu_count() or 1
+# Tareas en vuelo por proceso: suficientes para no dejar núcleos ociosos
+EN_VUELO_POR_PROCESO = 2
+
+_grupo = None
+_tamano = 0
+_cerrojo = threading.Lock()
+
+
+def flujos(semilla, k):
+    """``k`` ``SeedSequence`` independientes derivadas de ``semilla`` (None: entropía del sistema)."""
+    import numpy as np
+
+    return np.random.SeedSequence(semilla).spawn(k)
+
+
+def _obtener_grupo(procesos):
+    """Grupo compartido con ``procesos`` procesos; se recrea si cambia el tamaño."""
+    global _grupo, _tamano
+    from concurrent.futures import ProcessPoolExecutor
+
+    with _cerrojo:
+        if _grupo is None or _tamano != procesos:
+            if _grupo is not None:
+                _grupo.shutdown(wait=False, cancel_futures=True)
+            _grupo = ProcessPoolExecutor(procesos, mp_context=multiprocessing.get_context("spawn"))
+            _tamano = procesos
+        return _grupo
+
+
+@atexit.register
+def cerrar():
+    """Termina los procesos del grupo compartido."""
+    global _grupo, _tamano
+    with _cerrojo:
+        grupo, _grupo, _tamano = _grupo, None, 0
+    if grupo is not None:
+        grupo.shutdown(wait=True, cancel_futures=True)
+
+
+def mapear(funcion, tareas, procesos=None, progreso=None):
+    """Genera ``funcion(*tarea)`` para cada tarea de ``tareas``, en orden.
+
+    Con ``procesos`` igual a 1 (o una sola tarea) se ejecuta en este mismo
+    proceso. Mientras espera un resultado llama a ``progreso(None)``, de modo
+    que una cancelación detiene también el reparto. Al cerrar el generador
+    antes de tiempo se descartan las tareas pendientes."""
+    from concurrent.futures import wait, FIRST_COMPLETED
+    from concurrent.futures.process import BrokenProcessPool
+
+    tareas = list(tareas)
+    procesos = PROCESOS if procesos is None else max(int(procesos), 1)
+    procesos = min(procesos, len(tareas))
+    if procesos <= 1:
+        for tarea in tareas:
+            yield funcion(*tarea)
+        return
+
+    grupo = _obtener_grupo(procesos)
+    pendientes = deque()
+    siguiente = 0
+    try:
+        while siguiente < len(tareas) or pendientes:
+            while siguiente < len(tareas) and len(pendientes) < procesos * EN_VUELO_POR_PROCESO:
+                pendientes.append(grupo.submit(funcion, *tareas[siguiente]))
+                siguiente += 1
+            primero = pendientes[0]
+            while not primero.done():
+                if progreso is not None:
+                    progreso(None)
+                wait([primero], timeout=0.1, return_when=FIRST_COMPLETED)
+            pendientes.popleft()
+            try:
+                resultado = primero.result()
+            except BrokenProcessPool:
+                cerrar()
+                raise ValueError("Un proceso de cálculo terminó de forma inesperada.")
+            yield resultado
+    finally:
+        for futuro in pendientes:
+            futuro.cancel()
@@ -0,0 +1,71 @@
+import re
+
+from calcucho.core import expresiones, memo, simbolico
+
+
+# --- Lógica de operaciones con polinomios (sympy se importa al usarla) ---
+class PolinomioMayor:
+    @staticmethod
+    def sumar(p1, p2): return p1 + p2
+    @staticmethod
+    def restar(p1, p2): return p1 - p2
+    @staticmethod
+    def multiplicar(p1, p2): return p1 * p2
+    @staticmethod
+    def derivar(p, variable):
+        from sympy import diff
+        return diff(p, variable)
+    @staticmethod
+    def integrar(p):
+        from sympy import Symbol, integrate
+        return integrate(p, Symbol('x'))
+    @staticmethod
+    def evaluar(p, valor):
+        from sympy import Symbol
+        return p.subs(Symbol('x'), valor)
+
+
+def _con_latex(funcion, *args):
+    from sympy import latex
+
+    resultado = funcion(*args)
+    return resultado, latex(resultado)
+
+
+def parsear(texto):
+    """Interpreta un polinomio insertando la multiplicación implícita (2x -> 2*x)."""
+    texto = re.sub(r'(?<=\d)(?=[a-zA-Z])', '*', texto.strip())
+    return expresiones.compilar(texto).expr
+
+
+def operar(operacion, p1, p2=None, variable="x", valor=None, tiempo=None, progreso=None):
+    """Aplica una operación de ``PolinomioMayor``; p1 y p2 son expresiones de sympy.
+
+    La integral se calcula en el motor simbólico con tiempo límite; derivadas e
+    integrales se guardan en la caché persistente (``memo``)."""
+    from sympy import symbols
+
+    if operacion in ("sumar", "restar", "multiplicar") and p2 is None:
+        raise ValueError("Debes ingresar ambos polinomios para esta operación.")
+
+    if operacion == "sumar":
+        return PolinomioMayor.sumar(p1, p2)
+    if operacion == "restar":
+        return PolinomioMayor.restar(p1, p2)
+    if operacion == "multiplicar":
+        return PolinomioMayor.multiplicar(p1, p2).expand()
+    if operacion == "derivar":
+        simbolo = symbols(variable)
+        return memo.memorizar("derivar", p1, simbolo, lambda: _con_latex(PolinomioMayor.derivar, p1, simbolo))[0]
+    if operacion == "integrar":
+        return memo.memorizar("integrar", p1, symbols("x"), lambda: simbolico.ejecutar(
+            _con_latex, PolinomioMayor.integrar, p1, tiempo=tiempo, progreso=progreso,
+            descripcion="La integral"))[0]
+    if operacion == "evaluar":
+        if valor is None:
+            raise ValueError("Debes ingresar un número para evaluar el polinomio.")
+        resultado = PolinomioMayor.evaluar(p1, float(valor))
+        if resultado.is_number:
+            resultado = round(float(resultado), 3)
+        return resultado
+    raise ValueError("Operación no válida.")
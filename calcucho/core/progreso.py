@@ -0,0 +1,28 @@
+"""Informe de avance y cancelación cooperativa para los cálculos largos.
+
+Las funciones del núcleo que tardan aceptan un argumento ``progreso``: una
+función que reciben la fracción completada (0 a 1) y que puede lanzar
+``Cancelado`` para detener el cálculo en el siguiente punto de control.
+``progreso(None)`` sólo comprueba la cancelación, sin informar avance.
+"""
+
+
+class Cancelado(Exception):
+    """El usuario canceló la operación en curso."""
+
+
+class Avance:
+    """Llama a ``progreso`` como mucho unas ``pasos`` veces a lo largo de ``total`` iteraciones."""
+
+    def __init__(self, progreso, total, pasos=100):
+        self.progreso = progreso
+        self.total = max(int(total), 1)
+        self.cada = max(self.total // pasos, 1)
+
+    def __call__(self, i):
+        if self.progreso is not None and i % self.cada == 0:
+            self.progreso(i / self.total)
+
+    def terminar(self):
+        if self.progreso is not None:
+            self.progreso(1.0)
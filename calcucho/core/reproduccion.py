@@ -0,0 +1,247 @@
+"""Estimación de Rₜ a partir de casos diarios (Cori et al., 2013) y pronóstico.
+
+Con la incidencia diaria Iₜ y la distribución del intervalo serial w, la
+infecciosidad total es Λₜ = Σₛ wₛ·Iₜ₋ₛ. Si Rₜ es constante en la ventana de
+τ días que termina en t y tiene una priori Gamma(a, b), la posteriori es
+
+    Gamma(a + Σ I,  1 / (1/b + Σ Λ))        (sumas sobre la ventana)
+
+Las sumas de todas las ventanas salen de diferencias de sumas acumuladas y
+todo se calcula a la vez para todas las regiones (un renglón por región), de
+modo que años de datos diarios de cientos de regiones tardan segundos.
+
+El pronóstico parte de la última posteriori: cada trayectoria toma un Rₜ de
+ella (constante o con la tendencia reciente) y simula los casos futuros con la
+ecuación de renovación, Iₜ ~ Poisson(Rₜ·Λₜ).
+"""
+import csv
+
+import numpy as np
+
+from calcucho.core.progreso import Avance
+
+# Ventana de estimación (días) y priori de Rₜ (media y desviación; las de Cori et al.)
+VENTANA = 7
+PRIORI_MEDIA = 5.0
+PRIORI_DESVIACION = 5.0
+# Intervalo serial por omisión (COVID-19, Nishiura et al., 2020)
+SERIAL_MEDIA = 4.7
+SERIAL_DESVIACION = 2.9
+# Masa del intervalo serial que se conserva al truncarlo
+MASA_SERIAL = 0.9999
+# Cuantiles que se informan: intervalo de credibilidad del 95 % y mediana
+CUANTILES = (0.025, 0.5, 0.975)
+# Trayectorias del pronóstico y regiones que se simulan a la vez (acota la memoria)
+TRAYECTORIAS = 1000
+REGIONES_POR_BLOQUE = 50
+
+
+def leer_incidencia(ruta):
+    """Lee casos diarios de un CSV con encabezado.
+
+    Con una sola columna, ésta son los casos; con varias, la primera es la
+    fecha (o el día) y cada una de las demás es una región. Las celdas vacías
+    cuentan como 0. Devuelve ``fechas``, ``regiones`` y ``casos`` (regiones × días)."""
+    try:
+        with open(ruta, newline="", encoding="utf-8-sig") as archivo:
+            filas = [fila for fila in csv.reader(archivo) if any(celda.strip() for celda in fila)]
+    except OSError as e:
+        raise ValueError(f"No se pudo leer {ruta}: {e}")
+    if len(filas) < 2:
+        raise ValueError("El archivo debe tener un encabezado y al menos un día de casos.")
+    encabezado, datos = filas[0], filas[1:]
+    con_fechas = len(encabezado) > 1
+    regiones = [nombre.strip() for nombre in encabezado[1:]] if con_fechas else [encabezado[0].strip()]
+    casos = np.zeros((len(datos), len(regiones)))
+    for i, fila in enumerate(datos):
+        valores = fila[1:] if con_fechas else fila
+        if len(valores) > len(regiones):
+            raise ValueError(f"La fila {i + 2} tiene más columnas que el encabezado.")
+        for j, celda in enumerate(valores):
+            if celda.strip():
+                try:
+                    casos[i, j] = float(celda)
+                except ValueError:
+                    raise ValueError(f"Valor no numérico en la fila {i + 2}: «{celda}».")
+    if np.any(casos < 0):
+        fila = int(np.argwhere(casos < 0)[0, 0])
+        raise ValueError(f"Los casos no pueden ser negativos (fila {fila + 2}).")
+    fechas = [fila[0].strip() for fila in datos] if con_fechas else [str(i) for i in range(len(datos))]
+    return {"fechas": fechas, "regiones": regiones, "casos": casos.T}
+
+
+def intervalo_serial(media=SERIAL_MEDIA, desviacion=SERIAL_DESVIACION, masa=MASA_SERIAL):
+    """Distribución discreta del intervalo serial: w[s] para s = 0, 1, … (w[0] = 0).
+
+    Es la discretización de Cori et al. de una gamma desplazada un día, con la
+    ``media`` y ``desviacion`` dadas, truncada cuando acumula ``masa``."""
+    from scipy.stats import gamma
+
+    if media <= 1:
+        raise ValueError("La media del intervalo serial debe ser mayor que 1 día.")
+    if desviacion <= 0:
+        raise ValueError("La desviación del intervalo serial debe ser positiva.")
+    a = ((media - 1) / desviacion) ** 2
+    b = desviacion ** 2 / (media - 1)
+    largo = int(gamma.ppf(masa, a, scale=b)) + 3
+    k = np.arange(largo, dtype=float)
+
+    def F(x, forma):
+        return gamma.cdf(x, forma, scale=b)
+
+    w = (k * F(k, a) + (k - 2) * F(k - 2, a) - 2 * (k - 1) * F(k - 1, a)
+         + a * b * (2 * F(k - 1, a + 1) - F(k - 2, a + 1) - F(k, a + 1)))
+    w = np.clip(w, 0.0, None)
+    w[0] = 0.0
+    return w / w.sum()
+
+
+def infecciosidad(casos, w):
+    """Λₜ = Σₛ wₛ·Iₜ₋ₛ para cada región (renglón) de ``casos``."""
+    casos = np.atleast_2d(casos)
+    dias = casos.shape[1]
+    total = np.zeros_like(casos, dtype=float)
+    for s in range(1, min(len(w), dias)):
+        total[:, s:] += w[s] * casos[:, :-s]
+    return total
+
+
+def _sumas_ventana(x, ventana):
+    """Suma de los ``ventana`` valores que terminan en cada día (diferencia de acumuladas)."""
+    acumulada = np.cumsum(x, axis=1)
+    sumas = acumulada.copy()
+    sumas[:, ventana:] -= acumulada[:, :-ventana]
+    return sumas
+
+
+def estimar(casos, ventana=VENTANA, serial_media=SERIAL_MEDIA, serial_desviacion=SERIAL_DESVIACION,
+            priori_media=PRIORI_MEDIA, priori_desviacion=PRIORI_DESVIACION, cuantiles=CUANTILES):
+    """Rₜ de cada región y día con la ventana que termina en ese día.
+
+    Devuelve la ``media`` y los ``cuantiles`` (uno por renglón de la primera
+    dimensión) de la posteriori, con forma (regiones × días), y su ``forma`` y
+    ``escala``; NaN donde la ventana aún no está completa o no hay
+    infecciosidad. Incluye también ``w``, la ``infecciosidad`` y los
+    ``casos_ventana`` (con pocos casos, el intervalo es muy ancho)."""
+    from scipy.special import gammaincinv
+
+    casos = np.atleast_2d(np.asarray(casos, dtype=float))
+    if casos.shape[1] < 2:
+        raise ValueError("Se necesitan al menos dos días de casos.")
+    if not 1 <= ventana < casos.shape[1]:
+        raise ValueError("La ventana debe tener entre 1 día y menos días que los datos.")
+    if priori_media <= 0 or priori_desviacion <= 0:
+        raise ValueError("La media y la desviación de la priori deben ser positivas.")
+    w = intervalo_serial(serial_media, serial_desviacion)
+    lam = infecciosidad(casos, w)
+
+    casos_ventana = _sumas_ventana(casos, ventana)
+    lam_ventana = _sumas_ventana(lam, ventana)
+    a = (priori_media / priori_desviacion) ** 2
+    b = priori_desviacion ** 2 / priori_media
+    forma = a + casos_ventana
+    with np.errstate(divide="ignore"):
+        escala = 1 / (1 / b + lam_ventana)
+    # La primera ventana completa empieza el día 1: el día 0 no tiene infecciosidad
+    validos = (np.arange(casos.shape[1]) >= ventana) & (lam_ventana > 0)
+    forma = np.where(validos, forma, np.nan)
+    escala = np.where(validos, escala, np.nan)
+    return {
+        "media": forma * escala,
+        "cuantiles": np.stack([gammaincinv(forma, q) * escala for q in cuantiles]),
+        "niveles": tuple(cuantiles),
+        "ventana": ventana,
+        "priori": (a, b),
+        "forma": forma,
+        "escala": escala,
+        "w": w,
+        "infecciosidad": lam,
+        "casos_ventana": casos_ventana,
+    }
+
+
+def pronosticar(casos, estimacion, horizonte, trayectorias=TRAYECTORIAS, tendencia=False, semilla=None,
+                cuantiles=CUANTILES, progreso=None):
+    """Pronóstico de Rₜ y de los casos de los ``horizonte`` días siguientes.
+
+    Rₜ sigue la última posteriori de ``estimacion`` (sus cuantiles se dan
+    exactos) y cada trayectoria de casos toma un valor de ella; con
+    ``tendencia``, ese valor cambia al ritmo exponencial que tuvo la media de
+    Rₜ en las dos últimas ventanas. En las regiones sin casos recientes se usa
+    la priori. Devuelve, con forma (regiones × horizonte), ``rt_media`` y
+    ``casos_media``, y sus ``rt_cuantiles`` y ``casos_cuantiles``."""
+    from scipy.special import gammaincinv
+
+    casos = np.atleast_2d(np.asarray(casos, dtype=float))
+    if horizonte < 1:
+        raise ValueError("El horizonte del pronóstico debe ser de al menos un día.")
+    if trayectorias < 1:
+        raise ValueError("Debe haber al menos una trayectoria.")
+    regiones, dias = casos.shape
+    # Sin infecciosidad reciente no hay posteriori: se usa la priori (y sin casos, Λ = 0 igualmente)
+    a, b = estimacion["priori"]
+    forma = np.nan_to_num(estimacion["forma"][:, -1], nan=a)
+    escala = np.nan_to_num(estimacion["escala"][:, -1], nan=b)
+    w = estimacion["w"]
+    rng = np.random.default_rng(semilla)
+
+    pendiente = np.zeros(regiones)
+    if tendencia:
+        # Ajuste log-lineal de la media de Rₜ en las dos últimas ventanas
+        tramo = min(2 * estimacion["ventana"], dias)
+        media = estimacion["media"][:, -tramo:]
+        x = np.arange(tramo, dtype=float)
+        usar = np.isfinite(media) & (media > 0)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            y = np.where(usar, np.log(np.where(usar, media, 1.0)), 0.0)
+            n = usar.sum(axis=1)
+            sx, sy = (usar * x).sum(axis=1), y.sum(axis=1)
+            sxx, sxy = (usar * x * x).sum(axis=1), (y * x).sum(axis=1)
+            pendiente = np.nan_to_num((n * sxy - sx * sy) / (n * sxx - sx ** 2))
+
+    # Rₜ futuro: la última posteriori escalada por la tendencia; sus cuantiles son exactos
+    crecimiento = np.exp(pendiente[:, np.newaxis] * np.arange(1, horizonte + 1))
+    rt_media = (forma * escala)[:, np.newaxis] * crecimiento
+    rt_cuantiles = np.stack([(gammaincinv(forma, q) * escala)[:, np.newaxis] * crecimiento for q in cuantiles])
+
+    # Casos: por bloques de regiones, los últimos días que alcanza el intervalo serial
+    # (con ceros si hay menos datos) seguidos de los días simulados
+    memoria = len(w) - 1
+    pesos = w[1:][::-1]
+    casos_media = np.empty((regiones, horizonte))
+    casos_cuantiles = np.empty((len(cuantiles), regiones, horizonte))
+    avance = Avance(progreso, regiones)
+    for inicio in range(0, regiones, REGIONES_POR_BLOQUE):
+        avance(inicio)
+        bloque = slice(inicio, min(inicio + REGIONES_POR_BLOQUE, regiones))
+        R = rng.gamma(forma[bloque, np.newaxis], escala[bloque, np.newaxis], (bloque.stop - inicio, trayectorias))
+        serie = np.zeros((bloque.stop - inicio, trayectorias, memoria + horizonte))
+        reciente = casos[bloque, -memoria:]
+        serie[:, :, memoria - reciente.shape[1]:memoria] = reciente[:, np.newaxis, :]
+        for h in range(horizonte):
+            fin = memoria + h
+            lam = serie[:, :, fin - memoria:fin] @ pesos
+            serie[:, :, fin] = rng.poisson(R * crecimiento[bloque, h, np.newaxis] * lam)
+        futuros = serie[:, :, memoria:]
+        casos_media[bloque] = futuros.mean(axis=1)
+        casos_cuantiles[:, bloque] = np.quantile(futuros, cuantiles, axis=1)
+    avance.terminar()
+
+    return {
+        "rt_media": rt_media,
+        "rt_cuantiles": rt_cuantiles,
+        "casos_media": casos_media,
+        "casos_cuantiles": casos_cuantiles,
+        "niveles": tuple(cuantiles),
+        "pendiente": pendiente,
+    }
+
+
+def analizar(casos, ventana=VENTANA, serial_media=SERIAL_MEDIA, serial_desviacion=SERIAL_DESVIACION,
+             horizonte=14, trayectorias=TRAYECTORIAS, tendencia=False, semilla=None, progreso=None):
+    """``estimar`` y, si ``horizonte`` > 0, ``pronosticar``; devuelve ``estimacion`` y ``pronostico``."""
+    estimacion = estimar(casos, ventana, serial_media, serial_desviacion)
+    pronostico = None
+    if horizonte:
+        pronostico = pronosticar(casos, estimacion, horizonte, trayectorias, tendencia, semilla, progreso=progreso)
+    return {"estimacion": estimacion, "pronostico": pronostico}
@@ -0,0 +1,161 @@
+"""Motor simbólico aislado en procesos con tiempo límite por llamada.
+
+Algunas llamadas de sympy (``integrate``, ``diagonalize``, ``simplify``) pueden
+tardar minutos o no terminar nunca con entradas de aspecto inocente. Las
+funciones del núcleo las ejecutan con ``ejecutar(...)`` en un proceso aparte:
+si se supera el tiempo límite o el usuario cancela, el proceso se termina y se
+lanza ``TiempoAgotado`` (o ``Cancelado``), sin que la aplicación se bloquee.
+
+Los procesos ociosos se reutilizan, de modo que sympy sólo se importa una vez
+por proceso. La función ejecutada debe poder importarse por nombre (una función
+de nivel de módulo) y sus argumentos y resultado deben poder serializarse.
+"""
+import atexit
+import multiprocessing
+import threading
+
+# Segundos que puede durar una llamada simbólica antes de abandonarla
+TIEMPO_LIMITE = 20.0
+
+# Procesos ociosos que se conservan para las siguientes llamadas
+MAX_INACTIVOS = 2
+
+# Intervalo con el que se comprueba la cancelación mientras se espera
+_INTERVALO = 0.1
+
+
+class TiempoAgotado(ValueError):
+    """La operación simbólica superó el tiempo límite y se detuvo."""
+
+    def __init__(self, tiempo, descripcion="El cálculo simbólico"):
+        super().__init__(
+            f"{descripcion} superó el tiempo límite de {tiempo:g} s y se detuvo. "
+            "Prueba con una expresión más sencilla."
+        )
+        self.tiempo = tiempo
+
+
+def _trabajar(conexion):
+    """Bucle del proceso trabajador: recibe (función, args, kwargs) y responde."""
+    import sympy  # noqa: F401  (se importa una sola vez por proceso)
+
+    while True:
+        try:
+            tarea = conexion.recv()
+        except EOFError:
+            return
+        if tarea is None:
+            return
+        funcion, args, kwargs = tarea
+        try:
+            respuesta = ("ok", funcion(*args, **kwargs))
+        except Exception as e:
+            respuesta = ("error", e)
+        try:
+            conexion.send(respuesta)
+        except Exception as e:
+            # El resultado o la excepción no se pudieron serializar
+            conexion.send(("error", ValueError(str(e))))
+
+
+class _Trabajador:
+    def __init__(self):
+        contexto = multiprocessing.get_context("spawn")
+        self.conexion, extremo = contexto.Pipe()
+        self.proceso = contexto.Process(target=_trabajar, args=(extremo,), daemon=True)
+        self.proceso.start()
+        extremo.close()
+
+    def vivo(self):
+        return self.proceso.is_alive()
+
+    def terminar(self):
+        if self.proceso.is_alive():
+            self.proceso.terminate()
+        self.proceso.join(1)
+        self.conexion.close()
+
+    def cerrar(self):
+        try:
+            self.conexion.send(None)
+        except (OSError, ValueError):
+            pass
+        self.proceso.join(1)
+        self.terminar()
+
+
+_inactivos = []
+_cerrojo = threading.Lock()
+
+
+def _tomar():
+    with _cerrojo:
+        while _inactivos:
+            trabajador = _inactivos.pop()
+            if trabajador.vivo():
+                return trabajador
+            trabajador.terminar()
+    return _Trabajador()
+
+
+def _devolver(trabajador):
+    with _cerrojo:
+        if len(_inactivos) < MAX_INACTIVOS:
+            _inactivos.append(trabajador)
+            return
+    trabajador.cerrar()
+
+
+def precalentar():
+    """Arranca un proceso ocioso para que la primera llamada no espere a sympy."""
+    with _cerrojo:
+        if _inactivos:
+            return
+    _devolver(_Trabajador())
+
+
+@atexit.register
+def cerrar():
+    """Termina los procesos ociosos."""
+    with _cerrojo:
+        trabajadores = list(_inactivos)
+        _inactivos.clear()
+    for trabajador in trabajadores:
+        trabajador.cerrar()
+
+
+def ejecutar(funcion, *args, tiempo=None, progreso=None, descripcion="El cálculo simbólico", **kwargs):
+    """Ejecuta ``funcion(*args, **kwargs)`` en un proceso aparte y devuelve su resultado.
+
+    Lanza ``TiempoAgotado`` si tarda más de ``tiempo`` segundos (por omisión
+    ``TIEMPO_LIMITE``). Mientras espera llama a ``progreso(None)`` para que una
+    cancelación detenga también el proceso. Las excepciones de la función se
+    relanzan tal cual."""
+    limite = TIEMPO_LIMITE if tiempo is None else tiempo
+    trabajador = _tomar()
+    try:
+        try:
+            trabajador.conexion.send((funcion, args, kwargs))
+        except OSError:
+            raise ValueError(f"{descripcion} terminó de forma inesperada.")
+        esperado = 0.0
+        while not trabajador.conexion.poll(_INTERVALO):
+            esperado += _INTERVALO
+            if not trabajador.vivo():
+                raise ValueError(f"{descripcion} terminó de forma inesperada.")
+            if progreso is not None:
+                progreso(None)
+            if esperado >= limite:
+                raise TiempoAgotado(limite, descripcion)
+        try:
+            estado, valor = trabajador.conexion.recv()
+        except (EOFError, OSError):
+            raise ValueError(f"{descripcion} terminó de forma inesperada.")
+    except BaseException:
+        # Tiempo agotado, cancelación o proceso roto: no se reutiliza
+        trabajador.terminar()
+        raise
+    _devolver(trabajador)
+    if estado == "error":
+        raise valor
+    return valor
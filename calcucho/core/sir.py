@@ -0,0 +1,198 @@
+"""Modelo SIR normalizado con tasa de contagio β(t) y Rₜ(t) = β(t)/γ · S(t).
+
+``simular`` integra una trayectoria con ``solve_ivp`` y el método elegido
+(RK45, LSODA, Radau o BDF). El lado derecho y su jacobiana analítica se arman
+una sola vez por simulación con ``sistema``: β(t) queda fijado como una función
+escalar y cada evaluación opera con flotantes de Python, sin comparar cadenas
+ni crear listas intermedias. ``barrer`` integra a la
+vez todas las combinaciones de una malla de (β, γ, I₀) como un solo arreglo de
+estados, con Runge-Kutta 4 de paso fijo, y resume cada una en su pico de
+infectados, el día del pico y el tamaño final de la epidemia.
+"""
+import math
+import time
+
+import numpy as np
+
+from calcucho.core.progreso import Avance
+
+TIPOS_BETA = ("Constante", "Variable (senoidal)")
+# Métodos de solve_ivp; los implícitos (Radau, BDF) y LSODA aprovechan la jacobiana
+METODOS = ("RK45", "LSODA", "Radau", "BDF")
+# Tolerancias relativa y absoluta por omisión (las de solve_ivp)
+RTOL = 1e-3
+ATOL = 1e-6
+# β constante, o β medio de la senoidal, cuando no se indica otro
+BETA_BASE = {"Constante": 0.3, "Variable (senoidal)": 0.25}
+
+# Paso (en días) del integrador del barrido y combinaciones que admite como máximo
+PASO_BARRIDO = 0.1
+MAX_COMBINACIONES = 1_000_000
+
+
+def beta_func(t, tipo, beta=None):
+    """β(t) del tipo dado; ``beta`` (escalar o arreglo) sustituye al valor constante o medio."""
+    base = BETA_BASE[tipo] if beta is None else beta
+    if tipo == "Constante":
+        return base
+    elif tipo == "Variable (senoidal)":
+        return base + 0.05 * np.sin(0.2 * t)
+
+
+def funcion_beta(tipo_beta, beta=None):
+    """β(t) del tipo dado como función escalar, para evaluarla dentro del lado derecho."""
+    base = BETA_BASE[tipo_beta] if beta is None else beta
+    if tipo_beta == "Constante":
+        def beta_t(t):
+            return base
+    elif tipo_beta == "Variable (senoidal)":
+        def beta_t(t):
+            return base + 0.05 * math.sin(0.2 * t)
+    else:
+        raise ValueError(f"Tipo de β(t) desconocido: {tipo_beta}")
+    return beta_t
+
+
+def sistema(gamma, tipo_beta, beta=None):
+    """Lado derecho ``f(t, y)`` y jacobiana ``J(t, y)`` del modelo para γ y β(t) fijos."""
+    beta_t = funcion_beta(tipo_beta, beta)
+
+    def rhs(t, y):
+        S, I, _ = y.tolist()
+        contagios = beta_t(t) * S * I
+        recuperaciones = gamma * I
+        return np.array((-contagios, contagios - recuperaciones, recuperaciones))
+
+    def jacobiana(t, y):
+        S, I, _ = y.tolist()
+        b = beta_t(t)
+        return np.array((
+            (-b * I, -b * S, 0.0),
+            (b * I, b * S - gamma, 0.0),
+            (0.0, gamma, 0.0),
+        ))
+
+    return rhs, jacobiana
+
+
+def simular(N, I0, gamma, dias, tipo_beta="Constante", puntos=300, progreso=None,
+            metodo="RK45", rtol=RTOL, atol=ATOL):
+    """Integra el modelo y devuelve un diccionario con t, S, I, R y Rt (arreglos).
+
+    Incluye también el ``metodo`` usado, las ``evaluaciones`` del lado derecho,
+    las ``jacobianas`` calculadas, los ``pasos`` aceptados y los ``segundos``
+    que tardó la integración."""
+    from scipy.integrate import solve_ivp
+
+    if tipo_beta not in TIPOS_BETA:
+        raise ValueError(f"Tipo de β(t) desconocido: {tipo_beta}")
+    if metodo not in METODOS:
+        raise ValueError(f"Método de integración desconocido: {metodo}")
+    if N <= 0 or not 0 <= I0 <= N:
+        raise ValueError("Los infectados iniciales deben estar entre 0 y la población total.")
+    if gamma <= 0:
+        raise ValueError("La tasa de recuperación γ debe ser positiva.")
+    if dias <= 0:
+        raise ValueError("Los días de simulación deben ser positivos.")
+    if not (rtol > 0 and atol > 0):
+        raise ValueError("Las tolerancias deben ser positivas.")
+
+    S0 = N - I0
+    R0 = 0
+    y0 = [S0 / N, I0 / N, R0 / N]
+    t_eval = np.linspace(0, dias, puntos)
+
+    rhs, jacobiana = sistema(gamma, tipo_beta)
+    if progreso is not None:
+        # El avance se informa según el tiempo que alcanza el integrador
+        f = rhs
+
+        def rhs(t, y):
+            progreso(min(t / dias, 1.0))
+            return f(t, y)
+
+    # RK45 no usa la jacobiana y solve_ivp avisa si se la pasan
+    opciones = {} if metodo == "RK45" else {"jac": jacobiana}
+    inicio = time.perf_counter()
+    sol = solve_ivp(rhs, (0, dias), y0, method=metodo, t_eval=t_eval, rtol=rtol, atol=atol, **opciones)
+    segundos = time.perf_counter() - inicio
+    if not sol.success:
+        raise ValueError(f"La integración no convergió: {sol.message}")
+
+    S, I, R = sol.y
+    Rt = beta_func(sol.t, tipo_beta) / gamma * S
+    return {
+        "t": sol.t, "S": S, "I": I, "R": R, "Rt": Rt,
+        "metodo": metodo,
+        "evaluaciones": int(sol.nfev),
+        "jacobianas": int(sol.njev),
+        "segundos": segundos,
+    }
+
+
+def _derivadas(S, I, beta, gamma):
+    contagios = beta * S * I
+    return -contagios, contagios - gamma * I
+
+
+def barrer(N, betas, gammas, infectados, dias, tipo_beta="Constante", paso=PASO_BARRIDO, progreso=None):
+    """Integra el modelo para todas las combinaciones de ``betas`` × ``gammas`` × ``infectados``.
+
+    Los estados de todas las combinaciones avanzan juntos como arreglos, con
+    RK4 de paso fijo ``paso``; el pico se sigue en línea, así que la memoria no
+    depende de los días. Con β(t) senoidal, ``betas`` es el valor medio.
+
+    Devuelve los ejes (``betas``, ``gammas``, ``infectados``) y, con forma
+    (β, γ, I₀), ``pico`` (infectados simultáneos máximos, en personas),
+    ``dia_pico``, ``tamano_final`` (fracción que llegó a infectarse) y ``R0``
+    (β/γ · S₀)."""
+    if tipo_beta not in TIPOS_BETA:
+        raise ValueError(f"Tipo de β(t) desconocido: {tipo_beta}")
+    betas = np.atleast_1d(np.asarray(betas, dtype=float))
+    gammas = np.atleast_1d(np.asarray(gammas, dtype=float))
+    infectados = np.atleast_1d(np.asarray(infectados, dtype=float))
+    if N <= 0 or np.any(infectados < 0) or np.any(infectados > N):
+        raise ValueError("Los infectados iniciales deben estar entre 0 y la población total.")
+    if np.any(betas < 0):
+        raise ValueError("La tasa de contagio β no puede ser negativa.")
+    if np.any(gammas <= 0):
+        raise ValueError("La tasa de recuperación γ debe ser positiva.")
+    if dias <= 0 or paso <= 0:
+        raise ValueError("Los días de simulación y el paso deben ser positivos.")
+    forma = (len(betas), len(gammas), len(infectados))
+    if np.prod(forma) > MAX_COMBINACIONES:
+        raise ValueError(f"El barrido admite como máximo {MAX_COMBINACIONES:,} combinaciones.")
+
+    beta, gamma, I0 = np.meshgrid(betas, gammas, infectados, indexing="ij")
+    S = 1 - I0 / N
+    I = I0 / N
+    S0 = S.copy()
+    pico, dia_pico = I.copy(), np.zeros(forma)
+
+    pasos = int(np.ceil(dias / paso))
+    h = dias / pasos
+    avance = Avance(progreso, pasos)
+    for k in range(pasos):
+        avance(k)
+        t = k * h
+        b0, b1, b2 = (beta_func(t + d, tipo_beta, beta) for d in (0, h / 2, h))
+        k1s, k1i = _derivadas(S, I, b0, gamma)
+        k2s, k2i = _derivadas(S + h / 2 * k1s, I + h / 2 * k1i, b1, gamma)
+        k3s, k3i = _derivadas(S + h / 2 * k2s, I + h / 2 * k2i, b1, gamma)
+        k4s, k4i = _derivadas(S + h * k3s, I + h * k3i, b2, gamma)
+        S = S + h / 6 * (k1s + 2 * k2s + 2 * k3s + k4s)
+        I = I + h / 6 * (k1i + 2 * k2i + 2 * k3i + k4i)
+        mayor = I > pico
+        pico = np.where(mayor, I, pico)
+        dia_pico = np.where(mayor, t + h, dia_pico)
+    avance.terminar()
+
+    return {
+        "betas": betas,
+        "gammas": gammas,
+        "infectados": infectados,
+        "pico": pico * N,
+        "dia_pico": dia_pico,
+        "tamano_final": 1 - S,
+        "R0": beta_func(0.0, tipo_beta, beta) / gamma * S0,
+    }
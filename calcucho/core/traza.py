@@ -0,0 +1,173 @@
+"""Trazas de tiempo por operación: interpretar, cálculo, tabla y dibujo.
+
+Cada clic de "Ejecutar"/"Calcular"/"Simular" es una ``Ejecucion`` con varios
+tramos medidos por separado. Los módulos marcan sus tramos con
+``with tramo("tabla"): ...``; el ejecutor de trabajos mide el tramo de cálculo
+y cierra la ejecución al mostrar el resultado. Las ejecuciones terminadas se
+guardan en un registro circular que se puede exportar como JSON o CSV.
+"""
+import csv
+import functools
+import json
+import time
+from collections import deque
+from contextlib import contextmanager
+from datetime import datetime
+
+# Orden y nombre con que se muestran los tramos
+TRAMOS = {"interpretar": "interpretar", "calculo": "cálculo", "tabla": "tabla", "dibujo": "dibujo"}
+
+# Ejecuciones que conserva el registro
+CAPACIDAD = 1000
+
+
+class Ejecucion:
+    def __init__(self, operacion):
+        self.operacion = operacion
+        self.fecha = datetime.now().isoformat(timespec="milliseconds")
+        self.inicio = time.perf_counter()
+        self.total = None
+        self.estado = None
+        self.tramos = {}
+
+    def agregar(self, nombre, segundos):
+        self.tramos[nombre] = self.tramos.get(nombre, 0.0) + segundos
+
+    def resumen(self):
+        """Texto de una línea: "Monte Carlo: interpretar 2 ms · cálculo 150 ms (total 160 ms)"."""
+        partes = [f"{TRAMOS.get(nombre, nombre)} {segundos * 1e3:.0f} ms"
+                  for nombre, segundos in sorted(self.tramos.items(), key=_orden)]
+        total = f" (total {self.total * 1e3:.0f} ms)" if self.total is not None else ""
+        return f"{self.operacion}: {' · '.join(partes)}{total}"
+
+    def como_dict(self):
+        return {
+            "fecha": self.fecha,
+            "operacion": self.operacion,
+            "estado": self.estado,
+            "total_ms": None if self.total is None else round(self.total * 1e3, 3),
+            "tramos_ms": {nombre: round(s * 1e3, 3) for nombre, s in sorted(self.tramos.items(), key=_orden)},
+        }
+
+
+def _orden(par):
+    nombres = list(TRAMOS)
+    return nombres.index(par[0]) if par[0] in nombres else len(nombres)
+
+
+class Registro:
+    def __init__(self, capacidad=CAPACIDAD):
+        self.ejecuciones = deque(maxlen=capacidad)
+        self.oyentes = []
+
+    def agregar(self, ejecucion):
+        self.ejecuciones.append(ejecucion)
+        for oyente in self.oyentes:
+            oyente(ejecucion)
+
+    def ultima(self):
+        return self.ejecuciones[-1] if self.ejecuciones else None
+
+    def exportar_json(self, ruta):
+        with open(ruta, "w", encoding="utf-8") as archivo:
+            json.dump([e.como_dict() for e in self.ejecuciones], archivo, ensure_ascii=False, indent=2)
+
+    def exportar_csv(self, ruta):
+        nombres = list(TRAMOS)
+        for e in self.ejecuciones:
+            nombres += [n for n in e.tramos if n not in nombres]
+        with open(ruta, "w", encoding="utf-8", newline="") as archivo:
+            escritor = csv.writer(archivo)
+            escritor.writerow(["fecha", "operacion", "estado", "total_ms"] + [f"{n}_ms" for n in nombres])
+            for e in self.ejecuciones:
+                d = e.como_dict()
+                escritor.writerow([d["fecha"], d["operacion"], d["estado"], d["total_ms"]]
+                                  + [d["tramos_ms"].get(n, "") for n in nombres])
+
+    def exportar(self, ruta):
+        """Exporta como CSV si la ruta termina en .csv y como JSON en otro caso."""
+        if str(ruta).lower().endswith(".csv"):
+            self.exportar_csv(ruta)
+        else:
+            self.exportar_json(ruta)
+
+
+registro = Registro()
+
+# Ejecución en curso en el hilo de la interfaz (los clics se atienden de a uno)
+_actual = None
+
+
+def iniciar(operacion):
+    """Abre una ejecución nueva y la deja como actual."""
+    global _actual
+    _actual = Ejecucion(operacion)
+    return _actual
+
+
+def actual():
+    return _actual
+
+
+def activar(ejecucion):
+    global _actual
+    _actual = ejecucion
+
+
+def soltar():
+    """Devuelve la ejecución actual y deja de considerarla actual."""
+    global _actual
+    ejecucion, _actual = _actual, None
+    return ejecucion
+
+
+def terminar(ejecucion, estado="listo"):
+    """Cierra la ejecución y la guarda en el registro."""
+    global _actual
+    if _actual is ejecucion:
+        _actual = None
+    ejecucion.total = time.perf_counter() - ejecucion.inicio
+    ejecucion.estado = estado
+    registro.agregar(ejecucion)
+
+
+@contextmanager
+def tramo(nombre):
+    """Suma la duración del bloque al tramo ``nombre`` de la ejecución actual."""
+    ejecucion = _actual
+    inicio = time.perf_counter()
+    try:
+        yield
+    finally:
+        if ejecucion is not None:
+            ejecucion.agregar(nombre, time.perf_counter() - inicio)
+
+
+def operacion(nombre):
+    """Decora el manejador de un botón: abre una ejecución y mide su tramo "interpretar".
+
+    Si el manejador no envía ningún trabajo (por ejemplo, por un error de
+    validación), la ejecución se descarta."""
+    def decorador(metodo):
+        @functools.wraps(metodo)
+        def envoltura(self, *_):
+            ejecucion = iniciar(nombre)
+            try:
+                with tramo("interpretar"):
+                    return metodo(self)
+            finally:
+                if _actual is ejecucion:
+                    soltar()
+        return envoltura
+    return decorador
+
+
+def medir(nombre):
+    """Decora un método para sumar su duración al tramo ``nombre`` de la ejecución actual."""
+    def decorador(funcion):
+        @functools.wraps(funcion)
+        def envoltura(*args, **kwargs):
+            with tramo(nombre):
+                return funcion(*args, **kwargs)
+        return envoltura
+    return decorador
@@ -0,0 +1,84 @@
+"""Solución analítica de Y' = A·Y por diagonalización: Y(t) = P·e^(D·t)·P⁻¹·Y(0)."""
+import numpy as np
+
+from calcucho.core import simbolico
+from calcucho.core.progreso import Avance
+
+
+def _redondear(v):
+    """Redondea a 4 decimales; descarta partes imaginarias residuales del cálculo."""
+    z = complex(v)
+    if abs(z.imag) < 1e-9:
+        return round(z.real, 4)
+    from sympy import sympify
+    return round(sympify(z), 4)
+
+
+def _diagonalizar(A_list):
+    from sympy import Matrix
+
+    try:
+        return Matrix(A_list).diagonalize()
+    except Exception:
+        raise ValueError("La matriz A no se puede diagonalizar.")
+
+
+def diagonalizar(A_list, tiempo=None, progreso=None):
+    """Devuelve (P, D) de sympy para la matriz numérica A_list.
+
+    La diagonalización corre en el motor simbólico; si supera el tiempo límite
+    se lanza ``TiempoAgotado``."""
+    return simbolico.ejecutar(_diagonalizar, A_list, tiempo=tiempo, progreso=progreso,
+                              descripcion="La diagonalización")
+
+
+def diagonalizar_numerico(A_list):
+    """Devuelve (P, d) de NumPy: vectores propios en columnas y valores propios."""
+    d, P = np.linalg.eig(np.array(A_list, dtype=float))
+    return P, d
+
+
+def resolver(A_list, Y0_list, h, n_iter, tiempo=None, progreso=None):
+    """Calcula valores y vectores propios y la solución en t = 0, h, ..., n_iter·h.
+
+    Devuelve un diccionario con ``valores`` (lista), ``vectores`` (lista de listas),
+    ``resultados`` (filas [t, y1, ..., yn]) y ``numerico``: verdadero si la
+    diagonalización simbólica superó el tiempo límite y se usó la de NumPy."""
+    if h <= 0:
+        raise ValueError("El incremento Δt debe ser un número positivo.")
+
+    try:
+        P, D = diagonalizar(A_list, tiempo=tiempo, progreso=progreso)
+        vals = list(D.diagonal())
+        vecs = [list(P.col(i)) for i in range(P.cols)]
+        P = np.array(P.evalf(), dtype=complex)
+        d = np.array([complex(v) for v in vals])
+        numerico = False
+    except simbolico.TiempoAgotado:
+        P, d = diagonalizar_numerico(A_list)
+        vals = list(d)
+        vecs = [list(P[:, i]) for i in range(P.shape[1])]
+        numerico = True
+
+    # Con entradas decimales sympy puede devolver una P singular
+    if np.linalg.matrix_rank(P) < len(d):
+        raise ValueError("La matriz A no se puede diagonalizar.")
+
+    # P⁻¹·Y(0) no depende de t: se calcula una sola vez
+    c = np.linalg.solve(P, np.array(Y0_list, dtype=complex))
+
+    avance = Avance(progreso, n_iter + 1)
+    resultados = []
+    for k in range(n_iter + 1):
+        avance(k)
+        t_val = round(k * h, 3)
+        Yt = P @ (np.exp(d * t_val) * c)
+        resultados.append([t_val] + [_redondear(y) for y in Yt])
+
+    avance.terminar()
+    return {
+        "valores": [_redondear(v) for v in vals],
+        "vectores": [[_redondear(v) for v in vec] for vec in vecs],
+        "resultados": resultados,
+        "numerico": numerico,
+    }
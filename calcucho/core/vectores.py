@@ -0,0 +1,58 @@
+import numpy as np
+
+
+class VectorMayor:
+    @staticmethod
+    def suma(v1, v2): return np.add(v1, v2)
+    @staticmethod
+    def resta(v1, v2): return np.subtract(v1, v2)
+    @staticmethod
+    def magnitud(v): return np.linalg.norm(v)
+    @staticmethod
+    def producto_punto(v1, v2): return np.dot(v1, v2)
+    @staticmethod
+    def producto_cruzado(v1, v2): return np.cross(v1, v2)
+
+
+NECESITAN_DOS = ("suma", "resta", "punto", "cruzado")
+
+
+def leer_vector(texto):
+    """Convierte "1, 2, 3" en un arreglo de NumPy."""
+    texto = texto.strip()
+    if not texto:
+        raise ValueError("No puede dejar el campo vacío.")
+    if ",," in texto or texto.endswith(",") or texto.startswith(","):
+        raise ValueError("Formato inválido: no uses comas duplicadas o al inicio/final.")
+    try:
+        return np.array([float(x.strip()) for x in texto.split(",") if x.strip()])
+    except ValueError:
+        raise ValueError("Solo se permiten números separados por comas.")
+
+
+def validar_dimensiones(operacion, v1, v2):
+    # Validar longitud igual (excepto para producto cruzado)
+    if operacion != "cruzado" and len(v1) != len(v2):
+        raise ValueError("Los vectores deben tener la misma longitud.")
+    # Validar que los vectores para cruzado sean 3D
+    if operacion == "cruzado" and (len(v1) != 3 or len(v2) != 3):
+        raise ValueError("El producto cruzado solo aplica a vectores 3D.")
+
+
+def operar(operacion, v1, v2=None):
+    if operacion in NECESITAN_DOS:
+        if v2 is None:
+            raise ValueError("Esta operación necesita dos vectores.")
+        validar_dimensiones(operacion, v1, v2)
+
+    if operacion == "suma":
+        return VectorMayor.suma(v1, v2)
+    if operacion == "resta":
+        return VectorMayor.resta(v1, v2)
+    if operacion == "magnitud":
+        return round(VectorMayor.magnitud(v1), 3)
+    if operacion == "punto":
+        return VectorMayor.producto_punto(v1, v2)
+    if operacion == "cruzado":
+        return VectorMayor.producto_cruzado(v1, v2)
+    raise ValueError("Operación no válida.")
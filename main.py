@@ -1,12 +1,39 @@
+import multiprocessing
 import sys
-from PyQt5.QtWidgets import QApplication, QMessageBox
-from ui.main_window import MainWindow
+
+from ui.perfil import iniciar_perfil, ruta_solicitada
 
 if __name__ == "__main__":
+    # Necesario para los procesos del motor simbólico en el ejecutable de PyInstaller
+    multiprocessing.freeze_support()
+    ruta_perfil = ruta_solicitada(sys.argv)
+    perfil = iniciar_perfil(ruta_perfil) if ruta_perfil else None
+
+    from PyQt5.QtWidgets import QApplication, QMessageBox
+    if perfil:
+        perfil.marcar("pyqt_importado")
+
     try:
         app = QApplication(sys.argv)
+        if perfil:
+            perfil.marcar("qapplication_creada")
+        from ui.main_window import MainWindow, ruta_recurso
+        from ui.arranque import Precarga, mostrar_splash
+        splash = mostrar_splash(ruta_recurso("img/splash.png"))
+        app.processEvents()
         window = MainWindow()
+        if perfil:
+            perfil.marcar("mainwindow_creada")
+            perfil.observar_ventana(window, salir="--perfil-salir" in sys.argv)
         window.show()
+        # finish() espera el primer pintado en un bucle propio: con el perfil activo
+        # el informe se completaría allí, antes de exec_(), y la salida se perdería
+        if perfil:
+            splash.close()
+        else:
+            splash.finish(window)
+            # Con el perfil activo, el propio perfil construye los módulos restantes
+            Precarga(window, window.orden_precarga()).iniciar()
         sys.exit(app.exec_())
     except Exception as e:
-        QMessageBox.critical(None, "Error crítico", f"Ocurrió un error inesperado:\n{str(e)}")
\ No newline at end of file
+        QMessageBox.critical(None, "Error crítico", f"Ocurrió un error inesperado:\n{str(e)}")
@@ -1,12 +1,17 @@
 # -*- mode: python ; coding: utf-8 -*-
 
+import os
+
+# Los módulos del menú se importan bajo demanda (importlib), PyInstaller no los detecta solo
+modulos_menu = ['modulos.' + os.path.splitext(f)[0] for f in os.listdir('modulos') if f.endswith('.py')]
+splash_png = os.path.join('img', 'splash.png')
 
 a = Analysis(
     ['main.py'],
     pathex=[],
     binaries=[],
-    datas=[],
-    hiddenimports=[],
+    datas=[(splash_png, 'img')],
+    hiddenimports=modulos_menu,
     hookspath=[],
     hooksconfig={},
     runtime_hooks=[],
@@ -16,9 +21,22 @@ a = Analysis(
 )
 pyz = PYZ(a.pure)
 
+# Pantalla del cargador mientras se descomprime el ejecutable (main.py la cierra)
+splash = Splash(
+    splash_png,
+    binaries=a.binaries,
+    datas=a.datas,
+    text_pos=(12, 245),
+    text_size=9,
+    minify_script=True,
+    always_on_top=True,
+)
+
 exe = EXE(
     pyz,
     a.scripts,
+    splash,
+    splash.binaries,
     a.binaries,
     a.datas,
     [],
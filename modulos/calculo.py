@@ -1,17 +1,21 @@
 from PyQt5.QtWidgets import (
     QWidget, QLabel, QVBoxLayout, QHBoxLayout, QPushButton,
-    QLineEdit, QMessageBox, QGroupBox
+    QLineEdit, QMessageBox, QGroupBox, QSpinBox
 )
 from PyQt5.QtCore import Qt, QRegExp
-from PyQt5.QtGui import QRegExpValidator, QPixmap
-from sympy import sympify, symbols, diff, integrate, latex
-import re
-import matplotlib.pyplot as plt
-import os
+from PyQt5.QtGui import QRegExpValidator
+
+from calcucho.core import traza
+from calcucho.core import calculo as nucleo
+from calcucho.core import simbolico
+from ui import latex
+from ui.trabajos import ejecutor
 
 class DerivacionIntegracionModule(QWidget):
     def __init__(self):
         super().__init__()
+        # El proceso de sympy arranca mientras el usuario escribe
+        simbolico.precalentar()
         self.setLayout(QVBoxLayout())
         self.operacion_actual = None
         self.botones = {}
@@ -45,18 +49,46 @@ class DerivacionIntegracionModule(QWidget):
         self.funcion_input.setFixedWidth(250)
 
         self.variable_input = QLineEdit()
-        self.variable_input.setPlaceholderText("Variable (ej: x)")
-        self.variable_input.setFixedWidth(100)
+        self.variable_input.setPlaceholderText("Variables (ej: x o x, y)")
+        self.variable_input.setFixedWidth(150)
+
+        # Orden de la derivada con una sola variable (con varias, se repiten: x, y, y)
+        self.orden_spin = QSpinBox()
+        self.orden_spin.setRange(1, 20)
+        self.orden_spin.setFixedWidth(60)
 
         val_func = QRegExpValidator(QRegExp(r"[0-9a-zA-Z+\-*/^(). ]+"))
-        val_var = QRegExpValidator(QRegExp(r"[a-zA-Z]"))
+        val_var = QRegExpValidator(QRegExp(r"[a-zA-Z](\s*,\s*[a-zA-Z])*"))
         self.funcion_input.setValidator(val_func)
         self.variable_input.setValidator(val_var)
 
+        # Límites de la integral definida (admiten pi, E, oo y -oo)
+        self.limite_a_input = QLineEdit()
+        self.limite_a_input.setPlaceholderText("a (ej: 0)")
+        self.limite_b_input = QLineEdit()
+        self.limite_b_input.setPlaceholderText("b (ej: pi, oo)")
+        val_limite = QRegExpValidator(QRegExp(r"[0-9a-zA-Z+\-*/^(). ∞]+"))
+        limites_layout = QHBoxLayout()
+        for campo in (self.limite_a_input, self.limite_b_input):
+            campo.setFixedWidth(100)
+            campo.setValidator(val_limite)
+        limites_layout.addWidget(QLabel("de"))
+        limites_layout.addWidget(self.limite_a_input)
+        limites_layout.addWidget(QLabel("a"))
+        limites_layout.addWidget(self.limite_b_input)
+        limites_layout.addStretch()
+
         entrada_layout.addWidget(QLabel("<b>Función:</b>"))
         entrada_layout.addWidget(self.funcion_input)
-        entrada_layout.addWidget(QLabel("<b>Variable:</b>"))
-        entrada_layout.addWidget(self.variable_input)
+        entrada_layout.addWidget(QLabel("<b>Variables:</b>"))
+        variable_layout = QHBoxLayout()
+        variable_layout.addWidget(self.variable_input)
+        variable_layout.addWidget(QLabel("Orden:"))
+        variable_layout.addWidget(self.orden_spin)
+        variable_layout.addStretch()
+        entrada_layout.addLayout(variable_layout)
+        entrada_layout.addWidget(QLabel("<b>Límites (sólo integral definida):</b>"))
+        entrada_layout.addLayout(limites_layout)
         entrada_group.setLayout(entrada_layout)
         self.layout().addWidget(entrada_group)
 
@@ -64,7 +96,8 @@ class DerivacionIntegracionModule(QWidget):
         operaciones_group = QGroupBox("⚙️ Operación")
         oper_layout = QHBoxLayout()
 
-        for nombre, clave in [("Derivar", "derivar"), ("Integrar", "integrar")]:
+        for nombre, clave in [("Derivar", "derivar"), ("Integrar", "integrar"), ("Integral definida", "definida"),
+                              ("Gradiente", "gradiente"), ("Hessiana", "hessiana")]:
             btn = QPushButton(nombre)
             btn.clicked.connect(lambda _, op=clave: self.set_operacion(op))
             self.botones[clave] = btn
@@ -100,6 +133,7 @@ class DerivacionIntegracionModule(QWidget):
         self.resultado_label = QLabel()
         self.resultado_label.setAlignment(Qt.AlignCenter)
         self.resultado_label.setFixedHeight(130)  # más altura
+        self.resultado_label.setMinimumWidth(1)  # un resultado largo se reduce en vez de ensanchar la ventana
         resultado_layout.addWidget(self.resultado_label)
         resultado_group.setLayout(resultado_layout)
         self.layout().addWidget(resultado_group)
@@ -110,6 +144,7 @@ class DerivacionIntegracionModule(QWidget):
             color = "#ffeb99" if clave == operacion else "#aacfcf"
             btn.setStyleSheet(f"background-color: {color}; font-weight: bold;")
 
+    @traza.operacion("Derivación e integración")
     def ejecutar(self):
         funcion_texto = self.funcion_input.text().strip()
         variable_texto = self.variable_input.text().strip()
@@ -119,43 +154,66 @@ class DerivacionIntegracionModule(QWidget):
             return
 
         try:
-            funcion_texto = funcion_texto.replace("^", "**")
-            funcion_texto = re.sub(r'(?<=\d)(?=[a-zA-Z(])', '*', funcion_texto)
-            funcion_texto = re.sub(r'(?<=\))(?=[a-zA-Z(])', '*', funcion_texto)
-            funcion = sympify(funcion_texto)
-            variable = symbols(variable_texto)
-        except Exception as e:
-            QMessageBox.critical(self, "Error", f"Error al interpretar la función o variable:\n{e}")
+            funcion, variables = nucleo.parsear_variables(funcion_texto, variable_texto)
+        except ValueError as e:
+            QMessageBox.critical(self, "Error", str(e))
+            return
+
+        if self.operacion_actual == "derivar" and len(variables) > 1:
+            self.enviar("Derivada parcial", nucleo.derivada_parcial, funcion, variables)
+            return
+        if self.operacion_actual in nucleo.DIFERENCIALES:
+            self.enviar(self.operacion_actual.capitalize(), nucleo.DIFERENCIALES[self.operacion_actual],
+                        funcion, variables)
+            return
+        if self.operacion_actual is not None and len(variables) > 1:
+            QMessageBox.critical(self, "Error", "La integral admite una sola variable.")
+            return
+        variable = variables[0]
+
+        if self.operacion_actual == "definida":
+            try:
+                a = nucleo.parsear_limite(self.limite_a_input.text())
+                b = nucleo.parsear_limite(self.limite_b_input.text())
+            except ValueError as e:
+                QMessageBox.critical(self, "Error", str(e))
+                return
+            # Primero se intenta el valor exacto con poco tiempo; luego, la cuadratura numérica
+            self.enviar("Integral definida", nucleo.integrar_definida, funcion, variable, a, b,
+                        al_terminar=lambda resultado: self.mostrar_resultado((resultado["valor"], resultado["latex"])))
             return
 
+        if self.operacion_actual == "derivar":
+            self.enviar("Derivación", nucleo.derivar, funcion, variable, orden=self.orden_spin.value())
+        elif self.operacion_actual == "integrar":
+            self.enviar("Integración", nucleo.integrar, funcion, variable)
+        else:
+            QMessageBox.critical(self, "Error", "Selecciona una operación.")
+
+    def enviar(self, descripcion, funcion, *args, al_terminar=None, **kwargs):
+        """sympy puede tardar con integrales difíciles: el cálculo va en segundo plano."""
+        ejecutor().enviar(
+            descripcion, funcion, *args,
+            al_terminar=al_terminar or self.mostrar_resultado,
+            padre=self,
+            boton=self.boton_ejecutar,
+            **kwargs,
+        )
+
+    @traza.medir("dibujo")
+    def mostrar_resultado(self, resultado):
+        _, latex_code = resultado
         try:
-            if self.operacion_actual == "derivar":
-                resultado = diff(funcion, variable)
-            elif self.operacion_actual == "integrar":
-                resultado = integrate(funcion, variable)
-                latex_code = latex(resultado) +  r" + C"
-            else:
-                raise ValueError("Selecciona una operación.")
-            
-            if self.operacion_actual == "derivar":
-                latex_code = latex(resultado)
-
-            # Convertir a LaTeX y mostrar como imagen
-            fig, ax = plt.subplots(figsize=(9, 2.3))  # más grande
-            ax.text(0.5, 0.5, f"${latex_code}$", fontsize=30, ha='center', va='center')
-            ax.axis('off')
-            fig.tight_layout()
-
-            ruta = "resultado.png"
-            fig.savefig(ruta, dpi=100)
-            plt.close(fig)
-
-            self.resultado_label.setPixmap(QPixmap(ruta).scaledToHeight(150))
-
-        except Exception as e:
+            # Se dibuja en memoria; repetir un resultado reutiliza la imagen
+            self.resultado_label.setPixmap(latex.pixmap(
+                latex_code, altura=self.resultado_label.height(), ancho=self.resultado_label.width()))
+        except ValueError as e:
             QMessageBox.critical(self, "Error", str(e))
 
     def limpiar(self):
         self.funcion_input.clear()
         self.variable_input.clear()
+        self.orden_spin.setValue(1)
+        self.limite_a_input.clear()
+        self.limite_b_input.clear()
         self.resultado_label.clear()
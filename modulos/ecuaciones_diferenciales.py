@@ -7,16 +7,15 @@ from PyQt5.QtCore import Qt
 from PyQt5.QtGui import QFont, QColor, QDoubleValidator
 from matplotlib.backends.backend_qt5agg import FigureCanvasQTAgg as FigureCanvas
 from matplotlib.figure import Figure
-from sympy import  symbols, sympify, diff
-from sympy.core.sympify import SympifyError  
-import numpy as np
-import re 
+
+from calcucho.core import traza
+from calcucho.core import edo as nucleo
+from ui.trabajos import ejecutor
 
 class EcuacionesDiferencialesModule(QWidget):
     def __init__(self):
         super().__init__()
         self.setLayout(QVBoxLayout())
-        self.x, self.y = symbols('x y')
 
         self.setStyleSheet("""
             QWidget {
@@ -105,7 +104,7 @@ class EcuacionesDiferencialesModule(QWidget):
         self.xf_input.setMaximumWidth(100)
 
         self.metodo_box = QComboBox()
-        self.metodo_box.addItems(["Euler", "Heun", "Runge-Kutta 4", "Taylor orden 2"])
+        self.metodo_box.addItems(nucleo.METODOS)
         self.metodo_box.setMaximumWidth(180)
 
         form_layout.addRow("Ecuación dy/dx =", self.ecuacion_input)
@@ -168,45 +167,9 @@ class EcuacionesDiferencialesModule(QWidget):
 
         self.layout().addWidget(splitter)
 
+    @traza.operacion("Ecuación diferencial")
     def ejecutar(self):
         try:
-            expr_str = self.ecuacion_input.text().replace("^", "**").strip()
-
-            # Validación: caracteres no permitidos
-            caracteres_invalidos = r"[;:!¿?@#\$&_=~`%ºª|\\]"
-            if re.search(caracteres_invalidos, expr_str):
-                QMessageBox.critical(self, "Error de sintaxis", "La ecuación contiene símbolos inválidos como %, ;, !, etc.")
-                return
-
-            # Validación: división entera //
-            if '//' in expr_str:
-                QMessageBox.critical(self, "Error de sintaxis", "La operación '//' no está permitida. Usa '/' para dividir.")
-                return
-
-            try:
-                f_expr = sympify(expr_str)
-            except (SympifyError, SyntaxError):
-                QMessageBox.critical(self, "Error", "La ecuación ingresada no es válida. Revisa que esté bien escrita.")
-                return
-            # Validación de caracteres inválidos
-            if not expr_str or expr_str[-1] in "+-*/^." or expr_str in "+-*/^.":
-                raise ValueError("La expresión está vacía o incompleta.")
-
-            if any(c in expr_str for c in ";:!¿?@#\$&_=~`ºª[]{}"):
-                raise ValueError("La expresión contiene caracteres no válidos.")
-
-            funciones_permitidas = {
-                "sin", "cos", "tan", "exp", "log", "sqrt", "abs",
-                "asin", "acos", "atan", "sinh", "cosh", "tanh"
-            }
-            tokens = re.findall(r"[a-zA-Z_]+", expr_str)
-            for token in tokens:
-                if token not in funciones_permitidas and token not in ['x', 'y']:
-                    raise ValueError(f"La función '{token}' no está permitida.")
-
-            f_expr = sympify(expr_str)
-            f = lambda x, y: float(f_expr.subs({self.x: x, self.y: y}))
-
             # Validación: campos vacíos
             if not self.ecuacion_input.text().strip() or not self.x0_input.text().strip() or not self.y0_input.text().strip() or not self.h_input.text().strip() or not self.xf_input.text().strip():
                 QMessageBox.critical(self, "Error", "Por favor, llena todos los campos antes de calcular.")
@@ -227,86 +190,60 @@ class EcuacionesDiferencialesModule(QWidget):
 
             try:
                 h = float(self.h_input.text())
-                if h <= 0:
-                    raise ValueError
             except ValueError:
                 QMessageBox.critical(self, "Error", "El paso h debe ser un número positivo y mayor que cero.")
                 return
 
             try:
                 xf = float(self.xf_input.text())
-                if xf <= x0:
-                    QMessageBox.critical(self, "Error", "El valor de x final debe ser mayor que x₀.")
-                    return
             except ValueError:
                 QMessageBox.critical(self, "Error", "El valor de x final debe ser un número válido.")
                 return
 
+            # Los errores de validación se muestran antes de lanzar el cálculo
+            ecuacion = nucleo.validar_ecuacion(self.ecuacion_input.text())
+            nucleo.validar_parametros(x0, h, xf)
 
-            if h <= 0:
-                raise ValueError("El paso h debe ser mayor que cero.")
-            if x0 >= xf:
-                raise ValueError("x₀ debe ser menor que x final.")
-
-            pasos = int(np.ceil((xf - x0) / h))
-
-            xs = [x0]
-            ys = [y0]
-            fs = [round(f(x0, y0), 5)]
-
-            for _ in range(pasos):
-                xi = xs[-1]
-                yi = ys[-1]
-                metodo = self.metodo_box.currentText()
-
-                if metodo == "Euler":
-                    yi1 = yi + h * f(xi, yi)
-                elif metodo == "Heun":
-                    k1 = f(xi, yi)
-                    k2 = f(xi + h, yi + h * k1)
-                    yi1 = yi + (h / 2) * (k1 + k2)
-                elif metodo == "Runge-Kutta 4":
-                    k1 = f(xi, yi)
-                    k2 = f(xi + h / 2, yi + h * k1 / 2)
-                    k3 = f(xi + h / 2, yi + h * k2 / 2)
-                    k4 = f(xi + h, yi + h * k3)
-                    yi1 = yi + (h / 6) * (k1 + 2 * k2 + 2 * k3 + k4)
-                elif metodo == "Taylor orden 2":
-                    f1 = f(xi, yi)
-                    dfx = float(diff(f_expr, self.x).subs({self.x: xi, self.y: yi}))
-                    dfy = float(diff(f_expr, self.y).subs({self.x: xi, self.y: yi}))
-                    yi1 = yi + h * f1 + (h**2 / 2) * (dfx + dfy * f1)
-                else:
-                    raise ValueError("Método no soportado.")
-
-                xi1 = xi + h
-                xs.append(round(xi1, 5))
-                ys.append(round(yi1, 5))
-                fs.append(round(f(xi1, yi1), 5))
-
-            self.tabla.setRowCount(len(xs))
-            for i in range(len(xs)):
-                self.tabla.setItem(i, 0, QTableWidgetItem(str(xs[i])))
-                self.tabla.setItem(i, 1, QTableWidgetItem(str(ys[i])))
-                item_fxy = QTableWidgetItem(str(fs[i]))
-                item_fxy.setForeground(QColor("#004080"))
-                font = item_fxy.font()
-                font.setBold(True)
-                item_fxy.setFont(font)
-                self.tabla.setItem(i, 2, item_fxy)
-
-            self.figura.clear()
-            ax = self.figura.add_subplot(111)
-            ax.plot(xs, ys, marker='o', color='royalblue')
-            ax.set_title("Solución Aproximada")
-            ax.set_xlabel("x")
-            ax.set_ylabel("y")
-            ax.grid(True)
-            self.canvas.draw()
+            ejecutor().enviar(
+                "Ecuación diferencial",
+                nucleo.resolver, ecuacion, x0, y0, h, xf, self.metodo_box.currentText(),
+                al_terminar=self.mostrar_resultado,
+                padre=self,
+                boton=self.boton_calcular,
+            )
 
         except Exception as e:
             QMessageBox.critical(self, "Error", f"{str(e)}")
 
+    def mostrar_resultado(self, solucion):
+        xs, ys, fs = solucion
+        self.llenar_tabla(xs, ys, fs)
+        self.graficar(xs, ys)
+
+    @traza.medir("tabla")
+    def llenar_tabla(self, xs, ys, fs):
+        self.tabla.setRowCount(len(xs))
+        for i in range(len(xs)):
+            self.tabla.setItem(i, 0, QTableWidgetItem(str(xs[i])))
+            self.tabla.setItem(i, 1, QTableWidgetItem(str(ys[i])))
+            item_fxy = QTableWidgetItem(str(fs[i]))
+            item_fxy.setForeground(QColor("#004080"))
+            font = item_fxy.font()
+            font.setBold(True)
+            item_fxy.setFont(font)
+            self.tabla.setItem(i, 2, item_fxy)
+
+    @traza.medir("dibujo")
+    def graficar(self, xs, ys):
+        self.figura.clear()
+        ax = self.figura.add_subplot(111)
+        ax.plot(xs, ys, marker='o', color='royalblue')
+        ax.set_title("Solución Aproximada")
+        ax.set_xlabel("x")
+        ax.set_ylabel("y")
+        ax.grid(True)
+        self.canvas.draw()
+
     def limpiar(self):
         self.ecuacion_input.clear()
         self.x0_input.clear()
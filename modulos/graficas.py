@@ -7,7 +7,10 @@ from matplotlib.backends.backend_qt5agg import FigureCanvasQTAgg as FigureCanvas
 from matplotlib.figure import Figure
 import numpy as np
 import re
-from sympy import symbols, lambdify, sympify
+
+from calcucho.core import traza
+from calcucho.core import graficas as nucleo
+from ui.trabajos import ejecutor
 
 
 class GraficasModule(QWidget):
@@ -141,6 +144,7 @@ class GraficasModule(QWidget):
         self.boton_2d.setStyleSheet(self.boton_2d.styleSheet() + "background-color: #e0d4fc;")
         self.graficar_plano_vacio()
 
+    @traza.operacion("Gráfica")
     def graficar(self):
         expr_str = self.funcion_input.text().strip().replace("^", "**")
         xmin_str = self.xmin_input.text().strip()
@@ -177,29 +181,13 @@ class GraficasModule(QWidget):
             return
 
         if self.modo_actual == "2D":
-            x = symbols("x")
-            try:
-                f = lambdify(x, sympify(expr_str), modules=["numpy"])
-            except Exception as e:
-                QMessageBox.critical(self, "Error", f"No se pudo interpretar la función:\n{e}")
-                return
-
-            x_vals = np.linspace(xmin, xmax, 400)
-            try:
-                y_vals = f(x_vals)
-            except:
-                QMessageBox.critical(self, "Error", "No se pudo evaluar la función.")
-                return
-
-            self.figura.clear()
-            ax = self.figura.add_subplot(111)
-            ax.plot(x_vals, y_vals, label=f"f(x) = {expr_str}")
-            ax.set_title("Gráfica 2D")
-            ax.set_xlabel("x")
-            ax.set_ylabel("f(x)")
-            ax.grid(True)
-            ax.legend()
-            self.canvas.draw()
+            ejecutor().enviar(
+                "Gráfica 2D",
+                nucleo.evaluar_2d, expr_str, xmin, xmax,
+                al_terminar=lambda datos: self.dibujar_2d(expr_str, *datos),
+                al_fallar=self.error_evaluacion,
+                boton=self.boton_graficar,
+            )
 
         elif self.modo_actual == "3D":
             try:
@@ -211,31 +199,39 @@ class GraficasModule(QWidget):
                 QMessageBox.warning(self, "Error", "Rango Y inválido.")
                 return
 
-            x, y = symbols("x y")
-            try:
-                f = lambdify((x, y), sympify(expr_str), modules=["numpy"])
-            except Exception as e:
-                QMessageBox.critical(self, "Error", f"No se pudo interpretar la función:\n{e}")
-                return
+            ejecutor().enviar(
+                "Gráfica 3D",
+                nucleo.evaluar_3d, expr_str, xmin, xmax, ymin, ymax,
+                al_terminar=lambda datos: self.dibujar_3d(*datos),
+                al_fallar=self.error_evaluacion,
+                boton=self.boton_graficar,
+            )
 
-            x_vals = np.linspace(xmin, xmax, 100)
-            y_vals = np.linspace(ymin, ymax, 100)
-            X, Y = np.meshgrid(x_vals, y_vals)
+    def error_evaluacion(self, e):
+        QMessageBox.critical(self, "Error", f"No se pudo evaluar la función:\n{e}")
 
-            try:
-                Z = f(X, Y)
-            except:
-                QMessageBox.critical(self, "Error", "No se pudo evaluar la función.")
-                return
+    @traza.medir("dibujo")
+    def dibujar_2d(self, expr_str, x_vals, y_vals):
+        self.figura.clear()
+        ax = self.figura.add_subplot(111)
+        ax.plot(x_vals, y_vals, label=f"f(x) = {expr_str}")
+        ax.set_title("Gráfica 2D")
+        ax.set_xlabel("x")
+        ax.set_ylabel("f(x)")
+        ax.grid(True)
+        ax.legend()
+        self.canvas.draw()
 
-            self.figura.clear()
-            ax = self.figura.add_subplot(111, projection="3d")
-            ax.plot_surface(X, Y, Z, cmap="viridis")
-            ax.set_title("Gráfica 3D")
-            ax.set_xlabel("x")
-            ax.set_ylabel("y")
-            ax.set_zlabel("f(x, y)")
-            self.canvas.draw()
+    @traza.medir("dibujo")
+    def dibujar_3d(self, X, Y, Z):
+        self.figura.clear()
+        ax = self.figura.add_subplot(111, projection="3d")
+        ax.plot_surface(X, Y, Z, cmap="viridis")
+        ax.set_title("Gráfica 3D")
+        ax.set_xlabel("x")
+        ax.set_ylabel("y")
+        ax.set_zlabel("f(x, y)")
+        self.canvas.draw()
 
     def graficar_plano_vacio(self):
         self.figura.clear()
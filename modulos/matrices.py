@@ -6,10 +6,12 @@ from PyQt5.QtWidgets import (
 from PyQt5.QtCore import QRegExp
 from PyQt5.QtCore import Qt
 from PyQt5.QtGui import QRegExpValidator, QColor
-from sympy import sympify, Matrix
-import numpy as np
 import re
 
+from calcucho.core import traza
+from calcucho.core import matrices as nucleo
+from ui.trabajos import ejecutor
+
 # --- Clase para limitar lo que el usuario puede escribir en las celdas ---
 class CeldaValidadora(QStyledItemDelegate):
     def createEditor(self, parent, option, index):
@@ -23,23 +25,6 @@ class CeldaValidadora(QStyledItemDelegate):
         editor.setValidator(validator)
         return editor
 
-
-
-# --- Lógica de operaciones con matrices usando sympy ---
-class MatrizMayor:
-    @staticmethod
-    def sumar(A, B): return A + B
-    @staticmethod
-    def restar(A, B): return A - B
-    @staticmethod
-    def multiplicar(A, B): return A * B
-    @staticmethod
-    def determinante(A): return A.det()
-    @staticmethod
-    def inversa(A): return A.inv()
-    @staticmethod
-    def resolver_sistema(A, b): return A.LUsolve(b)
-
 # --- Interfaz gráfica del módulo de matrices ---
 class MatricesModule(QWidget):
     def __init__(self):
@@ -343,32 +328,14 @@ class MatricesModule(QWidget):
 
 
     def leer_tabla(self, tabla):
-        filas, columnas = tabla.rowCount(), tabla.columnCount()
-        matriz = []
-
-        for i in range(filas):
+        filas = []
+        for i in range(tabla.rowCount()):
             fila = []
-            for j in range(columnas):
+            for j in range(tabla.columnCount()):
                 item = tabla.item(i, j)
-                texto = item.text().strip() if item and item.text().strip() else "0"
-
-                # Completa expresiones decimales incompletas como ".9" -> "0.9", "6." -> "6.0"
-                if re.match(r"^\.\d+$", texto):
-                    texto = "0" + texto
-                elif re.match(r"^\d+\.$", texto):
-                    texto = texto + "0"
-
-                # Insertar * implícito entre número y letra, por ejemplo 2a -> 2*a
-                texto = re.sub(r'(?<=[0-9])(?=[a-zA-Z])', '*', texto)
-
-                try:
-                    valor = sympify(texto)
-                except Exception as e:
-                    raise ValueError(f"Error al interpretar '{texto}': {e}")
-                fila.append(valor)
-            matriz.append(fila)
-
-        return Matrix(matriz)
+                fila.append(item.text() if item else "")
+            filas.append(fila)
+        return nucleo.leer_matriz(filas)
 
     def limpiar_celdas(self):
         for tabla in [self.tabla_A, self.tabla_B, self.tabla_b]:
@@ -407,92 +374,50 @@ class MatricesModule(QWidget):
             return
 
         try:
+            from sympy import sympify
             sympify(texto)
             item.setBackground(QColor("white"))
         except:
             item.setBackground(QColor("red"))
 
+    @traza.operacion("Matrices")
     def ejecutar_operacion(self):
         if not self.operacion_actual:
             QMessageBox.warning(self, "Operación no seleccionada", "Debes seleccionar una operación antes de ejecutar.")
             return
         try:
-            if self.operacion_actual == "suma":
-                resultado = self.resolver_suma()
-            elif self.operacion_actual == "resta":
-                resultado = self.resolver_resta()
-            elif self.operacion_actual == "multiplicacion":
-                resultado = self.resolver_multiplicacion()
-            elif self.operacion_actual == "determinante":
-                resultado = self.resolver_determinante()
-            elif self.operacion_actual == "inversa":
-                resultado = self.resolver_inversa()
-            elif self.operacion_actual == "sistema":
-                resultado = self.resolver_sistema()
-            else:
+            if self.operacion_actual not in nucleo.OPERACIONES:
                 raise ValueError("Operación no válida.")
-
-            if hasattr(resultado, 'shape'):
-                filas = resultado.shape[0]
-                columnas = resultado.shape[1] if len(resultado.shape) > 1 else 1
-                texto = "<b>Resultado:</b><br><table style='border:1px solid #ccc; border-collapse: collapse;'>"
-                for i in range(filas):
-                    texto += "<tr>"
-                    for j in range(columnas):
-                        val = resultado[i, j] if columnas > 1 else resultado[i]
-                        if hasattr(val, 'free_symbols') and len(val.free_symbols) == 0:
-                            val = val.evalf()
-                            val = int(val) if val == int(val) else float(val)
-                        texto += f"<td style='border:1px solid #ccc; padding:4px 8px;'>{val}</td>"
-
-                    texto += "</tr>"
-                texto += "</table>"
-                self.resultado_label.setText(texto)
-            else:
-                self.resultado_label.setText(f"<b>Resultado:</b><br>{resultado}")
+            # Las tablas se leen aquí; el cálculo con sympy va en segundo plano
+            tablas = {"A": self.tabla_A, "B": self.tabla_B, "b": self.tabla_b}
+            _, operandos = nucleo.OPERACIONES[self.operacion_actual]
+            matrices = {nombre: self.leer_tabla(tablas[nombre]) for nombre in operandos}
+            ejecutor().enviar(
+                "Matrices",
+                nucleo.operar, self.operacion_actual,
+                al_terminar=self.mostrar_resultado,
+                padre=self,
+                boton=self.ejecutar_btn,
+                **matrices,
+            )
         except Exception as e:
             QMessageBox.critical(self, "Error", str(e))
 
-    def resolver_suma(self):
-        A = self.leer_tabla(self.tabla_A)
-        B = self.leer_tabla(self.tabla_B)
-        if A.shape != B.shape:
-            raise ValueError("Las matrices A y B deben tener el mismo tamaño.")
-        return MatrizMayor.sumar(A, B)
-
-    def resolver_resta(self):
-        A = self.leer_tabla(self.tabla_A)
-        B = self.leer_tabla(self.tabla_B)
-        if A.shape != B.shape:
-            raise ValueError("Las matrices A y B deben tener el mismo tamaño.")
-        return MatrizMayor.restar(A, B)
-
-    def resolver_multiplicacion(self):
-        A = self.leer_tabla(self.tabla_A)
-        B = self.leer_tabla(self.tabla_B)
-        if A.shape[1] != B.shape[0]:
-            raise ValueError("Las columnas de A deben coincidir con las filas de B para multiplicar.")
-        return MatrizMayor.multiplicar(A, B)
-
-    def resolver_determinante(self):
-        A = self.leer_tabla(self.tabla_A)
-        if A.shape[0] != A.shape[1]:
-            raise ValueError("La matriz debe ser cuadrada para calcular el determinante.")
-        return MatrizMayor.determinante(A)
-
-    def resolver_inversa(self):
-        A = self.leer_tabla(self.tabla_A)
-        if A.shape[0] != A.shape[1]:
-            raise ValueError("La matriz debe ser cuadrada para calcular la inversa.")
-        if A.det() == 0:
-            raise ValueError("La matriz no tiene inversa porque su determinante es 0 (matriz singular).")
-        return MatrizMayor.inversa(A)
-
-    def resolver_sistema(self):
-        A = self.leer_tabla(self.tabla_A)
-        b = self.leer_tabla(self.tabla_b)
-        if A.shape[0] != A.shape[1]:
-            raise ValueError("La matriz A debe ser cuadrada.")
-        if A.shape[0] != b.shape[0] or b.shape[1] != 1:
-            raise ValueError("Las dimensiones de A y b no coinciden.")
-        return MatrizMayor.resolver_sistema(A, b)
+    @traza.medir("tabla")
+    def mostrar_resultado(self, resultado):
+        if hasattr(resultado, 'shape'):
+            filas = resultado.shape[0]
+            columnas = resultado.shape[1] if len(resultado.shape) > 1 else 1
+            texto = "<b>Resultado:</b><br><table style='border:1px solid #ccc; border-collapse: collapse;'>"
+            for i in range(filas):
+                texto += "<tr>"
+                for j in range(columnas):
+                    val = resultado[i, j] if columnas > 1 else resultado[i]
+                    val = nucleo.valor_numerico(val)
+                    texto += f"<td style='border:1px solid #ccc; padding:4px 8px;'>{val}</td>"
+
+                texto += "</tr>"
+            texto += "</table>"
+            self.resultado_label.setText(texto)
+        else:
+            self.resultado_label.setText(f"<b>Resultado:</b><br>{resultado}")
@@ -1,18 +1,33 @@
 from PyQt5.QtWidgets import (
     QWidget, QVBoxLayout, QLabel, QFormLayout, QLineEdit, QPushButton,
-    QMessageBox, QTableWidget, QTableWidgetItem, QComboBox, QHBoxLayout, QSizePolicy, QGroupBox
+    QMessageBox, QTableWidget, QTableWidgetItem, QComboBox, QHBoxLayout, QSizePolicy, QGroupBox, QSpinBox,
+    QCheckBox, QFileDialog
 )
 from PyQt5.QtGui import QDoubleValidator, QIntValidator
 from matplotlib.backends.backend_qt5agg import FigureCanvasQTAgg as FigureCanvas
 from matplotlib.figure import Figure
-from scipy.integrate import solve_ivp
 import numpy as np
 
+from calcucho.core import traza
+from calcucho.core import sir as nucleo
+from calcucho.core import compartimentos
+from calcucho.core import estocastico
+from calcucho.core import reproduccion
+from ui.trabajos import ejecutor
+
+
+# Mapas del barrido: clave del resultado, título y mapa de color
+MAPAS_BARRIDO = [
+    ("pico", "Pico de infectados (personas)", "Reds"),
+    ("dia_pico", "Día del pico", "viridis"),
+    ("tamano_final", "Tamaño final (fracción)", "magma"),
+]
+
 
 class ModeloRt(QWidget):
     def __init__(self):
         super().__init__()
-        self.setWindowTitle("Modelo SIR con Rₜ(t)")
+        self.setWindowTitle("Modelos SIR, SEIR y SEIRD con Rₜ(t)")
         self.setStyleSheet("""
             QWidget {
                 background-color: #eef6f9;
@@ -59,7 +74,7 @@ class ModeloRt(QWidget):
     def init_ui(self):
         main_layout = QVBoxLayout()
 
-        titulo = QLabel("Modelo SIR con número de reproducción efectivo Rₜ(t)")
+        titulo = QLabel("Modelos SIR, SEIR y SEIRD con número de reproducción efectivo Rₜ(t)")
         titulo.setStyleSheet("font-size: 20px; font-weight: bold; margin-bottom: 10px; color: #005073;")
         main_layout.addWidget(titulo)
 
@@ -78,32 +93,181 @@ class ModeloRt(QWidget):
         self.poblacion_input = QLineEdit("10000")
         self.infectados_input = QLineEdit("10")
         self.gamma_input = QLineEdit("0.1")
+        self.sigma_input = QLineEdit(f"{compartimentos.SIGMA:g}")
+        self.mu_input = QLineEdit(f"{compartimentos.MU:g}")
         self.tiempo_input = QLineEdit("160")
 
+        self.modelo_combo = QComboBox()
+        self.modelo_combo.addItems(compartimentos.MODELOS)
+        self.modelo_combo.currentTextChanged.connect(self.actualizar_tasas)
+
         self.beta_tipo = QComboBox()
-        self.beta_tipo.addItems(["Constante", "Variable (senoidal)"])
+        self.beta_tipo.addItems(nucleo.TIPOS_BETA)
+        self.metodo_combo = QComboBox()
+        self.metodo_combo.addItems(nucleo.METODOS)
+        self.metodo_combo.setToolTip("LSODA, Radau y BDF usan la jacobiana analítica; "
+                                     "LSODA suele ser el más rápido en horizontes largos")
+        self.rtol_input = QLineEdit(f"{nucleo.RTOL:g}")
+        self.atol_input = QLineEdit(f"{nucleo.ATOL:g}")
 
         validator = QDoubleValidator(0.0, 1e8, 10)
         int_validator = QIntValidator(1, 1000)
 
         for field in [self.poblacion_input, self.infectados_input]:
             field.setValidator(int_validator)
-        for field in [self.gamma_input]:
+        for field in [self.gamma_input, self.sigma_input, self.mu_input, self.rtol_input, self.atol_input]:
             field.setValidator(validator)
         self.tiempo_input.setValidator(int_validator)
 
+        form_layout.addRow("Modelo:", self.modelo_combo)
         form_layout.addRow("Población total S₀:", self.poblacion_input)
         form_layout.addRow("Infectados iniciales I₀:", self.infectados_input)
         form_layout.addRow("Tasa de recuperación γ:", self.gamma_input)
+        form_layout.addRow("Tasa de incubación σ:", self.sigma_input)
+        form_layout.addRow("Tasa de mortalidad μ:", self.mu_input)
         form_layout.addRow("Días de simulación:", self.tiempo_input)
         form_layout.addRow("Tipo de β(t):", self.beta_tipo)
+        form_layout.addRow("Método de integración:", self.metodo_combo)
+        form_layout.addRow("Tolerancia relativa:", self.rtol_input)
+        form_layout.addRow("Tolerancia absoluta:", self.atol_input)
         form_group.setLayout(form_layout)
 
         formulario_layout.addWidget(form_group)
-
-        boton = QPushButton("Simular")
-        boton.clicked.connect(self.simular)
-        formulario_layout.addWidget(boton)
+        self.actualizar_tasas()
+
+        # Estructura: poblaciones por región y edad, con sus matrices de contactos (archivos CSV)
+        estructura_group = QGroupBox("Estructura por grupos")
+        estructura_layout = QFormLayout()
+        self.tablas = {}
+        self.botones_tabla = {}
+        for clave, texto in [("poblaciones", "Poblaciones (regiones × edades)…"),
+                             ("contactos_edad", "Contactos entre edades…"),
+                             ("movilidad", "Movilidad entre regiones…")]:
+            boton = QPushButton(texto)
+            boton.clicked.connect(lambda _, c=clave: self.cargar_tabla(c))
+            self.botones_tabla[clave] = boton
+            estructura_layout.addRow(boton)
+        self.foco_spin = QSpinBox()
+        self.foco_spin.setSpecialValueText("Todas")
+        self.foco_spin.setRange(0, 0)
+        self.foco_spin.setToolTip("Región donde están los infectados iniciales")
+        self.disperso_check = QCheckBox("Matrices dispersas (muchos grupos)")
+        self.boton_quitar = QPushButton("Quitar estructura")
+        self.boton_quitar.clicked.connect(self.quitar_estructura)
+        self.estructura_label = QLabel("Sin estructura: una sola población.")
+        self.estructura_label.setWordWrap(True)
+        estructura_layout.addRow("Región del foco:", self.foco_spin)
+        estructura_layout.addRow(self.disperso_check)
+        estructura_layout.addRow(self.boton_quitar)
+        estructura_layout.addRow(self.estructura_label)
+        estructura_group.setLayout(estructura_layout)
+        formulario_layout.addWidget(estructura_group)
+
+        self.boton_simular = QPushButton("Simular")
+        self.boton_simular.clicked.connect(self.simular)
+        formulario_layout.addWidget(self.boton_simular)
+        self.integracion_label = QLabel("")
+        self.integracion_label.setStyleSheet("font-size: 12px; color: #555;")
+        formulario_layout.addWidget(self.integracion_label)
+
+        # Barrido: todas las combinaciones de β × γ × I₀ de una vez (usa N, días y tipo de β de arriba)
+        barrido_group = QGroupBox("Barrido de parámetros")
+        barrido_layout = QFormLayout()
+        self.beta_min_input = QLineEdit("0.1")
+        self.beta_max_input = QLineEdit("0.6")
+        self.gamma_min_input = QLineEdit("0.05")
+        self.gamma_max_input = QLineEdit("0.3")
+        for field in [self.beta_min_input, self.beta_max_input, self.gamma_min_input, self.gamma_max_input]:
+            field.setValidator(validator)
+        self.divisiones_spin = QSpinBox()
+        self.divisiones_spin.setRange(2, 400)
+        self.divisiones_spin.setValue(60)
+        self.infectados_barrido_input = QLineEdit("1, 10, 100")
+        self.infectados_barrido_input.setToolTip("Valores de I₀ separados por comas")
+        self.infectados_mapa = QComboBox()
+        self.infectados_mapa.setEnabled(False)
+        self.infectados_mapa.currentIndexChanged.connect(lambda _: self.graficar_barrido())
+
+        barrido_layout.addRow("β mínimo:", self.beta_min_input)
+        barrido_layout.addRow("β máximo:", self.beta_max_input)
+        barrido_layout.addRow("γ mínimo:", self.gamma_min_input)
+        barrido_layout.addRow("γ máximo:", self.gamma_max_input)
+        barrido_layout.addRow("Valores por eje:", self.divisiones_spin)
+        barrido_layout.addRow("Valores de I₀:", self.infectados_barrido_input)
+        barrido_layout.addRow("I₀ del mapa:", self.infectados_mapa)
+        barrido_group.setLayout(barrido_layout)
+        formulario_layout.addWidget(barrido_group)
+
+        self.boton_barrer = QPushButton("Barrer parámetros")
+        self.boton_barrer.clicked.connect(self.barrer)
+        formulario_layout.addWidget(self.boton_barrer)
+
+        # Réplicas estocásticas del SIR (usan N, I₀, γ, días y tipo de β de arriba)
+        estocastico_group = QGroupBox("Réplicas estocásticas")
+        estocastico_layout = QFormLayout()
+        self.metodo_estocastico = QComboBox()
+        self.metodo_estocastico.addItems(estocastico.METODOS)
+        self.metodo_estocastico.currentTextChanged.connect(
+            lambda metodo: self.tau_input.setEnabled(metodo == "Tau-leaping"))
+        self.replicas_spin = QSpinBox()
+        self.replicas_spin.setRange(10, 100_000)
+        self.replicas_spin.setSingleStep(100)
+        self.replicas_spin.setValue(1000)
+        self.tau_input = QLineEdit(f"{estocastico.TAU:g}")
+        self.tau_input.setValidator(validator)
+        self.tau_input.setEnabled(False)
+        self.semilla_input = QLineEdit()
+        self.semilla_input.setValidator(QIntValidator(0, 2_147_483_647))
+        self.semilla_input.setPlaceholderText("Opcional: 42")
+        estocastico_layout.addRow("Método:", self.metodo_estocastico)
+        estocastico_layout.addRow("Réplicas:", self.replicas_spin)
+        estocastico_layout.addRow("Paso τ (días):", self.tau_input)
+        estocastico_layout.addRow("Semilla:", self.semilla_input)
+        estocastico_group.setLayout(estocastico_layout)
+        formulario_layout.addWidget(estocastico_group)
+
+        self.boton_replicas = QPushButton("Simular réplicas")
+        self.boton_replicas.clicked.connect(self.simular_replicas)
+        formulario_layout.addWidget(self.boton_replicas)
+
+        # Rₜ a partir de casos reales (Cori et al.) y pronóstico
+        casos_group = QGroupBox("Rₜ desde datos de casos")
+        casos_layout = QFormLayout()
+        self.boton_importar = QPushButton("Importar casos diarios (CSV)…")
+        self.boton_importar.clicked.connect(self.importar_casos)
+        self.casos_label = QLabel("Encabezado; primera columna la fecha y una columna de casos por región.")
+        self.casos_label.setWordWrap(True)
+        self.region_combo = QComboBox()
+        self.region_combo.setEnabled(False)
+        self.region_combo.currentIndexChanged.connect(lambda _: self.mostrar_rt(self.analisis))
+        self.ventana_spin = QSpinBox()
+        self.ventana_spin.setRange(1, 60)
+        self.ventana_spin.setValue(reproduccion.VENTANA)
+        self.serial_media_input = QLineEdit(f"{reproduccion.SERIAL_MEDIA:g}")
+        self.serial_desviacion_input = QLineEdit(f"{reproduccion.SERIAL_DESVIACION:g}")
+        for field in [self.serial_media_input, self.serial_desviacion_input]:
+            field.setValidator(validator)
+        self.horizonte_spin = QSpinBox()
+        self.horizonte_spin.setRange(0, 365)
+        self.horizonte_spin.setValue(14)
+        self.tendencia_check = QCheckBox("Seguir la tendencia reciente de Rₜ")
+        casos_layout.addRow(self.boton_importar)
+        casos_layout.addRow(self.casos_label)
+        casos_layout.addRow("Región:", self.region_combo)
+        casos_layout.addRow("Ventana (días):", self.ventana_spin)
+        casos_layout.addRow("Intervalo serial, media:", self.serial_media_input)
+        casos_layout.addRow("Intervalo serial, desviación:", self.serial_desviacion_input)
+        casos_layout.addRow("Horizonte (días):", self.horizonte_spin)
+        casos_layout.addRow(self.tendencia_check)
+        casos_group.setLayout(casos_layout)
+        formulario_layout.addWidget(casos_group)
+
+        self.boton_estimar = QPushButton("Estimar Rₜ y pronosticar")
+        self.boton_estimar.clicked.connect(self.estimar_rt)
+        formulario_layout.addWidget(self.boton_estimar)
+        self.incidencia = None
+        self.analisis = None
+        self.barrido = None
 
         tabla_group = QGroupBox("Tabla de Resultados")
         tabla_layout = QVBoxLayout()
@@ -124,8 +288,6 @@ class ModeloRt(QWidget):
         graficas_inner_layout = QVBoxLayout()
 
         self.canvas = FigureCanvas(Figure(figsize=(6, 10)))
-        self.ax1 = self.canvas.figure.add_subplot(2, 1, 1)
-        self.ax2 = self.canvas.figure.add_subplot(2, 1, 2)
         graficas_inner_layout.addWidget(self.canvas)
 
         graficas_group.setLayout(graficas_inner_layout)
@@ -140,87 +302,426 @@ class ModeloRt(QWidget):
 
         main_layout.addLayout(contenido_layout)
         self.setLayout(main_layout)
-        self.simular()
-
-    def beta_func(self, t, tipo):
-        if tipo == "Constante":
-            return 0.3
-        elif tipo == "Variable (senoidal)":
-            return 0.25 + 0.05 * np.sin(0.2 * t)
-
-    def modelo_sir(self, t, y, gamma, tipo_beta):
-        S, I, R = y
-        beta = self.beta_func(t, tipo_beta)
-        dSdt = -beta * S * I
-        dIdt = beta * S * I - gamma * I
-        dRdt = gamma * I
-        return [dSdt, dIdt, dRdt]
-
+        # La simulación inicial espera a que el módulo se abra (ver showEvent)
+        self.simulacion_pendiente = True
+
+    def showEvent(self, event):
+        super().showEvent(event)
+        # Construir el widget (p. ej., en la precarga) no simula; abrirlo por primera vez, sí
+        if self.simulacion_pendiente:
+            self.simulacion_pendiente = False
+            self.simular()
+
+    def actualizar_tasas(self):
+        modelo = self.modelo_combo.currentText()
+        self.sigma_input.setEnabled(modelo != "SIR")
+        self.mu_input.setEnabled(modelo == "SEIRD")
+
+    def cargar_tabla(self, clave):
+        ruta, _ = QFileDialog.getOpenFileName(self, "Cargar tabla", "", "CSV (*.csv);;Todos (*)")
+        if not ruta:
+            return
+        try:
+            self.tablas[clave] = compartimentos.cargar_csv(ruta)
+        except ValueError as e:
+            QMessageBox.critical(self, "Error", str(e))
+            return
+        self.actualizar_estructura()
+
+    def quitar_estructura(self):
+        self.tablas.clear()
+        self.actualizar_estructura()
+
+    def actualizar_estructura(self):
+        poblaciones = self.tablas.get("poblaciones")
+        self.poblacion_input.setEnabled(poblaciones is None)
+        if poblaciones is None:
+            self.foco_spin.setRange(0, 0)
+            self.estructura_label.setText("Sin estructura: una sola población."
+                                          if not self.tablas else "Falta la tabla de poblaciones.")
+            return
+        regiones, edades = poblaciones.shape
+        self.foco_spin.setRange(0, regiones)
+        partes = [f"{regiones} regiones × {edades} edades = {poblaciones.size} grupos"]
+        for clave, texto in [("contactos_edad", "contactos"), ("movilidad", "movilidad")]:
+            if clave in self.tablas:
+                filas, columnas = self.tablas[clave].shape
+                partes.append(f"{texto} {filas} × {columnas}")
+        self.estructura_label.setText(", ".join(partes))
+
+    def armar_modelo(self):
+        """Modelo compartimental y vector de infectados iniciales según el formulario."""
+        poblaciones = self.tablas.get("poblaciones")
+        if poblaciones is None:
+            if self.tablas:
+                raise ValueError("Carga la tabla de poblaciones o quita la estructura.")
+            poblaciones = np.array([[int(self.poblacion_input.text())]])
+        disperso = self.disperso_check.isChecked()
+        N, C = compartimentos.estructura(poblaciones, self.tablas.get("contactos_edad"),
+                                         self.tablas.get("movilidad"), disperso)
+        modelo = compartimentos.Modelo(
+            self.modelo_combo.currentText(), N, C,
+            gamma=float(self.gamma_input.text()),
+            sigma=float(self.sigma_input.text()),
+            mu=float(self.mu_input.text()),
+            tipo_beta=self.beta_tipo.currentText(),
+            disperso=disperso,
+        )
+        foco = self.foco_spin.value() - 1 if self.foco_spin.value() else None
+        infectados = compartimentos.infectados_iniciales(poblaciones, int(self.infectados_input.text()), foco)
+        return modelo, infectados
+
+    @traza.operacion("Simulación SIR")
     def simular(self):
+        try:
+            modelo, infectados = self.armar_modelo()
+            dias = int(self.tiempo_input.text())
+            rtol = float(self.rtol_input.text())
+            atol = float(self.atol_input.text())
+
+            ejecutor().enviar(
+                "Simulación SIR",
+                compartimentos.simular, modelo, infectados, dias,
+                metodo=self.metodo_combo.currentText(), rtol=rtol, atol=atol,
+                al_terminar=self.mostrar_resultado,
+                padre=self,
+                boton=self.boton_simular,
+            )
+
+        except Exception as e:
+            QMessageBox.critical(self, "Error", str(e))
+
+    @traza.operacion("Barrido SIR")
+    def barrer(self):
         try:
             N = int(self.poblacion_input.text())
+            dias = int(self.tiempo_input.text())
+            n = self.divisiones_spin.value()
+            betas = np.linspace(float(self.beta_min_input.text()), float(self.beta_max_input.text()), n)
+            gammas = np.linspace(float(self.gamma_min_input.text()), float(self.gamma_max_input.text()), n)
+            textos = [t for t in self.infectados_barrido_input.text().split(",") if t.strip()]
+            infectados = [int(t) for t in textos]
+            if not infectados:
+                raise ValueError("Indica al menos un valor de I₀.")
+
+            ejecutor().enviar(
+                "Barrido SIR",
+                nucleo.barrer, N, betas, gammas, infectados, dias, self.beta_tipo.currentText(),
+                al_terminar=self.mostrar_barrido,
+                padre=self,
+                boton=self.boton_barrer,
+            )
+
+        except Exception as e:
+            QMessageBox.critical(self, "Error", str(e))
+
+    @traza.operacion("Réplicas SIR estocásticas")
+    def simular_replicas(self):
+        try:
+            if self.tablas:
+                raise ValueError("Las réplicas estocásticas usan una sola población: quita la estructura por grupos.")
+            N = int(self.poblacion_input.text())
             I0 = int(self.infectados_input.text())
-            S0 = N - I0
-            R0 = 0
             gamma = float(self.gamma_input.text())
             dias = int(self.tiempo_input.text())
-            tipo_beta = self.beta_tipo.currentText()
+            semilla = int(self.semilla_input.text()) if self.semilla_input.text() else None
+
+            ejecutor().enviar(
+                "Réplicas SIR estocásticas",
+                estocastico.simular, N, I0, gamma, dias, self.beta_tipo.currentText(),
+                replicas=self.replicas_spin.value(),
+                metodo=self.metodo_estocastico.currentText(),
+                tau=float(self.tau_input.text()),
+                semilla=semilla,
+                al_terminar=self.mostrar_replicas,
+                padre=self,
+                boton=self.boton_replicas,
+            )
 
-            y0 = [S0 / N, I0 / N, R0 / N]
-            t_eval = np.linspace(0, dias, 300)
+        except Exception as e:
+            QMessageBox.critical(self, "Error", str(e))
 
-            sol = solve_ivp(
-                self.modelo_sir, (0, dias), y0,
-                args=(gamma, tipo_beta), t_eval=t_eval
-            )
+    def mostrar_replicas(self, replicas):
+        cuenta = (f"{replicas['eventos']:,.0f} eventos por réplica" if "eventos" in replicas
+                  else f"{replicas['pasos']:,} pasos")
+        self.integracion_label.setText(
+            f"{replicas['metodo']}: {replicas['replicas']:,} réplicas, {cuenta}, "
+            f"{replicas['segundos'] * 1000:.0f} ms · P(extinción sin brote) = {replicas['prob_extincion']:.3f} "
+            f"(teórica {replicas['extincion_teorica']:.3f})"
+        )
+        self.graficar_replicas(replicas)
+        self.mostrar_tabla_replicas(replicas)
+
+    @traza.medir("dibujo")
+    def graficar_replicas(self, replicas):
+        """Bandas de percentiles de I(t) frente a la EDO, probabilidad de extinción y tamaños finales."""
+        figura = self.canvas.figure
+        figura.clear()
+        t = replicas["t"]
+        bandas = replicas["bandas"]["I"]
+
+        ax1 = figura.add_subplot(3, 1, 1)
+        p = replicas["percentiles"]
+        ax1.fill_between(t, bandas[0], bandas[-1], color="tab:red", alpha=0.2, label=f"P{p[0]}–P{p[-1]}")
+        ax1.fill_between(t, bandas[1], bandas[-2], color="tab:red", alpha=0.35, label=f"P{p[1]}–P{p[-2]}")
+        ax1.plot(t, bandas[len(p) // 2], color="tab:red", label="Mediana")
+        ax1.plot(t, replicas["media"]["I"], color="black", linewidth=1, label="Media")
+        ax1.plot(t, replicas["determinista"]["I"], "--", color="tab:blue", label="EDO")
+        ax1.set_title(f"Infectados en {replicas['replicas']:,} réplicas ({replicas['metodo']})")
+        ax1.set_ylabel("Personas")
+        ax1.legend()
+        ax1.grid(True)
+
+        ax2 = figura.add_subplot(3, 1, 2)
+        ax2.plot(t, replicas["extincion"], color="tab:purple", label="P(I(t) = 0)")
+        ax2.axhline(replicas["extincion_teorica"], linestyle="--", color="gray", label="(1/R₀)^I₀")
+        ax2.set_title("Probabilidad de extinción")
+        ax2.set_xlabel("Días")
+        ax2.set_ylim(0, 1)
+        ax2.legend()
+        ax2.grid(True)
+
+        ax3 = figura.add_subplot(3, 1, 3)
+        ax3.hist(replicas["tamano_final"], bins=50, color="tab:gray")
+        ax3.set_title("Tamaño final (personas infectadas)")
+        ax3.set_ylabel("Réplicas")
+        figura.tight_layout()
+        self.canvas.draw()
 
-            self.graficar(sol, gamma, tipo_beta)
-            self.mostrar_tabla(sol, gamma, tipo_beta)
+    @traza.medir("tabla")
+    def mostrar_tabla_replicas(self, replicas):
+        t = replicas["t"]
+        bandas = replicas["bandas"]["I"]
+        percentiles = replicas["percentiles"]
+        indices = range(0, len(t), max(len(t) // 10, 1))
+        self.tabla.clear()
+        self.tabla.setRowCount(len(indices))
+        self.tabla.setColumnCount(len(percentiles) + 3)
+        self.tabla.setHorizontalHeaderLabels(["Día", *[f"I P{p}" for p in percentiles], "I media", "P(I = 0)"])
+
+        for row, i in enumerate(indices):
+            self.tabla.setItem(row, 0, QTableWidgetItem(f"{t[i]:.0f}"))
+            for columna, banda in enumerate(bandas, start=1):
+                self.tabla.setItem(row, columna, QTableWidgetItem(f"{banda[i]:.0f}"))
+            self.tabla.setItem(row, len(percentiles) + 1, QTableWidgetItem(f"{replicas['media']['I'][i]:.1f}"))
+            self.tabla.setItem(row, len(percentiles) + 2, QTableWidgetItem(f"{replicas['extincion'][i]:.3f}"))
+
+        self.tabla.resizeColumnsToContents()
+
+    def importar_casos(self):
+        ruta, _ = QFileDialog.getOpenFileName(self, "Importar casos diarios", "", "CSV (*.csv);;Todos (*)")
+        if not ruta:
+            return
+        try:
+            incidencia = reproduccion.leer_incidencia(ruta)
+        except ValueError as e:
+            QMessageBox.critical(self, "Error", str(e))
+            return
+        self.cargar_incidencia(incidencia)
+
+    def cargar_incidencia(self, incidencia):
+        self.incidencia = incidencia
+        self.analisis = None
+        fechas = incidencia["fechas"]
+        self.casos_label.setText(f"{len(incidencia['regiones'])} regiones, {len(fechas)} días "
+                                 f"({fechas[0]} a {fechas[-1]})")
+        self.region_combo.blockSignals(True)
+        self.region_combo.clear()
+        self.region_combo.addItems(incidencia["regiones"])
+        self.region_combo.blockSignals(False)
+        self.region_combo.setEnabled(True)
+
+    @traza.operacion("Estimación de Rₜ")
+    def estimar_rt(self):
+        try:
+            if self.incidencia is None:
+                raise ValueError("Primero importa un archivo de casos diarios.")
+
+            ejecutor().enviar(
+                "Estimación de Rₜ",
+                reproduccion.analizar, self.incidencia["casos"], self.ventana_spin.value(),
+                float(self.serial_media_input.text()), float(self.serial_desviacion_input.text()),
+                self.horizonte_spin.value(),
+                tendencia=self.tendencia_check.isChecked(),
+                al_terminar=self.mostrar_rt,
+                padre=self,
+                boton=self.boton_estimar,
+            )
 
         except Exception as e:
             QMessageBox.critical(self, "Error", str(e))
 
-    def graficar(self, sol, gamma, tipo_beta):
-        self.ax1.clear()
-        self.ax2.clear()
+    def mostrar_rt(self, analisis):
+        self.analisis = analisis
+        if analisis is None:
+            return
+        self.graficar_rt()
+        self.mostrar_tabla_rt()
+
+    @traza.medir("dibujo")
+    def graficar_rt(self):
+        """Casos y Rₜ de la región elegida, con su intervalo de credibilidad y el pronóstico."""
+        k = max(self.region_combo.currentIndex(), 0)
+        estimacion, pronostico = self.analisis["estimacion"], self.analisis["pronostico"]
+        casos = self.incidencia["casos"][k]
+        fechas = self.incidencia["fechas"]
+        dias = np.arange(len(casos))
+        figura = self.canvas.figure
+        figura.clear()
+
+        ax1 = figura.add_subplot(2, 1, 1)
+        ax1.plot(dias, casos, color="tab:gray", linewidth=1, label="Casos")
+        ax2 = figura.add_subplot(2, 1, 2, sharex=ax1)
+        bajo, mediana, alto = estimacion["cuantiles"][:, k]
+        ax2.fill_between(dias, bajo, alto, color="tab:orange", alpha=0.3, label="IC 95 %")
+        ax2.plot(dias, mediana, color="tab:orange", label="Rₜ (mediana)")
+        if pronostico is not None:
+            futuro = len(casos) + np.arange(pronostico["rt_media"].shape[1])
+            bajo, mediana, alto = pronostico["casos_cuantiles"][:, k]
+            ax1.fill_between(futuro, bajo, alto, color="tab:blue", alpha=0.3, label="Pronóstico IC 95 %")
+            ax1.plot(futuro, mediana, color="tab:blue", label="Pronóstico (mediana)")
+            bajo, mediana, alto = pronostico["rt_cuantiles"][:, k]
+            ax2.fill_between(futuro, bajo, alto, color="tab:purple", alpha=0.3)
+            ax2.plot(futuro, mediana, "--", color="tab:purple", label="Pronóstico")
+        ax1.set_title(f"Casos diarios · {self.incidencia['regiones'][k]}")
+        ax1.tick_params(labelbottom=False)
+        ax1.legend()
+        ax1.grid(True)
+        ax2.axhline(1, linestyle="--", color="gray", label="Rₜ = 1")
+        ax2.set_title(f"Rₜ (Cori, ventana de {estimacion['ventana']} días)")
+        ax2.legend()
+        ax2.grid(True)
+        # Unas pocas fechas como marcas: con años de datos no caben todas
+        marcas = np.linspace(0, len(casos) - 1, min(len(casos), 6)).astype(int)
+        ax2.set_xticks(marcas)
+        ax2.set_xticklabels([fechas[i] for i in marcas], rotation=20, fontsize=8)
+        figura.tight_layout()
+        self.canvas.draw()
 
-        t = sol.t
-        S, I, R = sol.y
+    @traza.medir("tabla")
+    def mostrar_tabla_rt(self):
+        k = max(self.region_combo.currentIndex(), 0)
+        estimacion, pronostico = self.analisis["estimacion"], self.analisis["pronostico"]
+        casos = self.incidencia["casos"][k]
+        fechas = self.incidencia["fechas"]
+        # Las dos últimas ventanas observadas y luego los días pronosticados
+        indices = range(max(len(casos) - 2 * estimacion["ventana"], 0), len(casos))
+        horizonte = 0 if pronostico is None else pronostico["rt_media"].shape[1]
+        self.tabla.clear()
+        self.tabla.setRowCount(len(indices) + horizonte)
+        self.tabla.setColumnCount(5)
+        self.tabla.setHorizontalHeaderLabels(["Fecha", "Casos", "Rₜ", "IC 2.5 %", "IC 97.5 %"])
+
+        for row, i in enumerate(indices):
+            bajo, mediana, alto = estimacion["cuantiles"][:, k, i]
+            valores = [fechas[i], f"{casos[i]:.0f}", f"{mediana:.2f}", f"{bajo:.2f}", f"{alto:.2f}"]
+            for columna, texto in enumerate(valores):
+                self.tabla.setItem(row, columna, QTableWidgetItem(texto))
+        for h in range(horizonte):
+            bajo, mediana, alto = pronostico["rt_cuantiles"][:, k, h]
+            valores = [f"+{h + 1}", f"{pronostico['casos_media'][k, h]:.0f}",
+                       f"{mediana:.2f}", f"{bajo:.2f}", f"{alto:.2f}"]
+            for columna, texto in enumerate(valores):
+                self.tabla.setItem(len(indices) + h, columna, QTableWidgetItem(texto))
 
-        self.ax1.plot(t, S, label="S(t)")
-        self.ax1.plot(t, I, label="I(t)")
-        self.ax1.plot(t, R, label="R(t)")
-        self.ax1.set_title("Evolución SIR")
+        self.tabla.resizeColumnsToContents()
+
+    def mostrar_barrido(self, barrido):
+        self.barrido = barrido
+        self.infectados_mapa.blockSignals(True)
+        self.infectados_mapa.clear()
+        self.infectados_mapa.addItems([f"{i:g}" for i in barrido["infectados"]])
+        self.infectados_mapa.blockSignals(False)
+        self.infectados_mapa.setEnabled(True)
+        self.graficar_barrido()
+
+    @traza.medir("dibujo")
+    def graficar_barrido(self):
+        """Mapas de calor sobre β × γ para el I₀ elegido, con la curva R₀ = 1."""
+        if self.barrido is None:
+            return
+        barrido = self.barrido
+        k = max(self.infectados_mapa.currentIndex(), 0)
+        figura = self.canvas.figure
+        figura.clear()
+        for fila, (clave, titulo, mapa) in enumerate(MAPAS_BARRIDO, start=1):
+            ax = figura.add_subplot(len(MAPAS_BARRIDO), 1, fila)
+            malla = ax.pcolormesh(barrido["betas"], barrido["gammas"], barrido[clave][:, :, k].T,
+                                  cmap=mapa, shading="auto")
+            figura.colorbar(malla, ax=ax)
+            R0 = barrido["R0"][:, :, k]
+            if R0.min() < 1 < R0.max():
+                ax.contour(barrido["betas"], barrido["gammas"], R0.T, levels=[1],
+                           colors="white", linestyles="--", linewidths=1)
+            ax.set_title(f"{titulo} · I₀ = {barrido['infectados'][k]:g}")
+            ax.set_ylabel("γ")
+        ax.set_xlabel("β")
+        figura.tight_layout()
+        self.canvas.draw()
+
+    def mostrar_resultado(self, sol):
+        self.integracion_label.setText(
+            f"{sol['metodo']}: {sol['evaluaciones']:,} evaluaciones de f, "
+            f"{sol['jacobianas']:,} jacobianas, {sol['segundos'] * 1000:.1f} ms"
+        )
+        self.graficar(sol)
+        self.mostrar_tabla(sol)
+
+    @traza.medir("dibujo")
+    def graficar(self, sol):
+        # La figura se rehace: el barrido la ocupa con sus mapas
+        figura = self.canvas.figure
+        figura.clear()
+        grupos = sol["infectados_grupo"]
+        filas = 3 if len(grupos) > 1 else 2
+        self.ax1 = figura.add_subplot(filas, 1, 1)
+        self.ax2 = figura.add_subplot(filas, 1, 2)
+
+        t = sol["t"]
+
+        for nombre in sol["compartimentos"]:
+            self.ax1.plot(t, sol[nombre], label=f"{nombre}(t)")
+        self.ax1.set_title(f"Evolución {sol['modelo']}")
         self.ax1.set_ylabel("Proporción")
         self.ax1.legend()
         self.ax1.grid(True)
 
-        Rt = [self.beta_func(ti, tipo_beta) / gamma * S[i] for i, ti in enumerate(t)]
-        self.ax2.plot(t, Rt, label="Rₜ(t)", color='orange')
+        self.ax2.plot(t, sol["Rt"], label="Rₜ(t)", color='orange')
         self.ax2.set_title("Rₜ(t) Dinámico")
         self.ax2.set_xlabel("Días")
         self.ax2.axhline(1, linestyle="--", color="gray", label="Rₜ = 1")
         self.ax2.legend()
         self.ax2.grid(True)
 
+        if filas == 3:
+            # Un renglón por grupo: cientos de municipios × edades caben en un mapa
+            ax3 = figura.add_subplot(filas, 1, 3)
+            imagen = ax3.imshow(grupos, aspect="auto", origin="lower", cmap="Reds", interpolation="nearest",
+                                extent=(t[0], t[-1], -0.5, len(grupos) - 0.5))
+            figura.colorbar(imagen, ax=ax3, label="Fracción infectada")
+            ax3.set_title("Infectados por grupo")
+            ax3.set_xlabel("Días")
+            ax3.set_ylabel("Grupo")
+        figura.tight_layout()
+
         self.canvas.draw()
 
-    def mostrar_tabla(self, sol, gamma, tipo_beta):
-        t = sol.t
-        S, I, R = sol.y
-        Rt_vals = [self.beta_func(ti, tipo_beta) / gamma * S[i] for i, ti in enumerate(t)]
+    @traza.medir("tabla")
+    def mostrar_tabla(self, sol):
+        t = sol["t"]
+        Rt_vals = sol["Rt"]
+        nombres = sol["compartimentos"]
 
         indices = range(0, len(t), 30)
         self.tabla.clear()
         self.tabla.setRowCount(len(indices))
-        self.tabla.setColumnCount(5)
-        self.tabla.setHorizontalHeaderLabels(["Día", "S", "I", "R", "Rₜ"])
+        self.tabla.setColumnCount(len(nombres) + 2)
+        self.tabla.setHorizontalHeaderLabels(["Día", *nombres, "Rₜ"])
 
         for row, i in enumerate(indices):
             self.tabla.setItem(row, 0, QTableWidgetItem(f"{t[i]:.0f}"))
-            self.tabla.setItem(row, 1, QTableWidgetItem(f"{S[i]:.3f}"))
-            self.tabla.setItem(row, 2, QTableWidgetItem(f"{I[i]:.3f}"))
-            self.tabla.setItem(row, 3, QTableWidgetItem(f"{R[i]:.3f}"))
-            self.tabla.setItem(row, 4, QTableWidgetItem(f"{Rt_vals[i]:.2f}"))
+            for columna, nombre in enumerate(nombres, start=1):
+                self.tabla.setItem(row, columna, QTableWidgetItem(f"{sol[nombre][i]:.3f}"))
+            self.tabla.setItem(row, len(nombres) + 1, QTableWidgetItem(f"{Rt_vals[i]:.2f}"))
 
         self.tabla.resizeColumnsToContents()
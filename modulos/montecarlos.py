@@ -1,13 +1,35 @@
 from PyQt5.QtWidgets import (
     QWidget, QVBoxLayout, QLabel, QFormLayout, QLineEdit,
-    QPushButton, QHBoxLayout, QMessageBox, QGroupBox, QComboBox, QSizePolicy
+    QPushButton, QHBoxLayout, QMessageBox, QGroupBox, QComboBox, QSizePolicy,
+    QTableWidget, QTableWidgetItem, QSpinBox
 )
 from PyQt5.QtGui import QDoubleValidator, QIntValidator
+import time
+
+import numpy as np
 from matplotlib.backends.backend_qt5agg import FigureCanvasQTAgg as FigureCanvas
 from matplotlib.figure import Figure
-from sympy import sympify, lambdify, symbols, integrate, Abs
-import numpy as np
-import random
+from matplotlib.ticker import NullFormatter
+
+from calcucho.core import traza
+from calcucho.core import estimadores
+from calcucho.core import integrales_multiples
+from calcucho.core import montecarlo as nucleo
+from calcucho.core import paralelo
+from calcucho.core import simbolico
+from ui.trabajos import ejecutor
+
+TIPOS = ["Área bajo una curva", "Área entre dos curvas", "Integral doble", "Integral triple"]
+# Índice del primer tipo de integral múltiple (dimensión = índice)
+MULTIPLE = 2
+
+# Modos de dibujo de los puntos; en automático, por encima de UMBRAL_DENSIDAD se dibuja la densidad
+DIBUJOS = ["Automático", "Muestra de puntos", "Mapa de densidad"]
+UMBRAL_DENSIDAD = 200_000
+
+COLUMNAS_ESTIMADORES = ["Estimador", "Estimación", "Error estándar", "Varianza / eval.",
+                        "Evaluaciones", "Tiempo (s)", "Tiempo al objetivo (s)", "Error real %"]
+
 
 class VistaMonteCarlo(QWidget):
     def __init__(self):
@@ -15,6 +37,8 @@ class VistaMonteCarlo(QWidget):
         self.setWindowTitle("Integración Monte Carlo")
         self.setMinimumSize(950, 600)
         self.init_ui()
+        # El proceso de sympy arranca mientras el usuario escribe
+        simbolico.precalentar()
 
     def init_ui(self):
         self.setStyleSheet("""
@@ -63,9 +87,10 @@ class VistaMonteCarlo(QWidget):
         # -------- CONFIGURACIÓN --------
         configuracion_box = QGroupBox("⚙️ Configuración")
         form_layout = QFormLayout()
+        self.form_layout = form_layout
 
         self.tipo_combo = QComboBox()
-        self.tipo_combo.addItems(["Área bajo una curva", "Área entre dos curvas"])
+        self.tipo_combo.addItems(TIPOS)
         self.tipo_combo.currentIndexChanged.connect(self.actualizar_formulario)
         form_layout.addRow("Tipo de integración:", self.tipo_combo)
 
@@ -75,14 +100,46 @@ class VistaMonteCarlo(QWidget):
         self.b_input.setPlaceholderText("Ejemplo: 1")
         self.fx_input = QLineEdit(); self.fx_input.setPlaceholderText("Ejemplo: x**2")
         self.gx_input = QLineEdit(); self.gx_input.setPlaceholderText("Ejemplo: sqrt(x)")
-        self.num_input = QLineEdit(); self.num_input.setValidator(QIntValidator(1, 1000000))
+        # Integrales múltiples: límites de y y z, y región opcional dentro de la caja
+        self.ya_input = QLineEdit(); self.ya_input.setValidator(QDoubleValidator())
+        self.ya_input.setPlaceholderText("Ejemplo: 0")
+        self.yb_input = QLineEdit(); self.yb_input.setValidator(QDoubleValidator())
+        self.yb_input.setPlaceholderText("Ejemplo: 1")
+        self.za_input = QLineEdit(); self.za_input.setValidator(QDoubleValidator())
+        self.za_input.setPlaceholderText("Ejemplo: 0")
+        self.zb_input = QLineEdit(); self.zb_input.setValidator(QDoubleValidator())
+        self.zb_input.setPlaceholderText("Ejemplo: 1")
+        self.region_input = QLineEdit(); self.region_input.setPlaceholderText("Opcional: x**2 + y**2 < 1")
+        self.region_input.setToolTip("Desigualdades que deben cumplirse, separadas por ';'")
+        self.num_input = QLineEdit(); self.num_input.setValidator(QIntValidator(1, 100_000_000))
         self.num_input.setPlaceholderText("Ejemplo: 10000")
+        # Opcional: detenerse antes de N al alcanzar este error relativo
+        self.objetivo_input = QLineEdit(); self.objetivo_input.setValidator(QDoubleValidator(0.0, 100.0, 4))
+        self.objetivo_input.setPlaceholderText("Opcional: 0.1")
 
         form_layout.addRow("Límite inferior a:", self.a_input)
         form_layout.addRow("Límite superior b:", self.b_input)
+        form_layout.addRow("Límite inferior de y:", self.ya_input)
+        form_layout.addRow("Límite superior de y:", self.yb_input)
+        form_layout.addRow("Límite inferior de z:", self.za_input)
+        form_layout.addRow("Límite superior de z:", self.zb_input)
         form_layout.addRow("Función f(x):", self.fx_input)
         form_layout.addRow("Función g(x):", self.gx_input)
+        form_layout.addRow("Región:", self.region_input)
         form_layout.addRow("N° de puntos:", self.num_input)
+        form_layout.addRow("Detener con error relativo (%):", self.objetivo_input)
+        # Con la misma semilla el resultado no depende de los núcleos usados
+        self.semilla_input = QLineEdit(); self.semilla_input.setValidator(QIntValidator(0, 2_147_483_647))
+        self.semilla_input.setPlaceholderText("Opcional: 42")
+        form_layout.addRow("Semilla:", self.semilla_input)
+        self.nucleos_spin = QSpinBox(); self.nucleos_spin.setRange(1, paralelo.PROCESOS)
+        self.nucleos_spin.setValue(paralelo.PROCESOS)
+        form_layout.addRow("Núcleos:", self.nucleos_spin)
+        self.dibujo_combo = QComboBox(); self.dibujo_combo.addItems(DIBUJOS)
+        form_layout.addRow("Dibujo de puntos:", self.dibujo_combo)
+        # Sólo para comparar estimadores: densidad del muestreo por importancia
+        self.densidad_input = QLineEdit(); self.densidad_input.setPlaceholderText("Opcional: exp(-x)")
+        form_layout.addRow("Densidad q(x) (importancia):", self.densidad_input)
 
         configuracion_box.setLayout(form_layout)
         columnas_layout.addWidget(configuracion_box, 1)
@@ -93,13 +150,18 @@ class VistaMonteCarlo(QWidget):
         self.valor_mc_label = QLabel("🎯 Monte Carlo:")
         self.error_label = QLabel("📉 Error %:")
         self.dentro_label = QLabel("🔵 Dentro:")
+        self.error_estandar_label = QLabel("± Error estándar:")
+        self.ic_label = QLabel("📏 IC 95 %:")
 
-        for lbl in [self.valor_exacto_label, self.valor_mc_label, self.error_label, self.dentro_label]:
+        for lbl in [self.valor_exacto_label, self.valor_mc_label, self.error_label, self.dentro_label,
+                    self.error_estandar_label, self.ic_label]:
             lbl.setStyleSheet("font-size: 14px;")
 
         layout_resultado = QVBoxLayout()
         layout_resultado.addWidget(self.valor_exacto_label)
         layout_resultado.addWidget(self.valor_mc_label)
+        layout_resultado.addWidget(self.error_estandar_label)
+        layout_resultado.addWidget(self.ic_label)
         layout_resultado.addWidget(self.error_label)
         layout_resultado.addWidget(self.dentro_label)
         self.resultados_box.setLayout(layout_resultado)
@@ -112,16 +174,27 @@ class VistaMonteCarlo(QWidget):
         self.btn_simular = QPushButton("🎯 Ejecutar Simulación")
         self.btn_simular.clicked.connect(self.ejecutar_simulacion)
 
+        self.btn_comparar = QPushButton("📊 Comparar estimadores")
+        self.btn_comparar.clicked.connect(self.comparar_estimadores)
+
         self.btn_limpiar = QPushButton("🧽 Limpiar")
         self.btn_limpiar.setStyleSheet("background-color: #e74c3c; font-weight: bold;")
         self.btn_limpiar.clicked.connect(self.limpiar_campos)
 
         botones.addStretch()
         botones.addWidget(self.btn_simular)
+        botones.addWidget(self.btn_comparar)
         botones.addWidget(self.btn_limpiar)
         botones.addStretch()
         main_layout.addLayout(botones)
 
+        # -------- COMPARACIÓN DE ESTIMADORES --------
+        self.tabla_estimadores = QTableWidget(0, len(COLUMNAS_ESTIMADORES))
+        self.tabla_estimadores.setHorizontalHeaderLabels(COLUMNAS_ESTIMADORES)
+        self.tabla_estimadores.setMaximumHeight(230)
+        self.tabla_estimadores.hide()
+        main_layout.addWidget(self.tabla_estimadores)
+
         # -------- GRÁFICA --------
         self.figure = Figure()
         self.canvas = FigureCanvas(self.figure)
@@ -130,93 +203,345 @@ class VistaMonteCarlo(QWidget):
         self.setLayout(main_layout)
         self.actualizar_formulario()
 
+    def mostrar_fila(self, campo, visible):
+        campo.setVisible(visible)
+        self.form_layout.labelForField(campo).setVisible(visible)
+
     def actualizar_formulario(self):
-        self.gx_input.setVisible(self.tipo_combo.currentIndex() == 1)
+        tipo = self.tipo_combo.currentIndex()
+        dimension = tipo if tipo >= MULTIPLE else 1
+        self.mostrar_fila(self.gx_input, tipo == 1)
+        for campo in (self.ya_input, self.yb_input):
+            self.mostrar_fila(campo, dimension >= 2)
+        for campo in (self.za_input, self.zb_input):
+            self.mostrar_fila(campo, dimension == 3)
+        self.mostrar_fila(self.region_input, dimension >= 2)
+        # La densidad de puntos y la comparación de estimadores son de las áreas en x
+        self.mostrar_fila(self.dibujo_combo, dimension == 1)
+        self.mostrar_fila(self.densidad_input, dimension == 1)
+        self.btn_comparar.setEnabled(dimension == 1)
+        argumentos = ", ".join(integrales_multiples.VARIABLES[:dimension])
+        self.form_layout.labelForField(self.fx_input).setText(f"Función f({argumentos}):")
+        self.fx_input.setPlaceholderText({1: "Ejemplo: x**2", 2: "Ejemplo: x*y", 3: "Ejemplo: x + y*z"}[dimension])
 
+    @traza.operacion("Monte Carlo")
     def ejecutar_simulacion(self):
+        if self.tipo_combo.currentIndex() >= MULTIPLE:
+            self.ejecutar_multiple()
+            return
         try:
             if not self.a_input.text() or not self.b_input.text() or not self.fx_input.text() or not self.num_input.text():
                 QMessageBox.warning(self, "Campos incompletos", "Por favor completa todos los campos obligatorios.")
                 return
-            if self.tipo_combo.currentIndex() == 1 and not self.gx_input.text():
+            entre_curvas = self.tipo_combo.currentIndex() == 1
+            if entre_curvas and not self.gx_input.text():
                 QMessageBox.warning(self, "Campos incompletos", "Debes ingresar también la función g(x).")
                 return
 
-            x = symbols('x')
-            a = float(self.a_input.text())
-            b = float(self.b_input.text())
+            objetivo = self.leer_objetivo()
             n = int(self.num_input.text())
+            modo = self.dibujo_combo.currentIndex()
+            densidad = modo == 2 or (modo == 0 and n > UMBRAL_DENSIDAD)
 
-            fx_expr = sympify(self.fx_input.text())
-            fx = lambdify(x, fx_expr, 'numpy')
-            x_vals = np.linspace(a, b, 300)
-            y_fx = fx(x_vals)
-
-            if self.tipo_combo.currentIndex() == 1:
-                gx_expr = sympify(self.gx_input.text())
-                gx = lambdify(x, gx_expr, 'numpy')
-                y_gx = gx(x_vals)
-                ymin, ymax = min(min(y_fx), min(y_gx)), max(max(y_fx), max(y_gx))
-            else:
-                ymin, ymax = 0, max(y_fx)
-
-            puntos_dentro, puntos_x, puntos_y, colores = 0, [], [], []
-            for _ in range(n):
-                rx = random.uniform(a, b)
-                ry = random.uniform(ymin, ymax)
-                y1 = fx(rx)
-                if self.tipo_combo.currentIndex() == 1:
-                    y2 = gx(rx)
-                    y_lower, y_upper = min(y1, y2), max(y1, y2)
-                else:
-                    y_lower, y_upper = 0, y1
-                if y_lower <= ry <= y_upper:
-                    puntos_dentro += 1
-                    colores.append('blue')
-                else:
-                    colores.append('red')
-                puntos_x.append(rx)
-                puntos_y.append(ry)
-
-            area_total = (b - a) * (ymax - ymin)
-            area_mc = area_total * (puntos_dentro / n)
-
-            if self.tipo_combo.currentIndex() == 0:
-                area_exacta = float(integrate(fx_expr, (x, a, b)))
-            else:
-                area_exacta = float(integrate(gx_expr - fx_expr, (x, a, b)))
-
-            error = Abs((area_mc - area_exacta) / area_exacta) * 100
-
-            self.valor_exacto_label.setText(f"✅ Exacto: {area_exacta:.6f}")
-            self.valor_mc_label.setText(f"🎯 Monte Carlo: {area_mc:.6f}")
-            self.error_label.setText(f"📉 Error %: {error:.2f}")
-            self.dentro_label.setText(f"🔵 Dentro: {puntos_dentro} / {n}")
+            self.vivo = {"n": [], "area": [], "error_estandar": []}
+            self.ultimo_dibujo = 0.0
+            ejecutor().enviar(
+                "Monte Carlo",
+                nucleo.integrar,
+                self.fx_input.text(),
+                float(self.a_input.text()),
+                float(self.b_input.text()),
+                n,
+                self.gx_input.text() if entre_curvas else None,
+                self.leer_semilla(),
+                error_objetivo=objetivo,
+                procesos=self.nucleos_spin.value(),
+                densidad=densidad,
+                al_avanzar=self.mostrar_avance,
+                al_terminar=self.mostrar_resultado,
+                padre=self,
+                boton=self.btn_simular,
+            )
 
-            self.figure.clear()
-            ax = self.figure.add_subplot(111)
-            ax.plot(x_vals, y_fx, label=f"f(x) = {self.fx_input.text()}", color='blue')
-            if self.tipo_combo.currentIndex() == 1:
-                y_gx = gx(x_vals)
-                ax.plot(x_vals, y_gx, label=f"g(x) = {self.gx_input.text()}", color='green')
-            ax.scatter(puntos_x, puntos_y, s=5, c=colores, alpha=0.5)
-            ax.set_title("Monte Carlo")
-            ax.legend()
+        except Exception as e:
+            QMessageBox.critical(self, "Error", str(e))
+
+    def ejecutar_multiple(self):
+        dimension = self.tipo_combo.currentIndex()
+        campos = [self.a_input, self.b_input, self.ya_input, self.yb_input, self.za_input, self.zb_input]
+        campos = campos[:2 * dimension] + [self.fx_input, self.num_input]
+        if any(not campo.text() for campo in campos):
+            QMessageBox.warning(self, "Campos incompletos", "Por favor completa todos los campos obligatorios.")
+            return
+        try:
+            valores = [float(campo.text().replace(",", ".")) for campo in campos[:2 * dimension]]
+            limites = list(zip(valores[::2], valores[1::2]))
+            objetivo = self.leer_objetivo()
+        except ValueError as e:
+            QMessageBox.critical(self, "Error", str(e))
+            return
+
+        self.vivo = {"n": [], "area": [], "error_estandar": []}
+        self.ultimo_dibujo = 0.0
+        ejecutor().enviar(
+            "Monte Carlo",
+            integrales_multiples.integrar,
+            self.fx_input.text(), limites, int(self.num_input.text()),
+            self.region_input.text() or None,
+            semilla=self.leer_semilla(),
+            error_objetivo=objetivo,
+            procesos=self.nucleos_spin.value(),
+            al_avanzar=self.mostrar_avance_multiple,
+            al_terminar=self.mostrar_resultado_multiple,
+            padre=self,
+            boton=self.btn_simular,
+        )
+
+    def mostrar_avance_multiple(self, estado):
+        self.mostrar_avance({**estado, "area": estado["valor"]})
+
+    def mostrar_resultado_multiple(self, resultado):
+        if resultado["exacta"] is None:
+            self.valor_exacto_label.setText("✅ Exacto: no disponible")
+            self.error_label.setText("📉 Error %: —")
+        else:
+            self.valor_exacto_label.setText(f"✅ Exacto: {resultado['exacta']:.6f}")
+            self.error_label.setText(f"📉 Error %: {resultado['error']:.2f}")
+        if resultado["objetivo_alcanzado"]:
+            self.error_label.setText(self.error_label.text() + " (objetivo alcanzado)")
+        self.mostrar_estimacion({**resultado, "area": resultado["valor"]})
+        self.dentro_label.setText(
+            f"🔵 En la región: {resultado['dentro']:,} / {resultado['n']:,} · "
+            f"volumen ≈ {resultado['volumen_region']:.4f} ± {resultado['error_volumen']:.1e}"
+        )
+        self.graficar_multiple(resultado)
+
+    @traza.medir("dibujo")
+    def graficar_multiple(self, resultado):
+        """Muestra de los puntos sorteados (azul en la región) y convergencia de la estimación."""
+        puntos, dentro = resultado["puntos"], resultado["puntos_dentro"]
+        limites = resultado["limites"]
+        self.figure.clear()
+        if len(limites) == 3:
+            ax = self.figure.add_subplot(121, projection="3d")
+            for mascara, color in ((dentro, "blue"), (~dentro, "red")):
+                ax.scatter(puntos[mascara, 0], puntos[mascara, 1], puntos[mascara, 2], s=2, color=color, alpha=0.3)
+            ax.set_zlabel("z")
+        else:
+            ax = self.figure.add_subplot(121)
+            for mascara, color in ((dentro, "blue"), (~dentro, "red")):
+                ax.scatter(puntos[mascara, 0], puntos[mascara, 1], s=4, color=color, alpha=0.4, rasterized=True)
+            ax.set_xlim(*limites[0])
+            ax.set_ylim(*limites[1])
             ax.grid(True)
-            self.canvas.draw()
+        ax.set_xlabel("x")
+        ax.set_ylabel("y")
+        ax.set_title("Región de integración")
+        historial = resultado["historial"]
+        self.graficar_convergencia(self.figure.add_subplot(122), {**historial, "area": historial["valor"]},
+                                   resultado["exacta"])
+        self.figure.tight_layout()
+        self.canvas.draw()
 
-        except Exception as e:
+    def leer_objetivo(self):
+        if not self.objetivo_input.text():
+            return None
+        return float(self.objetivo_input.text().replace(",", ".")) / 100
+
+    def leer_semilla(self):
+        return int(self.semilla_input.text()) if self.semilla_input.text() else None
+
+    @traza.operacion("Comparar estimadores")
+    def comparar_estimadores(self):
+        if not self.a_input.text() or not self.b_input.text() or not self.fx_input.text() or not self.num_input.text():
+            QMessageBox.warning(self, "Campos incompletos", "Por favor completa todos los campos obligatorios.")
+            return
+        entre_curvas = self.tipo_combo.currentIndex() == 1
+        if entre_curvas and not self.gx_input.text():
+            QMessageBox.warning(self, "Campos incompletos", "Debes ingresar también la función g(x).")
+            return
+        try:
+            a, b = float(self.a_input.text()), float(self.b_input.text())
+            objetivo = self.leer_objetivo()
+        except ValueError as e:
             QMessageBox.critical(self, "Error", str(e))
+            return
+
+        self.tabla_estimadores.setRowCount(0)
+        self.tabla_estimadores.show()
+        # Cada estimador gasta como mucho N evaluaciones; las filas aparecen a medida que terminan
+        ejecutor().enviar(
+            "Comparar estimadores",
+            estimadores.comparar,
+            self.fx_input.text(), a, b, int(self.num_input.text()),
+            self.gx_input.text() if entre_curvas else None,
+            densidad_texto=self.densidad_input.text() or None,
+            semilla=self.leer_semilla(),
+            error_objetivo=objetivo,
+            al_avanzar=self.agregar_fila_estimador,
+            al_terminar=self.mostrar_comparacion,
+            padre=self,
+            boton=self.btn_comparar,
+        )
+
+    def agregar_fila_estimador(self, fila):
+        fila_tabla = self.tabla_estimadores.rowCount()
+        self.tabla_estimadores.insertRow(fila_tabla)
+        objetivo = fila["segundos_objetivo"]
+        if objetivo is None:
+            texto_objetivo = "—"
+        else:
+            texto_objetivo = f"{objetivo:.3g}" + ("" if fila["objetivo_alcanzado"] else " (estimado)")
+        valores = [
+            fila["estimador"], f"{fila['valor']:.8f}", f"{fila['error_estandar']:.2e}", f"{fila['varianza']:.3e}",
+            f"{fila['evaluaciones']:,}", f"{fila['segundos']:.3f}", texto_objetivo,
+            f"{fila['error_real']:.4f}" if "error_real" in fila else "",
+        ]
+        for columna, valor in enumerate(valores):
+            self.tabla_estimadores.setItem(fila_tabla, columna, QTableWidgetItem(valor))
+
+    @traza.medir("tabla")
+    def mostrar_comparacion(self, resultado):
+        etiqueta = "Exacto (numérico)" if resultado["exacta_numerica"] else "Exacto"
+        self.valor_exacto_label.setText(f"✅ {etiqueta}: {resultado['exacta']:.6f}")
+        self.tabla_estimadores.setRowCount(0)
+        for fila in resultado["filas"]:
+            self.agregar_fila_estimador(fila)
+        self.tabla_estimadores.resizeColumnsToContents()
+        self.graficar_comparacion(resultado)
+
+    @traza.medir("dibujo")
+    def graficar_comparacion(self, resultado):
+        """Error estándar frente a evaluaciones de cada estimador (escala log-log)."""
+        self.figure.clear()
+        ax = self.figure.add_subplot(111)
+        for fila in resultado["filas"]:
+            historial = fila["historial"]
+            positivos = historial["error_estandar"] > 0
+            ax.plot(historial["evaluaciones"][positivos], historial["error_estandar"][positivos],
+                    marker=".", label=fila["estimador"])
+        ax.set_xscale("log")
+        ax.set_yscale("log")
+        ax.set_xlabel("Evaluaciones de la función")
+        ax.set_ylabel("Error estándar")
+        ax.set_title("Comparación de estimadores")
+        ax.legend(fontsize=8)
+        ax.grid(True, which="both", alpha=0.3)
+        self.figure.tight_layout()
+        self.canvas.draw()
+
+    def mostrar_estimacion(self, estado):
+        self.valor_mc_label.setText(f"🎯 Monte Carlo: {estado['area']:.6f}")
+        self.error_estandar_label.setText(f"± Error estándar: {estado['error_estandar']:.2e}")
+        self.ic_label.setText(f"📏 IC 95 %: [{estado['ic95'][0]:.6f}, {estado['ic95'][1]:.6f}]")
+        if "dentro" in estado:
+            self.dentro_label.setText(f"🔵 Dentro: {estado['dentro']:,} / {estado['n']:,}")
+
+    def mostrar_avance(self, estado):
+        """Resultados en vivo tras cada lote; la convergencia se redibuja unas pocas veces por segundo."""
+        self.mostrar_estimacion(estado)
+        # Si la envolvente se quedó corta, el muestreo vuelve a empezar
+        if self.vivo["n"] and estado["n"] <= self.vivo["n"][-1]:
+            for valores in self.vivo.values():
+                valores.clear()
+        for clave in self.vivo:
+            self.vivo[clave].append(estado[clave])
+        if time.perf_counter() - self.ultimo_dibujo > 0.3:
+            self.figure.clear()
+            self.graficar_convergencia(self.figure.add_subplot(111), self.vivo)
+            self.canvas.draw_idle()
+            self.ultimo_dibujo = time.perf_counter()
+
+    def mostrar_resultado(self, resultado):
+        etiqueta = "Exacto (numérico)" if resultado["exacta_numerica"] else "Exacto"
+        self.valor_exacto_label.setText(f"✅ {etiqueta}: {resultado['area_exacta']:.6f}")
+        self.mostrar_estimacion({"area": resultado["area_mc"], "error_estandar": resultado["error_estandar"],
+                                 "ic95": resultado["ic95"], "dentro": resultado["dentro"], "n": resultado["n"]})
+        self.dentro_label.setText(
+            self.dentro_label.text()
+            + f" · envolvente: {resultado['area_envolvente'] / resultado['area_rectangulo']:.1%} del rectángulo"
+        )
+        detenido = " (objetivo alcanzado)" if resultado["objetivo_alcanzado"] else ""
+        nucleos = f" · {resultado['procesos']} núcleos" if resultado["procesos"] > 1 else ""
+        self.error_label.setText(f"📉 Error %: {resultado['error']:.2f}{detenido}{nucleos}")
+        self.graficar(resultado)
+
+    @traza.medir("dibujo")
+    def graficar(self, resultado):
+        entre_curvas = resultado["y_gx"] is not None
+        self.figure.clear()
+        ax = self.figure.add_subplot(121)
+        ax.plot(resultado["x_vals"], resultado["y_fx"], label=f"f(x) = {self.fx_input.text()}", color='blue')
+        if entre_curvas:
+            ax.plot(resultado["x_vals"], resultado["y_gx"], label=f"g(x) = {self.gx_input.text()}", color='green')
+        envolvente = resultado["envolvente"]
+        ax.stairs(envolvente["superior"], envolvente["bordes"], baseline=envolvente["inferior"],
+                  color="gray", linewidth=0.8, label="Envolvente")
+        if resultado["densidad_dentro"] is not None:
+            self.graficar_densidad(ax, resultado)
+        else:
+            # Sólo llega una muestra de los puntos: azul dentro, rojo fuera
+            dentro = resultado["puntos_dentro"]
+            ax.scatter(resultado["puntos_x"][dentro], resultado["puntos_y"][dentro], s=5, color="blue", alpha=0.5,
+                       rasterized=True)
+            ax.scatter(resultado["puntos_x"][~dentro], resultado["puntos_y"][~dentro], s=5, color="red", alpha=0.5,
+                       rasterized=True)
+        ax.set_title("Monte Carlo")
+        ax.legend()
+        ax.grid(True)
+        self.graficar_convergencia(self.figure.add_subplot(122), resultado["historial"], resultado["area_exacta"])
+        self.figure.tight_layout()
+        self.canvas.draw()
+
+    def graficar_densidad(self, ax, resultado):
+        """Todos los puntos como imagen: el color mezcla azul (dentro) y rojo (fuera) según
+        la proporción de cada celda y la opacidad crece con el número de puntos."""
+        dentro = resultado["densidad_dentro"]
+        total = dentro + resultado["densidad_fuera"]
+        imagen = np.zeros(total.shape + (4,))
+        fraccion = dentro / np.maximum(total, 1)
+        imagen[..., 0] = 1 - fraccion
+        imagen[..., 2] = fraccion
+        maximo = total.max()
+        imagen[..., 3] = 0.6 * np.log1p(total) / np.log1p(maximo) if maximo else 0.0
+        a, b, ymin, ymax = resultado["rectangulo"]
+        ax.imshow(imagen, extent=(a, b, ymin, ymax), origin="lower", aspect="auto", interpolation="nearest")
+
+    def graficar_convergencia(self, ax, historial, exacta=None):
+        """Estimación frente a N con su banda del 95 %."""
+        n = np.asarray(historial["n"])
+        area = np.asarray(historial["area"])
+        banda = nucleo.Z_95 * np.asarray(historial["error_estandar"])
+        ax.plot(n, area, color="purple", label="Estimación")
+        ax.fill_between(n, area - banda, area + banda, color="purple", alpha=0.2, label="IC 95 %")
+        if exacta is not None:
+            ax.axhline(exacta, color="black", linestyle="--", linewidth=1, label="Exacto")
+        if len(n) > 1:
+            ax.set_xscale("log")
+            ax.xaxis.set_minor_formatter(NullFormatter())
+        ax.set_xlabel("N")
+        ax.set_title("Convergencia")
+        ax.legend()
+        ax.grid(True)
 
     def limpiar_campos(self):
         self.valor_exacto_label.setText("✅ Exacto:")
         self.valor_mc_label.setText("🎯 Monte Carlo:")
         self.error_label.setText("📉 Error %:")
         self.dentro_label.setText("🔵 Dentro:")
+        self.error_estandar_label.setText("± Error estándar:")
+        self.ic_label.setText("📏 IC 95 %:")
         self.a_input.clear()
         self.b_input.clear()
         self.fx_input.clear()
         self.gx_input.clear()
+        for campo in (self.ya_input, self.yb_input, self.za_input, self.zb_input, self.region_input):
+            campo.clear()
         self.num_input.clear()
+        self.objetivo_input.clear()
+        self.densidad_input.clear()
+        self.semilla_input.clear()
+        self.tabla_estimadores.setRowCount(0)
+        self.tabla_estimadores.hide()
         self.figure.clear()
         self.canvas.draw()
\ No newline at end of file
@@ -5,11 +5,13 @@ from PyQt5.QtWidgets import (
 )
 from PyQt5.QtCore import Qt
 from matplotlib.backends.backend_qt5agg import FigureCanvasQTAgg as FigureCanvas
-import matplotlib.pyplot as plt
-import math
-import numpy as np
+from matplotlib.figure import Figure
 import random
 
+from calcucho.core import traza
+from calcucho.core import aleatorios as nucleo
+from ui.trabajos import ejecutor
+
 
 class VistaNumerosAleatorios(QWidget):
     def __init__(self):
@@ -133,7 +135,7 @@ class VistaNumerosAleatorios(QWidget):
         self.tabla_resultados.setColumnCount(1)
         self.tabla_resultados.setHorizontalHeaderLabels(["Valor"])
 
-        self.canvas = FigureCanvas(plt.Figure())
+        self.canvas = FigureCanvas(Figure())
         self.canvas.figure.add_subplot(111)  # Para mostrar vacío al inicio
 
         self.layout().addWidget(box)
@@ -228,56 +230,59 @@ class VistaNumerosAleatorios(QWidget):
             if "semilla" in nombre.lower() or "x0" in nombre.lower():
                 campo.setText(str(random.randint(1000, 9999)))
 
+    @traza.operacion("Generador aleatorio")
     def generar(self):
         try:
             metodo = self.metodo_combo.currentText()
             dist = self.distribucion_combo.currentText()
             n = self.cantidad.value()
-            u = []
-
-            if metodo == "Cuadrados Medios":
-                u = self.cuadrados_medios(int(self.get_val("Semilla X0")), n)
-            elif metodo == "Productos Medios":
-                u = self.productos_medios(int(self.get_val("Semilla X0")), int(self.get_val("Semilla X1")), n)
-            elif metodo == "Congruencial Lineal":
-                u = self.congruencial_lineal(int(self.get_val("X0")), int(self.get_val("a")),
-                                             int(self.get_val("c")), int(self.get_val("m")), n)
-            elif metodo == "Congruencial Multiplicativo":
-                u = self.congruencial_multiplicativo(int(self.get_val("X0")), int(self.get_val("a")),
-                                                     int(self.get_val("m")), n)
-            elif metodo == "Mersenne Twister":
-                semilla = self.get_val("Semilla (opcional)", int, False)
-                if semilla is not None:
-                    np.random.seed(semilla)
-                u = list(np.random.random(n))
-            elif metodo == "Xorshift":
-                u = self.xorshift(int(self.get_val("Semilla")), n)
-            elif metodo == "Tausworthe":
-                u = self.tausworthe(int(self.get_val("Semilla")), n)
-
-            if dist == "Uniforme":
-                r = self.dist_uniforme(u, self.get_val("a (inicio)"), self.get_val("b (fin)"))
-            elif dist == "Exponencial":
-                r = self.dist_exponencial(u, self.get_val("Lambda λ"))
-            elif dist == "Normal":
-                r = self.dist_normal(u, self.get_val("Media μ"), self.get_val("Desviación σ"))
-            elif dist == "Poisson":
-                r = self.dist_poisson(u, self.get_val("Lambda λ"))
-            elif dist == "Binomial":
-                r = self.dist_binomial(u, self.get_val("n"), self.get_val("Probabilidad p"))
-            else:
-                r = u
 
-            self.mostrar_resultados(r)
+            # Campos de cada método -> parámetros del núcleo
+            if metodo == "Mersenne Twister":
+                parametros = {"semilla": self.get_val("Semilla (opcional)", int, False)}
+            else:
+                campos_metodo = {
+                    "Cuadrados Medios": {"x0": "Semilla X0"},
+                    "Productos Medios": {"x0": "Semilla X0", "x1": "Semilla X1"},
+                    "Congruencial Lineal": {"x0": "X0", "a": "a", "c": "c", "m": "m"},
+                    "Congruencial Multiplicativo": {"x0": "X0", "a": "a", "m": "m"},
+                    "Xorshift": {"semilla": "Semilla"},
+                    "Tausworthe": {"semilla": "Semilla"},
+                }[metodo]
+                parametros = {clave: int(self.get_val(campo)) for clave, campo in campos_metodo.items()}
+            campos_dist = {
+                "Uniforme": {"a": "a (inicio)", "b": "b (fin)"},
+                "Exponencial": {"lamb": "Lambda λ"},
+                "Normal": {"mu": "Media μ", "sigma": "Desviación σ"},
+                "Binomial": {"n": "n", "p": "Probabilidad p"},
+                "Poisson": {"lamb": "Lambda λ"},
+            }.get(dist, {})
+            ejecutor().enviar(
+                "Generador aleatorio",
+                nucleo.generar, metodo, n, parametros,
+                dist if campos_dist else None,
+                {clave: self.get_val(campo) for clave, campo in campos_dist.items()},
+                al_terminar=self.mostrar_resultados,
+                al_fallar=lambda e: QMessageBox.critical(
+                    self, "Error crítico", f"Ocurrió un error inesperado:\n{str(e)}"),
+                boton=self.boton_calcular,
+            )
 
         except Exception as e:
             QMessageBox.critical(self, "Error crítico", f"Ocurrió un error inesperado:\n{str(e)}")
 
     def mostrar_resultados(self, lista):
+        self.llenar_tabla(lista)
+        self.graficar(lista)
+
+    @traza.medir("tabla")
+    def llenar_tabla(self, lista):
         self.tabla_resultados.setRowCount(len(lista))
         for i, val in enumerate(lista):
             self.tabla_resultados.setItem(i, 0, QTableWidgetItem(str(round(val, 4))))
 
+    @traza.medir("dibujo")
+    def graficar(self, lista):
         self.canvas.figure.clear()
         ax = self.canvas.figure.add_subplot(111)
         ax.plot(range(len(lista)), lista, color='orange', linestyle='-', marker='o')
@@ -293,65 +298,3 @@ class VistaNumerosAleatorios(QWidget):
         self.tabla_resultados.setRowCount(0)
         self.canvas.figure.clear()
         self.canvas.draw()
-
-    # Métodos de generación (sin cambios)
-    def cuadrados_medios(self, x0, n):
-        r = []
-        for _ in range(n):
-            x0 = str(int(x0)**2).zfill(8)
-            medio = int(x0[2:6])
-            r.append(medio / 10000)
-            x0 = medio
-        return r
-
-    def productos_medios(self, x0, x1, n):
-        r = []
-        for _ in range(n):
-            prod = str(x0 * x1).zfill(8)
-            medio = int(prod[2:6])
-            r.append(medio / 10000)
-            x0, x1 = x1, medio
-        return r
-
-    def congruencial_lineal(self, x0, a, c, m, n):
-        return [(x0 := (a * x0 + c) % m) / m for _ in range(n)]
-
-    def congruencial_multiplicativo(self, x0, a, m, n):
-        return [(x0 := (a * x0) % m) / m for _ in range(n)]
-
-    def xorshift(self, x, n):
-        r = []
-        for _ in range(n):
-            x ^= (x << 13) & 0xFFFFFFFF
-            x ^= (x >> 17)
-            x ^= (x << 5) & 0xFFFFFFFF
-            r.append((x % 10000) / 10000)
-        return r
-
-    def tausworthe(self, s, n):
-        r = []
-        for _ in range(n):
-            s = ((s << 1) ^ ((s >> 31) * 0x8ebfd028)) & 0xFFFFFFFF
-            r.append((s % 10000) / 10000)
-        return r
-
-    # Distribuciones
-    def dist_uniforme(self, u, a, b): return [round(a + (b - a) * x, 4) for x in u]
-    def dist_exponencial(self, u, lamb): return [round(-math.log(x) / lamb, 4) for x in u if x > 0]
-    def dist_normal(self, u, mu, sigma):
-        z = []
-        for i in range(0, len(u) - 1, 2):
-            z1 = math.sqrt(-2 * math.log(u[i])) * math.cos(2 * math.pi * u[i + 1])
-            z.append(round(mu + sigma * z1, 4))
-        return z
-    def dist_poisson(self, u, lamb):
-        r = []
-        for ui in u:
-            L, k, p = math.exp(-lamb), 0, 1
-            while p >= L:
-                k += 1
-                p *= ui
-            r.append(k - 1)
-        return r
-    def dist_binomial(self, u, n, p):
-        return [sum(1 for _ in range(int(n)) if x <= p) for x in u]
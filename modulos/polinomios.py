@@ -4,30 +4,19 @@ from PyQt5.QtWidgets import (
 )
 from PyQt5.QtCore import Qt, QRegExp
 from PyQt5.QtGui import QRegExpValidator
-from sympy import symbols, sympify, integrate, diff
 import re
 
-x = symbols('x')
-
-# --- Lógica de operaciones con polinomios ---
-class PolinomioMayor:
-    @staticmethod
-    def sumar(p1, p2): return p1 + p2
-    @staticmethod
-    def restar(p1, p2): return p1 - p2
-    @staticmethod
-    def multiplicar(p1, p2): return p1 * p2
-    @staticmethod
-    def derivar(p, variable): return diff(p, variable)
-    @staticmethod
-    def integrar(p): return integrate(p, x)
-    @staticmethod
-    def evaluar(p, valor): return p.subs(x, valor)
+from calcucho.core import traza
+from calcucho.core import polinomios as nucleo
+from calcucho.core import simbolico
+from ui.trabajos import ejecutor
 
 # --- Interfaz gráfica del módulo ---
 class PolinomiosModule(QWidget):
     def __init__(self):
         super().__init__()
+        # El proceso de sympy arranca mientras el usuario escribe
+        simbolico.precalentar()
         self.setLayout(QVBoxLayout())
         self.operacion_actual = None
         self.botones_operacion = {}
@@ -279,6 +268,7 @@ class PolinomiosModule(QWidget):
             self.entrada2.clear()
 
     # --- Ejecutar operación seleccionada ---
+    @traza.operacion("Polinomios")
     def ejecutar_operacion(self):
         if not self.operacion_actual:
             QMessageBox.warning(self, "Falta seleccionar", "Selecciona primero una operación.")
@@ -320,12 +310,8 @@ class PolinomiosModule(QWidget):
                 QMessageBox.warning(self, "Entrada inválida", f"El Polinomio {idx} contiene una expresión no válida.")
                 return None, None
 
-        # Agregar multiplicación implícita (2x → 2*x)
-        texto1 = re.sub(r'(?<=\d)(?=[a-zA-Z])', '*', texto1)
-        texto2 = re.sub(r'(?<=\d)(?=[a-zA-Z])', '*', texto2)
-
         try:
-            p1 = sympify(texto1)
+            p1 = nucleo.parsear(texto1)
         except Exception as e:
             QMessageBox.critical(self, "Error", f"Polinomio 1 inválido:\n{e}")
             return None, None
@@ -333,7 +319,7 @@ class PolinomiosModule(QWidget):
         p2 = None
         if texto2:
             try:
-                p2 = sympify(texto2)
+                p2 = nucleo.parsear(texto2)
             except Exception as e:
                 QMessageBox.critical(self, "Error", f"Polinomio 2 inválido:\n{e}")
                 return None, None
@@ -354,13 +340,9 @@ class PolinomiosModule(QWidget):
                 QMessageBox.warning(self, "Entrada inválida", f"El Polinomio {idx} contiene una expresión incompleta.")
                 return None, None
 
-        # Insertar multiplicación implícita
-        texto1 = re.sub(r'(?<=\d)(?=[a-zA-Z])', '*', texto1)
-        texto2 = re.sub(r'(?<=\d)(?=[a-zA-Z])', '*', texto2)
-
         try:
-            p1 = sympify(texto1)
-            p2 = sympify(texto2)
+            p1 = nucleo.parsear(texto1)
+            p2 = nucleo.parsear(texto2)
             return p1, p2
         except Exception as e:
             QMessageBox.critical(self, "Error", f"Error al interpretar los polinomios:\n{e}")
@@ -368,23 +350,35 @@ class PolinomiosModule(QWidget):
 
 
     # --- Operaciones ---
+    def enviar(self, operacion, *args, al_terminar=None, error="Error", **kwargs):
+        """Calcula ``nucleo.operar`` en segundo plano y muestra el resultado."""
+        ejecutor().enviar(
+            "Polinomios",
+            nucleo.operar, operacion, *args,
+            al_terminar=al_terminar or (lambda r: self.resultado.setText(str(r))),
+            al_fallar=lambda e: QMessageBox.critical(self, "Error", f"{error}:\n{e}"),
+            boton=self.boton_ejecutar,
+            **kwargs,
+        )
+
     def sumar(self):
         p1, p2 = self.obtener_dos_polinomios_obligatorios()
         if p1 and p2:
-            resultado = PolinomioMayor.sumar(p1, p2)
-            self.resultado.setText(f"<div align='center'>{resultado}</div>")
-            self.resultado.moveCursor(self.resultado.textCursor().Start)
+            self.enviar("sumar", p1, p2, al_terminar=self.mostrar_suma)
+
+    def mostrar_suma(self, resultado):
+        self.resultado.setText(f"<div align='center'>{resultado}</div>")
+        self.resultado.moveCursor(self.resultado.textCursor().Start)
 
     def restar(self):
         p1, p2 = self.obtener_dos_polinomios_obligatorios()
         if p1 and p2:
-            self.resultado.setText(str(PolinomioMayor.restar(p1, p2)))
+            self.enviar("restar", p1, p2)
 
     def multiplicar(self):
         p1, p2 = self.obtener_dos_polinomios_obligatorios()
         if p1 and p2:
-            resultado = PolinomioMayor.multiplicar(p1, p2).expand()
-            self.resultado.setText(str(resultado))
+            self.enviar("multiplicar", p1, p2)
 
     def derivar(self):
         p1, _ = self.obtener_polinomios()
@@ -396,23 +390,14 @@ class PolinomiosModule(QWidget):
             QMessageBox.warning(self, "Falta variable", "Debes ingresar la variable respecto a la cual derivar.")
             return
 
-        try:
-            simbolo = symbols(variable)
-            resultado = PolinomioMayor.derivar(p1, simbolo)
-            self.resultado.setText(str(resultado))
-        except Exception as e:
-            QMessageBox.critical(self, "Error", f"Variable inválida:\n{e}")
+        self.enviar("derivar", p1, variable=variable, error="Variable inválida")
 
     def integrar(self):
         p1, _ = self.obtener_polinomios()
         if not p1:
             return  # Evita continuar si hubo error
 
-        try:
-            resultado = PolinomioMayor.integrar(p1)
-            self.resultado.setText(str(resultado))
-        except Exception as e:
-            QMessageBox.critical(self, "Error", f"Error al integrar:\n{e}")
+        self.enviar("integrar", p1, error="Error al integrar")
 
 
     def evaluar(self):
@@ -426,10 +411,8 @@ class PolinomiosModule(QWidget):
             return
 
         try:
-            val = float(texto_valor)
-            resultado = PolinomioMayor.evaluar(p1, val)
-            if resultado.is_number:
-                resultado = round(float(resultado), 3)
-            self.resultado.setText(str(resultado))
+            valor = float(texto_valor)
         except Exception as e:
             QMessageBox.critical(self, "Error", f"Valor inválido:\n{e}")
+            return
+        self.enviar("evaluar", p1, valor=valor, error="Valor inválido")
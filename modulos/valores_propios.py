@@ -4,12 +4,18 @@ from PyQt5.QtWidgets import (
     QMessageBox, QGroupBox, QFormLayout, QTextEdit
 )
 from PyQt5.QtCore import Qt
-from sympy import Matrix, exp, symbols, simplify
+
+from calcucho.core import simbolico
+from calcucho.core import traza
+from calcucho.core import valores_propios as nucleo
+from ui.trabajos import ejecutor
 
 
 class SistemaEcuacionesAnalitico(QWidget):
     def __init__(self):
         super().__init__()
+        # El proceso de sympy arranca mientras el usuario escribe
+        simbolico.precalentar()
         self.setLayout(QVBoxLayout())
         self.setStyleSheet("""
             QWidget { background-color: #e8f5f2; }
@@ -60,7 +66,6 @@ class SistemaEcuacionesAnalitico(QWidget):
             }
         """)
 
-        self.t = symbols('t')
         self.init_ui()
 
     def init_ui(self):
@@ -137,6 +142,7 @@ class SistemaEcuacionesAnalitico(QWidget):
         self.tabla_condicion.setRowCount(n)
         self.tabla_condicion.setColumnCount(1)
 
+    @traza.operacion("Valores propios")
     def calcular(self):
         try:
             # Validar Δt
@@ -180,51 +186,52 @@ class SistemaEcuacionesAnalitico(QWidget):
                     QMessageBox.warning(self, "⚠️ Valor inválido", f"Y(0) fila {i+1} no es numérico.")
                     return
 
-            A = Matrix(A_list)
-            Y0 = Matrix(Y0_list)
-
-            # Diagonalizar
-            try:
-                P, D = A.diagonalize()
-            except:
-                QMessageBox.critical(self, "❌ No diagonalizable", "La matriz A no se puede diagonalizar.")
-                return
-
-            # Valores y vectores propios
-            vals = D.diagonal()
-            vecs = [P.col(i) for i in range(P.cols)]
-            html = "<b>• Valores propios:</b><br>" + "<br>".join(
-                [f"λ{i+1} = {round(v.evalf(), 4)}" for i, v in enumerate(vals)]
+            ejecutor().enviar(
+                "Valores propios",
+                nucleo.resolver, A_list, Y0_list, h, n_iter,
+                al_terminar=self.mostrar_resultado,
+                al_fallar=self.mostrar_error,
+                boton=self.btn_calc,
             )
-            html += "<br><br><b>• Vectores propios:</b><br>"
-            for i, vec in enumerate(vecs):
-                html += f"v{i+1} =<br>"
-                for v in vec:
-                    html += f"[ {round(v.evalf(),4):>7} ]<br>"
-                html += "<br>"
-            self.propios_texto.setHtml(html)
-
-            # Cálculo de la solución
-            resultados = []
-            for k in range(n_iter + 1):
-                t_val = round(k * h, 3)
-                Yt = simplify(P * exp(D * t_val) * P.inv() * Y0)
-                resultados.append([t_val] + [round(y.evalf(), 4) for y in Yt])
-
-            # Mostrar en tabla
-            self.tabla_resultados.setColumnCount(n + 1)
-            self.tabla_resultados.setRowCount(len(resultados))
-            self.tabla_resultados.setHorizontalHeaderLabels(["t"] + [f"y{i+1}" for i in range(n)])
-            self.tabla_resultados.setVerticalHeaderLabels([str(i+1) for i in range(len(resultados))])
-            for i, fila in enumerate(resultados):
-                for j, val in enumerate(fila):
-                    it = QTableWidgetItem(str(val))
-                    it.setTextAlignment(Qt.AlignCenter)
-                    self.tabla_resultados.setItem(i, j, it)
 
         except Exception as e:
             QMessageBox.critical(self, "Error", f"Ocurrió un error inesperado:\n{e}")
 
+    def mostrar_error(self, e):
+        if isinstance(e, ValueError):
+            QMessageBox.critical(self, "❌ No diagonalizable", str(e))
+        else:
+            QMessageBox.critical(self, "Error", f"Ocurrió un error inesperado:\n{e}")
+
+    def mostrar_resultado(self, solucion):
+        # Valores y vectores propios
+        html = "<b>• Valores propios:</b><br>" + "<br>".join(
+            [f"λ{i+1} = {v}" for i, v in enumerate(solucion["valores"])]
+        )
+        html += "<br><br><b>• Vectores propios:</b><br>"
+        for i, vec in enumerate(solucion["vectores"]):
+            html += f"v{i+1} =<br>"
+            for v in vec:
+                html += f"[ {v:>7} ]<br>"
+            html += "<br>"
+        if solucion["numerico"]:
+            html = ("<i>La diagonalización simbólica superó el tiempo límite; "
+                    "se muestran valores numéricos.</i><br><br>") + html
+        self.propios_texto.setHtml(html)
+        self.llenar_tabla(solucion["resultados"], len(solucion["valores"]))
+
+    @traza.medir("tabla")
+    def llenar_tabla(self, resultados, n):
+        self.tabla_resultados.setColumnCount(n + 1)
+        self.tabla_resultados.setRowCount(len(resultados))
+        self.tabla_resultados.setHorizontalHeaderLabels(["t"] + [f"y{i+1}" for i in range(n)])
+        self.tabla_resultados.setVerticalHeaderLabels([str(i+1) for i in range(len(resultados))])
+        for i, fila in enumerate(resultados):
+            for j, val in enumerate(fila):
+                it = QTableWidgetItem(str(val))
+                it.setTextAlignment(Qt.AlignCenter)
+                self.tabla_resultados.setItem(i, j, it)
+
     def limpiar(self):
         self.incremento.clear()
         self.propios_texto.clear()
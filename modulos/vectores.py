@@ -4,20 +4,11 @@ from PyQt5.QtWidgets import (
 )
 from PyQt5.QtCore import Qt, QRegExp
 from PyQt5.QtGui import QRegExpValidator
-import numpy as np
 
+from calcucho.core import traza
+from calcucho.core import vectores as nucleo
+from ui.trabajos import ejecutor
 
-class VectorMayor:
-    @staticmethod
-    def suma(v1, v2): return np.add(v1, v2)
-    @staticmethod
-    def resta(v1, v2): return np.subtract(v1, v2)
-    @staticmethod
-    def magnitud(v): return np.linalg.norm(v)
-    @staticmethod
-    def producto_punto(v1, v2): return np.dot(v1, v2)
-    @staticmethod
-    def producto_cruzado(v1, v2): return np.cross(v1, v2)
 
 class VectoresModule(QWidget):
     def __init__(self):
@@ -207,24 +198,14 @@ class VectoresModule(QWidget):
 
     def leer_vector(self, entrada: QLineEdit):
         entrada.setStyleSheet("")  # Reset visual
-        texto = entrada.text().strip()
-
-        if not texto:
-            entrada.setStyleSheet("background-color: #ffcccc;")
-            raise ValueError("No puede dejar el campo vacío.")
-
-        if ",," in texto or texto.endswith(",") or texto.startswith(","):
-            entrada.setStyleSheet("background-color: #ffcccc;")
-            raise ValueError("Formato inválido: no uses comas duplicadas o al inicio/final.")
-
         try:
-            valores = [float(x.strip()) for x in texto.split(",") if x.strip()]
-            return np.array(valores)
-        except:
+            return nucleo.leer_vector(entrada.text())
+        except ValueError:
             entrada.setStyleSheet("background-color: #ffcccc;")
-            raise ValueError("Solo se permiten números separados por comas.")
+            raise
 
 
+    @traza.operacion("Vectores")
     def ejecutar(self):
         if not self.operacion_actual:
             QMessageBox.warning(self, "Error", "Selecciona primero una operación.")
@@ -232,47 +213,36 @@ class VectoresModule(QWidget):
 
         try:
             v1 = self.leer_vector(self.entrada1)
+            v2 = None
 
-            if self.operacion_actual in ["suma", "resta", "punto", "cruzado"]:
+            if self.operacion_actual in nucleo.NECESITAN_DOS:
                 v2 = self.leer_vector(self.entrada2)
-
-                # Validar longitud igual (excepto para producto cruzado)
-                if self.operacion_actual != "cruzado" and len(v1) != len(v2):
+                try:
+                    nucleo.validar_dimensiones(self.operacion_actual, v1, v2)
+                except ValueError:
                     self.entrada1.setStyleSheet("background-color: #ffcccc;")
                     self.entrada2.setStyleSheet("background-color: #ffcccc;")
-                    raise ValueError("Los vectores deben tener la misma longitud.")
+                    raise
 
-                # Validar que los vectores para cruzado sean 3D
-                if self.operacion_actual == "cruzado":
-                    if len(v1) != 3 or len(v2) != 3:
-                        self.entrada1.setStyleSheet("background-color: #ffcccc;")
-                        self.entrada2.setStyleSheet("background-color: #ffcccc;")
-                        raise ValueError("El producto cruzado solo aplica a vectores 3D.")
-
-
-            if self.operacion_actual == "suma":
-                resultado = VectorMayor.suma(v1, v2)
-            elif self.operacion_actual == "resta":
-                resultado = VectorMayor.resta(v1, v2)
-            elif self.operacion_actual == "magnitud":
-                resultado = round(VectorMayor.magnitud(v1), 3)
-            elif self.operacion_actual == "punto":
-                resultado = VectorMayor.producto_punto(v1, v2)
-            elif self.operacion_actual == "cruzado":
-                if len(v1) != 3 or len(v2) != 3:
-                    raise ValueError("El producto cruzado solo se puede aplicar a vectores 3D.")
-                resultado = VectorMayor.producto_cruzado(v1, v2)
-
-            self.resultado.setHtml(f"""
-                <div align='center'>
-                    <span style='font-size:16pt;'>{resultado}</span>
-                </div>
-            """)
-            self.resultado.moveCursor(self.resultado.textCursor().Start)
+            ejecutor().enviar(
+                "Vectores",
+                nucleo.operar, self.operacion_actual, v1, v2,
+                al_terminar=self.mostrar_resultado,
+                padre=self,
+                boton=self.boton_ejecutar,
+            )
 
         except Exception as e:
             QMessageBox.critical(self, "Error", str(e))
 
+    def mostrar_resultado(self, resultado):
+        self.resultado.setHtml(f"""
+            <div align='center'>
+                <span style='font-size:16pt;'>{resultado}</span>
+            </div>
+        """)
+        self.resultado.moveCursor(self.resultado.textCursor().Start)
+
     def limpiar(self):
         self.entrada1.clear()
         self.entrada2.clear()
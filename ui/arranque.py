@@ -0,0 +1,68 @@
+"""Pantalla de inicio y carga progresiva de los módulos.
+
+La ventana se muestra en cuanto se puede; luego ``Precarga`` importa las
+bibliotecas pesadas en un hilo y, cuando terminan, construye entre eventos el
+último módulo que usó el usuario. Los demás se construyen cuando se eligen:
+casi siempre se abren uno o dos.
+"""
+import importlib
+import threading
+
+from PyQt5.QtCore import QObject, QTimer, Qt
+from PyQt5.QtGui import QPixmap, QColor
+from PyQt5.QtWidgets import QSplashScreen
+
+# Bibliotecas que se importan en segundo plano (sin Qt: se importan fuera del hilo de la interfaz)
+BIBLIOTECAS = ("numpy", "sympy", "matplotlib.figure", "matplotlib.backends.backend_agg", "scipy.integrate")
+
+
+def mostrar_splash(ruta_imagen):
+    """Muestra la pantalla de inicio y cierra la del cargador de PyInstaller, si la hay."""
+    splash = QSplashScreen(QPixmap(ruta_imagen))
+    splash.show()
+    splash.showMessage("Cargando...", Qt.AlignBottom | Qt.AlignLeft, QColor("#2c3e50"))
+    try:
+        import pyi_splash  # Sólo existe en el ejecutable con Splash en el .spec
+        pyi_splash.close()
+    except ImportError:
+        pass
+    return splash
+
+
+def _importar_bibliotecas():
+    for nombre in BIBLIOTECAS:
+        try:
+            importlib.import_module(nombre)
+        except ImportError:
+            pass
+
+
+class Precarga(QObject):
+    """Construye en orden los módulos de ``nombres`` sin bloquear la interfaz."""
+
+    def __init__(self, ventana, nombres):
+        super().__init__(ventana)
+        self.ventana = ventana
+        self.pendientes = list(nombres)
+        self.hilo = threading.Thread(target=_importar_bibliotecas, daemon=True)
+
+    def iniciar(self):
+        self.hilo.start()
+        QTimer.singleShot(50, self._siguiente)
+
+    def _siguiente(self):
+        # Construir un widget mientras el hilo importa obligaría a esperar su cerrojo de importación
+        if self.hilo.is_alive():
+            QTimer.singleShot(50, self._siguiente)
+            return
+        while self.pendientes:
+            nombre = self.pendientes.pop(0)
+            if nombre in self.ventana.instancias:
+                continue
+            try:
+                self.ventana.obtener_modulo(nombre)
+            except Exception:
+                pass  # El error se mostrará si el usuario elige ese módulo
+            break
+        if self.pendientes:
+            QTimer.singleShot(0, self._siguiente)
@@ -0,0 +1,92 @@
+"""Dibujo en memoria de fórmulas LaTeX (mathtext de matplotlib) como QPixmap.
+
+Se reutiliza una sola figura de Agg, sin pyplot ni archivos temporales: el
+texto se dibuja, la figura se ajusta a su tamaño y el búfer RGBA se copia a un
+``QImage``. Las imágenes se guardan en una caché LRU indexada por el código
+LaTeX y la altura pedida.
+"""
+from collections import OrderedDict
+
+from PyQt5.QtCore import Qt
+from PyQt5.QtGui import QImage, QPixmap
+
+# Imágenes que se conservan
+CAPACIDAD = 64
+
+# Tamaño de letra y resolución con que se dibuja antes de escalar
+TAMANO_LETRA = 30
+DPI = 100
+# Margen alrededor del texto, en píxeles
+MARGEN = 12
+
+
+class RenderizadorLatex:
+    def __init__(self, capacidad=CAPACIDAD):
+        self.capacidad = capacidad
+        self.imagenes = OrderedDict()
+        self._figura = None
+        self._texto = None
+
+    def _preparar(self):
+        from matplotlib.figure import Figure
+        from matplotlib.backends.backend_agg import FigureCanvasAgg
+
+        self._figura = Figure(dpi=DPI)
+        self._figura.patch.set_alpha(0)
+        FigureCanvasAgg(self._figura)
+        self._texto = self._figura.text(0.5, 0.5, "", fontsize=TAMANO_LETRA, ha="center", va="center")
+
+    def _dibujar(self, latex):
+        """Devuelve un QImage del tamaño justo del texto (más el margen)."""
+        import numpy as np
+
+        if self._figura is None:
+            self._preparar()
+        figura, canvas = self._figura, self._figura.canvas
+        # Cada línea es una fórmula aparte (mathtext no admite saltos dentro de $...$)
+        self._texto.set_text("\n".join(f"${linea}$" for linea in latex.split("\n")))
+
+        # Primero se mide el texto y luego se dibuja con la figura a su medida
+        try:
+            caja = self._texto.get_window_extent(canvas.get_renderer())
+        except ValueError as e:
+            raise ValueError(f"No se pudo dibujar el resultado: {e}")
+        ancho = (caja.width + 2 * MARGEN) / DPI
+        alto = (caja.height + 2 * MARGEN) / DPI
+        figura.set_size_inches(ancho, alto)
+        canvas.draw()
+
+        buffer = np.asarray(canvas.buffer_rgba())
+        alto_px, ancho_px = buffer.shape[:2]
+        # copy(): el QImage no debe depender del búfer, que se reutiliza en el siguiente dibujo
+        return QImage(buffer.tobytes(), ancho_px, alto_px, 4 * ancho_px, QImage.Format_RGBA8888).copy()
+
+    def pixmap(self, latex, altura=None, ancho=None):
+        """QPixmap de ``latex`` (sin los $, una fórmula por línea), reducido para caber en ``ancho`` × ``altura``."""
+        clave = (latex, altura, ancho)
+        imagen = self.imagenes.get(clave)
+        if imagen is None:
+            imagen = QPixmap.fromImage(self._dibujar(latex))
+            maximo_alto = altura or imagen.height()
+            maximo_ancho = ancho or imagen.width()
+            if imagen.height() > maximo_alto or imagen.width() > maximo_ancho:
+                imagen = imagen.scaled(maximo_ancho, maximo_alto, Qt.KeepAspectRatio, Qt.SmoothTransformation)
+            self.imagenes[clave] = imagen
+            while len(self.imagenes) > self.capacidad:
+                self.imagenes.popitem(last=False)
+        self.imagenes.move_to_end(clave)
+        return imagen
+
+    def limpiar(self):
+        self.imagenes.clear()
+
+
+_renderizador = None
+
+
+def pixmap(latex, altura=None, ancho=None):
+    """Dibuja ``latex`` con el renderizador compartido (sólo desde el hilo de la interfaz)."""
+    global _renderizador
+    if _renderizador is None:
+        _renderizador = RenderizadorLatex()
+    return _renderizador.pixmap(latex, altura, ancho)
@@ -1,27 +1,19 @@
 from PyQt5.QtWidgets import (
     QMainWindow, QPushButton, QLabel, QVBoxLayout,
-    QWidget, QStackedWidget, QHBoxLayout, QSizePolicy
+    QWidget, QStackedWidget, QHBoxLayout, QSizePolicy, QMessageBox,
+    QProgressBar, QFileDialog
 )
 from PyQt5.QtGui import QIcon
-from PyQt5.QtCore import Qt, QSize
+from PyQt5.QtCore import Qt, QSize, QSettings
 
-from modulos.inicio import ZigZagFondo
-from modulos.matrices import MatricesModule
-from modulos.polinomios import PolinomiosModule
-from modulos.vectores import VectoresModule
-from modulos.graficas import GraficasModule
-from modulos.calculo import DerivacionIntegracionModule
-from modulos.ecuaciones_diferenciales import EcuacionesDiferencialesModule
-from modulos.valores_propios import SistemaEcuacionesAnalitico
-from modulos.numeros_aleatorios import VistaNumerosAleatorios
-from modulos.modelo_rt import ModeloRt
-from modulos.montecarlos import VistaMonteCarlo
-
-
-from modulos.acerca_de import AcercaDeModule
+from calcucho.core import expresiones, memo, traza
+from ui.perfil import perfil_activo
+from ui.trabajos import ejecutor
 
+import importlib
 import sys
 import os
+import time
 
 def ruta_recurso(rel_path):
     """Devuelve la ruta al recurso, compatible con PyInstaller."""
@@ -29,6 +21,26 @@ def ruta_recurso(rel_path):
         return os.path.join(sys._MEIPASS, rel_path)
     return os.path.join(os.path.abspath("."), rel_path)
 
+
+# Registro de módulos del menú: nombre -> (ícono, módulo Python, clase del widget).
+# Los widgets (y sus dependencias: sympy, matplotlib, scipy) se importan y se
+# construyen la primera vez que se selecciona su entrada en el menú.
+REGISTRO_MODULOS = {
+    "Inicio": ("img/iconos/inicio.ico", "modulos.inicio", "ZigZagFondo"),
+    "Matrices": ("img/iconos/matriz.ico", "modulos.matrices", "MatricesModule"),
+    "Polinomios": ("img/iconos/polinomio.ico", "modulos.polinomios", "PolinomiosModule"),
+    "Vectores": ("img/iconos/vector.ico", "modulos.vectores", "VectoresModule"),
+    "Gráficas 2D y 3D": ("img/iconos/grafica.ico", "modulos.graficas", "GraficasModule"),
+    "Derivación e Integración": ("img/iconos/calculo.ico", "modulos.calculo", "DerivacionIntegracionModule"),
+    "Diferenciales": ("img/iconos/diferenciales.ico", "modulos.ecuaciones_diferenciales", "EcuacionesDiferencialesModule"),
+    "Vectores y Valores Propios": ("img/iconos/valores_vectores.ico", "modulos.valores_propios", "SistemaEcuacionesAnalitico"),
+    "Generador Aleatorio": ("img/iconos/numeros_aleatorios.ico", "modulos.numeros_aleatorios", "VistaNumerosAleatorios"),
+    "Modelo Epidémico Rₜ": ("img/iconos/epidemia.ico", "modulos.modelo_rt", "ModeloRt"),
+    "Montecarlo": ("img/iconos/montecarlos.ico", "modulos.montecarlos", "VistaMonteCarlo"),
+
+    "Acerca de": ("img/iconos/acerca_de.ico", "modulos.acerca_de", "AcercaDeModule"),
+}
+
 class MainWindow(QMainWindow):
     def __init__(self):
         super().__init__()
@@ -79,25 +91,14 @@ class MainWindow(QMainWindow):
             }
         """
 
-        # Diccionario de módulos con rutas a íconos
+        # Diccionario de módulos con rutas a íconos; los widgets se crean bajo demanda
         self.modulos = {
-            "Inicio": (ruta_recurso("img/iconos/inicio.ico"), ZigZagFondo()),
-            "Matrices": (ruta_recurso("img/iconos/matriz.ico"), MatricesModule()),
-            "Polinomios": (ruta_recurso("img/iconos/polinomio.ico"), PolinomiosModule()),
-            "Vectores": (ruta_recurso("img/iconos/vector.ico"), VectoresModule()),
-            "Gráficas 2D y 3D": (ruta_recurso("img/iconos/grafica.ico"), GraficasModule()),
-            "Derivación e Integración": (ruta_recurso("img/iconos/calculo.ico"), DerivacionIntegracionModule()),
-            "Diferenciales": (ruta_recurso("img/iconos/diferenciales.ico"), EcuacionesDiferencialesModule()),
-            "Vectores y Valores Propios": ("img/iconos/valores_vectores.ico", SistemaEcuacionesAnalitico()),
-            "Generador Aleatorio": (ruta_recurso("img/iconos/numeros_aleatorios.ico"), VistaNumerosAleatorios()),
-            "Modelo Epidémico Rₜ": (ruta_recurso("img/iconos/epidemia.ico"), ModeloRt()),
-            "Montecarlo": (ruta_recurso("img/iconos/montecarlos.ico"), VistaMonteCarlo()),
-
-            "Acerca de": (ruta_recurso("img/iconos/acerca_de.ico"), AcercaDeModule())
+            nombre: (ruta_recurso(icono), ruta_modulo, nombre_clase)
+            for nombre, (icono, ruta_modulo, nombre_clase) in REGISTRO_MODULOS.items()
         }
+        self.instancias = {}
 
-
-        for nombre, (icono_path, modulo) in self.modulos.items():
+        for nombre, (icono_path, _, _) in self.modulos.items():
             btn = QPushButton(f"  {nombre}")
             btn.setIcon(QIcon(icono_path))
             btn.setIconSize(QSize(24, 24))
@@ -107,20 +108,120 @@ class MainWindow(QMainWindow):
             btn.clicked.connect(lambda _, n=nombre: self.seleccionar_opcion(n))
             self.menu_layout.addWidget(btn)
             self.botones_menu[nombre] = btn
-            self.stack.addWidget(modulo)
 
         # Armar interfaz con el menú como widget
         self.main_layout.addWidget(self.menu_widget, 1)
         self.main_layout.addWidget(self.stack, 4)
         central_widget.setLayout(self.main_layout)
 
+        # --- Barra de estado con el avance de los trabajos en segundo plano ---
+        self.estado_mensaje = QLabel("")
+        self.estado_progreso = QProgressBar()
+        self.estado_progreso.setFixedWidth(180)
+        self.estado_progreso.setTextVisible(True)
+        self.estado_progreso.hide()
+        self.btn_cancelar = QPushButton("Cancelar")
+        self.btn_cancelar.hide()
+        # Desglose de tiempos de la última operación (interpretar, cálculo, tabla, dibujo)
+        self.estado_traza = QLabel("")
+        self.btn_exportar_tiempos = QPushButton("Exportar tiempos")
+        self.btn_exportar_tiempos.setToolTip("Guarda el registro de tiempos de las operaciones en JSON o CSV")
+        self.btn_exportar_tiempos.clicked.connect(self.exportar_tiempos)
+        self.statusBar().addWidget(self.estado_mensaje, 1)
+        self.statusBar().addPermanentWidget(self.estado_traza)
+        self.statusBar().addPermanentWidget(self.estado_progreso)
+        self.statusBar().addPermanentWidget(self.btn_cancelar)
+        self.statusBar().addPermanentWidget(self.btn_exportar_tiempos)
+        traza.registro.oyentes.append(self.mostrar_traza)
+
+        trabajos = ejecutor()
+        trabajos.iniciado.connect(self.trabajo_iniciado)
+        trabajos.progreso.connect(self.trabajo_progreso)
+        trabajos.finalizado.connect(self.trabajo_finalizado)
+        self.btn_cancelar.clicked.connect(trabajos.cancelar)
+
         # Mostrar por defecto
         self.seleccionar_opcion("Inicio")
 
+    def obtener_modulo(self, nombre):
+        """Devuelve el widget del módulo, importándolo y creándolo la primera vez."""
+        widget = self.instancias.get(nombre)
+        if widget is None:
+            _, ruta_modulo, nombre_clase = self.modulos[nombre]
+            inicio = time.perf_counter()
+            clase = getattr(importlib.import_module(ruta_modulo), nombre_clase)
+            importado = time.perf_counter()
+            widget = clase()
+            perfil = perfil_activo()
+            if perfil is not None:
+                perfil.registrar_widget(nombre, inicio, importado - inicio, time.perf_counter() - importado)
+            self.instancias[nombre] = widget
+            self.stack.addWidget(widget)
+        return widget
+
     def seleccionar_opcion(self, nombre_opcion):
+        try:
+            modulo = self.obtener_modulo(nombre_opcion)
+        except Exception as e:
+            QMessageBox.critical(self, "Error", f"No se pudo cargar el módulo '{nombre_opcion}':\n{e}")
+            return
+
         for nombre, boton in self.botones_menu.items():
             if nombre == nombre_opcion:
                 boton.setStyleSheet(self.estilo_activo)
             else:
                 boton.setStyleSheet(self.estilo_base)
-        self.stack.setCurrentWidget(self.modulos[nombre_opcion][1])
+        self.stack.setCurrentWidget(modulo)
+        if nombre_opcion != "Inicio":
+            QSettings("Cal-cucho", "Cal-cucho").setValue("ultimo_modulo", nombre_opcion)
+
+    def orden_precarga(self):
+        """Módulos que conviene construir por adelantado: sólo el último que usó el usuario."""
+        ultimo = QSettings("Cal-cucho", "Cal-cucho").value("ultimo_modulo", "", type=str)
+        return [ultimo] if ultimo in self.modulos and ultimo not in self.instancias else []
+
+    # --- Barra de estado ---
+    def trabajo_iniciado(self, descripcion):
+        self.estado_mensaje.setText(f"{descripcion}...")
+        # Indeterminada hasta que el cálculo informe su primer avance
+        self.estado_progreso.setRange(0, 0)
+        self.estado_progreso.show()
+        self.btn_cancelar.show()
+
+    def trabajo_progreso(self, porcentaje):
+        if self.estado_progreso.maximum() == 0:
+            self.estado_progreso.setRange(0, 100)
+        self.estado_progreso.setValue(porcentaje)
+
+    def trabajo_finalizado(self, mensaje):
+        if ejecutor().ocupado():
+            return
+        self.estado_mensaje.setText(mensaje)
+        cache = expresiones.estadisticas()
+        guardados = memo.estadisticas()
+        self.estado_mensaje.setToolTip(
+            f"Caché de expresiones: {cache['aciertos']} aciertos, {cache['fallos']} fallos, "
+            f"{cache['entradas']}/{cache['capacidad']} entradas\n"
+            f"Caché de derivadas e integrales: {guardados['aciertos']} aciertos, "
+            f"{guardados['fallos']} fallos, {guardados['entradas']} entradas"
+        )
+        self.estado_progreso.hide()
+        self.btn_cancelar.hide()
+
+    def mostrar_traza(self, ejecucion):
+        self.estado_traza.setText(ejecucion.resumen())
+
+    def exportar_tiempos(self):
+        ruta, filtro = QFileDialog.getSaveFileName(
+            self, "Exportar tiempos", "tiempos.json", "JSON (*.json);;CSV (*.csv)"
+        )
+        if not ruta:
+            return
+        if filtro.startswith("CSV") and not ruta.lower().endswith(".csv"):
+            ruta = os.path.splitext(ruta)[0] + ".csv"
+        try:
+            traza.registro.exportar(ruta)
+        except OSError as e:
+            QMessageBox.critical(self, "Error", f"No se pudo guardar el archivo:\n{e}")
+            return
+        self.estado_mensaje.setText(f"Tiempos guardados en {ruta}")
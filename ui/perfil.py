@@ -0,0 +1,250 @@
+"""Modo de perfilado del arranque.
+
+Se activa con ``main.py --perfil[=ruta.json]`` o con la variable de entorno
+``CALCUCHO_PERFIL`` (``1`` o una ruta). Registra una línea de tiempo con:
+
+- el tiempo de importación de cada módulo (propio e inclusivo),
+- la importación y construcción de cada entrada de ``MainWindow.modulos``,
+- el tiempo hasta el primer pintado de la ventana.
+
+Al terminar escribe el JSON y un resumen legible (``.txt``) junto a él.
+Este archivo no importa PyQt al cargarse para poder medir también su importación.
+"""
+import json
+import os
+import sys
+import time
+
+RUTA_POR_DEFECTO = "perfil_arranque.json"
+
+_perfil_activo = None
+
+
+def perfil_activo():
+    """Devuelve el perfil en curso, o None si el modo de perfilado está apagado."""
+    return _perfil_activo
+
+
+def iniciar_perfil(ruta=None):
+    global _perfil_activo
+    if _perfil_activo is None:
+        _perfil_activo = PerfilArranque(ruta or RUTA_POR_DEFECTO)
+        _perfil_activo.instalar()
+    return _perfil_activo
+
+
+def ruta_solicitada(argv, entorno=os.environ):
+    """Lee ``--perfil[=ruta]`` de argv o ``CALCUCHO_PERFIL``; None si no se pidió."""
+    for arg in argv[1:]:
+        if arg == "--perfil":
+            return RUTA_POR_DEFECTO
+        if arg.startswith("--perfil="):
+            return arg.split("=", 1)[1] or RUTA_POR_DEFECTO
+    valor = entorno.get("CALCUCHO_PERFIL", "").strip()
+    if not valor or valor == "0":
+        return None
+    return RUTA_POR_DEFECTO if valor == "1" else valor
+
+
+class _CargadorCronometrado:
+    """Envuelve el cargador original de un módulo y mide su ejecución."""
+
+    def __init__(self, cargador, perfil):
+        self._cargador = cargador
+        self._perfil = perfil
+
+    def create_module(self, spec):
+        with self._perfil._medir_importacion(spec.name):
+            return self._cargador.create_module(spec)
+
+    def exec_module(self, modulo):
+        with self._perfil._medir_importacion(modulo.__name__):
+            self._cargador.exec_module(modulo)
+
+    def __getattr__(self, nombre):
+        return getattr(self._cargador, nombre)
+
+
+class _BuscadorCronometrado:
+    """Buscador de ``sys.meta_path`` que delega en los demás y envuelve su cargador."""
+
+    def __init__(self, perfil):
+        self._perfil = perfil
+        self._buscando = set()
+
+    def find_spec(self, nombre, path=None, target=None):
+        if nombre in self._buscando:
+            return None
+        self._buscando.add(nombre)
+        try:
+            for buscador in sys.meta_path:
+                if buscador is self or not hasattr(buscador, "find_spec"):
+                    continue
+                spec = buscador.find_spec(nombre, path, target)
+                if spec is not None:
+                    break
+            else:
+                return None
+        finally:
+            self._buscando.discard(nombre)
+
+        if spec.loader is not None and hasattr(spec.loader, "exec_module"):
+            spec.loader = _CargadorCronometrado(spec.loader, self._perfil)
+        return spec
+
+
+class _Medicion:
+    def __init__(self, perfil, nombre):
+        self.perfil = perfil
+        self.nombre = nombre
+
+    def __enter__(self):
+        self.inicio = time.perf_counter()
+        self.hijos = 0.0
+        self.perfil._pila.append(self)
+
+    def __exit__(self, *exc):
+        duracion = time.perf_counter() - self.inicio
+        self.perfil._pila.pop()
+        if self.perfil._pila:
+            self.perfil._pila[-1].hijos += duracion
+        self.perfil._acumular(self.nombre, self.inicio, duracion, duracion - self.hijos,
+                              len(self.perfil._pila))
+        return False
+
+
+class PerfilArranque:
+    def __init__(self, ruta):
+        self.ruta = ruta
+        self.origen = time.perf_counter()
+        self.eventos = []
+        self.importaciones = {}
+        self.widgets = []
+        self.primer_pintado = None
+        self._pila = []
+        self._buscador = None
+        self.marcar("inicio")
+
+    # --- Registro ---
+    def instalar(self):
+        self._buscador = _BuscadorCronometrado(self)
+        sys.meta_path.insert(0, self._buscador)
+
+    def desinstalar(self):
+        if self._buscador in sys.meta_path:
+            sys.meta_path.remove(self._buscador)
+
+    def relativo(self, instante):
+        return instante - self.origen
+
+    def marcar(self, nombre):
+        self.eventos.append({"evento": nombre, "t": self.relativo(time.perf_counter())})
+
+    def _medir_importacion(self, nombre):
+        return _Medicion(self, nombre)
+
+    def _acumular(self, nombre, inicio, duracion, propio, profundidad):
+        registro = self.importaciones.get(nombre)
+        if registro is None:
+            self.importaciones[nombre] = {
+                "modulo": nombre, "inicio": self.relativo(inicio),
+                "inclusivo": duracion, "propio": propio, "profundidad": profundidad,
+            }
+        else:
+            # create_module y exec_module se suman en la misma entrada
+            registro["inclusivo"] += duracion
+            registro["propio"] += propio
+
+    def registrar_widget(self, nombre, inicio, importacion, construccion):
+        self.widgets.append({
+            "nombre": nombre, "inicio": self.relativo(inicio),
+            "importacion": importacion, "construccion": construccion,
+        })
+
+    def observar_ventana(self, ventana, salir=False):
+        """Marca el primer pintado de la ventana principal y, a continuación,
+        construye las entradas del menú que falten y escribe el informe."""
+        from PyQt5.QtCore import QObject, QEvent, QTimer
+
+        perfil = self
+
+        class _FiltroPintado(QObject):
+            def eventFilter(self, obj, evento):
+                if evento.type() == QEvent.Paint and perfil.primer_pintado is None:
+                    perfil.primer_pintado = perfil.relativo(time.perf_counter())
+                    perfil.marcar("primer_pintado")
+                    obj.removeEventFilter(self)
+                    QTimer.singleShot(0, lambda: perfil.completar(ventana, salir))
+                return False
+
+        self._filtro = _FiltroPintado(ventana)
+        ventana.installEventFilter(self._filtro)
+
+    def completar(self, ventana, salir=False):
+        from PyQt5.QtWidgets import QApplication
+
+        for nombre in ventana.modulos:
+            if nombre not in ventana.instancias:
+                ventana.obtener_modulo(nombre)
+                QApplication.processEvents()
+        self.marcar("modulos_construidos")
+        self.escribir()
+        if salir:
+            QApplication.quit()
+
+    # --- Resultados ---
+    def por_paquete(self):
+        totales = {}
+        for registro in self.importaciones.values():
+            paquete = registro["modulo"].split(".")[0]
+            if paquete == "modulos":
+                paquete = registro["modulo"]
+            totales[paquete] = totales.get(paquete, 0.0) + registro["propio"]
+        return dict(sorted(totales.items(), key=lambda par: par[1], reverse=True))
+
+    def como_dict(self):
+        return {
+            "primer_pintado": self.primer_pintado,
+            "eventos": self.eventos,
+            "importaciones": sorted(self.importaciones.values(), key=lambda r: r["inicio"]),
+            "por_paquete": self.por_paquete(),
+            "widgets": self.widgets,
+        }
+
+    def resumen(self, maximo=15):
+        lineas = ["=== Perfil de arranque de Cal-cucho ===", ""]
+        if self.primer_pintado is not None:
+            lineas.append(f"Primer pintado: {self.primer_pintado:.3f} s")
+        lineas.append("")
+        lineas.append("Línea de tiempo:")
+        for evento in self.eventos:
+            lineas.append(f"  {evento['t']:8.3f} s  {evento['evento']}")
+
+        lineas.append("")
+        lineas.append(f"Dependencias con más tiempo de importación propio (top {maximo}):")
+        for paquete, segundos in list(self.por_paquete().items())[:maximo]:
+            lineas.append(f"  {segundos:8.3f} s  {paquete}")
+
+        propios = [r for r in self.importaciones.values() if r["modulo"].startswith("modulos.")]
+        if propios:
+            lineas.append("")
+            lineas.append("Importación de modulos.* (inclusivo / propio):")
+            for r in sorted(propios, key=lambda r: r["inclusivo"], reverse=True):
+                lineas.append(f"  {r['inclusivo']:8.3f} s / {r['propio']:7.3f} s  {r['modulo']}")
+
+        if self.widgets:
+            lineas.append("")
+            lineas.append("Widgets del menú (importación + construcción):")
+            for w in self.widgets:
+                total = w["importacion"] + w["construccion"]
+                lineas.append(f"  {total:8.3f} s = {w['importacion']:.3f} + {w['construccion']:.3f}  {w['nombre']}")
+        return "\n".join(lineas)
+
+    def escribir(self):
+        self.desinstalar()
+        with open(self.ruta, "w", encoding="utf-8") as f:
+            json.dump(self.como_dict(), f, indent=2, ensure_ascii=False)
+        resumen = self.resumen()
+        with open(os.path.splitext(self.ruta)[0] + ".txt", "w", encoding="utf-8") as f:
+            f.write(resumen + "\n")
+        print(resumen, file=sys.stderr)
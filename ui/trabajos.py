@@ -0,0 +1,198 @@
+"""Ejecutor compartido de trabajos en segundo plano.
+
+Los módulos envían sus cálculos con ``ejecutor().enviar(...)``; el cálculo corre
+en un hilo de ``QThreadPool`` y los resultados vuelven al hilo de la interfaz
+mediante señales. La ventana principal muestra el avance en la barra de estado
+y su botón Cancelar detiene el cálculo en su siguiente punto de control.
+"""
+import inspect
+import time
+
+from PyQt5.QtCore import QCoreApplication, QObject, QRunnable, QThreadPool, pyqtSignal
+from PyQt5.QtWidgets import QMessageBox
+
+from calcucho.core import traza
+from calcucho.core.progreso import Cancelado
+
+
+def _acepta(funcion, nombre):
+    try:
+        return nombre in inspect.signature(funcion).parameters
+    except (TypeError, ValueError):
+        return False
+
+
+class _Senales(QObject):
+    progreso = pyqtSignal(int)
+    parcial = pyqtSignal(object)
+    terminado = pyqtSignal(object)
+    fallido = pyqtSignal(object)
+    cancelado = pyqtSignal()
+
+
+class Trabajo(QRunnable):
+    def __init__(self, descripcion, funcion, args, kwargs):
+        super().__init__()
+        self.setAutoDelete(False)
+        self.descripcion = descripcion
+        self.funcion = funcion
+        self.args = args
+        self.kwargs = kwargs
+        self.senales = _Senales()
+        self.cancelado = False
+        self.cerrado = False
+        self.duracion = 0.0
+        self._ultimo = -1
+        if _acepta(funcion, "progreso"):
+            self.kwargs["progreso"] = self._informar
+        if _acepta(funcion, "parcial") and "parcial" not in self.kwargs:
+            self.kwargs["parcial"] = self._publicar
+
+    def cancelar(self):
+        self.cancelado = True
+
+    def _informar(self, fraccion):
+        if self.cancelado:
+            raise Cancelado()
+        if fraccion is None:
+            return
+        porcentaje = int(fraccion * 100)
+        if porcentaje != self._ultimo:
+            self._ultimo = porcentaje
+            self.senales.progreso.emit(porcentaje)
+
+    def _publicar(self, valor):
+        """Envía un resultado parcial (por ejemplo, la estimación tras cada lote)."""
+        if not self.cancelado:
+            self.senales.parcial.emit(valor)
+
+    def run(self):
+        inicio = time.perf_counter()
+        try:
+            resultado = self.funcion(*self.args, **self.kwargs)
+        except Cancelado:
+            self.senales.cancelado.emit()
+        except Exception as e:
+            if self.cancelado:
+                self.senales.cancelado.emit()
+            else:
+                self.senales.fallido.emit(e)
+        else:
+            self.duracion = time.perf_counter() - inicio
+            # Un cálculo sin puntos de control puede terminar después de cancelado
+            if self.cancelado:
+                self.senales.cancelado.emit()
+            else:
+                self.senales.terminado.emit(resultado)
+
+
+class EjecutorTrabajos(QObject):
+    iniciado = pyqtSignal(str)
+    progreso = pyqtSignal(int)
+    finalizado = pyqtSignal(str)
+
+    def __init__(self):
+        super().__init__()
+        self.pool = QThreadPool.globalInstance()
+        self.activos = []
+        # Referencias hasta que el hilo termina, aunque el trabajo ya se haya cancelado
+        self._en_hilo = set()
+        app = QCoreApplication.instance()
+        if app is not None:
+            app.aboutToQuit.connect(self.detener)
+
+    def enviar(self, descripcion, funcion, *args, al_terminar=None, al_fallar=None,
+               al_avanzar=None, padre=None, boton=None, **kwargs):
+        """Ejecuta ``funcion(*args, **kwargs)`` en segundo plano.
+
+        ``al_terminar(resultado)`` y ``al_fallar(excepcion)`` se llaman en el hilo
+        de la interfaz; sin ``al_fallar`` el error se muestra en un mensaje sobre
+        ``padre``. ``boton`` se deshabilita mientras dure el trabajo. Si la función
+        acepta un argumento ``parcial``, cada valor que publique llega a
+        ``al_avanzar(valor)``, también en el hilo de la interfaz.
+
+        El trabajo continúa la traza abierta por el manejador del botón (o abre
+        una): mide el tramo de cálculo y la cierra después de ``al_terminar``."""
+        trabajo = Trabajo(descripcion, funcion, args, kwargs)
+        ejecucion = traza.soltar() or traza.Ejecucion(descripcion)
+
+        def fin(mensaje, estado):
+            if trabajo.cerrado:
+                return
+            trabajo.cerrado = True
+            traza.terminar(ejecucion, estado)
+            if trabajo in self.activos:
+                self.activos.remove(trabajo)
+            if boton is not None:
+                boton.setEnabled(True)
+            self.finalizado.emit(mensaje)
+
+        def terminado(resultado):
+            if trabajo.cerrado:
+                return
+            ejecucion.agregar("calculo", trabajo.duracion)
+            # Los tramos de tabla y dibujo de al_terminar van a esta ejecución
+            traza.activar(ejecucion)
+            try:
+                if al_terminar is not None:
+                    al_terminar(resultado)
+            finally:
+                fin(f"{descripcion}: listo", "listo")
+
+        def fallido(error):
+            if trabajo.cerrado:
+                return
+            fin(f"{descripcion}: error", "error")
+            if al_fallar is not None:
+                al_fallar(error)
+            else:
+                QMessageBox.critical(padre, "Error", str(error))
+
+        trabajo.senales.progreso.connect(lambda p: None if trabajo.cerrado else self.progreso.emit(p))
+        if al_avanzar is not None:
+            trabajo.senales.parcial.connect(lambda valor: None if trabajo.cerrado else al_avanzar(valor))
+        trabajo.senales.terminado.connect(terminado)
+        trabajo.senales.fallido.connect(fallido)
+        trabajo.senales.cancelado.connect(lambda: fin(f"{descripcion}: cancelado", "cancelado"))
+        trabajo.cerrar = lambda: fin(f"{descripcion}: cancelado", "cancelado")
+        for senal in (trabajo.senales.terminado, trabajo.senales.fallido, trabajo.senales.cancelado):
+            senal.connect(lambda *_: self._en_hilo.discard(trabajo))
+
+        if boton is not None:
+            boton.setEnabled(False)
+        self.activos.append(trabajo)
+        self._en_hilo.add(trabajo)
+        self.iniciado.emit(descripcion)
+        self.pool.start(trabajo)
+        return trabajo
+
+    def ocupado(self):
+        return bool(self.activos)
+
+    def cancelar(self):
+        """Detiene los trabajos en curso en su siguiente punto de control.
+
+        La interfaz se libera de inmediato: si un cálculo no tiene puntos de
+        control (por ejemplo, una llamada a sympy), su resultado se descarta."""
+        for trabajo in list(self.activos):
+            trabajo.cancelar()
+            trabajo.cerrar()
+
+    def detener(self):
+        """Cancela todo y espera a los hilos: al salir, un trabajo que siguiera
+        corriendo emitiría señales de objetos ya destruidos."""
+        for trabajo in list(self._en_hilo):
+            trabajo.cancelar()
+        self.cancelar()
+        self.pool.waitForDone()
+
+
+_ejecutor = None
+
+
+def ejecutor():
+    """Devuelve el ejecutor compartido por todos los módulos."""
+    global _ejecutor
+    if _ejecutor is None:
+        _ejecutor = EjecutorTrabajos()
+    return _ejecutor